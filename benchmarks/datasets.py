@@ -0,0 +1,150 @@
+"""
+Наборы оценок для бенчмарков: ml-100k из assets и синтетические.
+
+Синтетический набор воспроизводим по seed. Популярность фильмов убывает
+по степенному закону (как в MovieLens: немного хитов и длинный хвост),
+а количество оценок пользователя распределено логнормально с минимумом
+min_per_user. Оценка складывается из «качества» фильма, смещения
+пользователя и шума и округляется до шкалы 1..5.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.neighbors import RATINGS_FILE
+
+# Начало и конец интервала временных меток (секунды unix time)
+TIMESTAMP_RANGE: tuple[int, int] = (874_724_710, 893_286_638)
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticSpec:
+    """Размер синтетического набора: users×movies×ratings."""
+
+    users: int
+    movies: int
+    ratings: int
+    popularity_exponent: float = 1.0
+    min_per_user: int = 20
+
+    @classmethod
+    def parse(cls, value: str) -> "SyntheticSpec":
+        """Разбирает запись вида 20000x5000x2000000."""
+        users, movies, ratings = (int(part) for part in value.lower().split("x"))
+        return cls(users=users, movies=movies, ratings=ratings)
+
+    @property
+    def name(self) -> str:
+        return f"synthetic-{self.users}x{self.movies}x{self.ratings}"
+
+
+@dataclass(frozen=True, slots=True)
+class RatingArrays:
+    """Оценки набора в виде столбцов."""
+
+    user_ids: np.ndarray
+    movie_ids: np.ndarray
+    ratings: np.ndarray
+    timestamps: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def to_users(self) -> dict[int, dict[int, int]]:
+        users: dict[int, dict[int, int]] = {}
+        for user_id, movie_id, rating in zip(
+            self.user_ids.tolist(), self.movie_ids.tolist(), self.ratings.tolist()
+        ):
+            users.setdefault(user_id, {})[movie_id] = rating
+        return users
+
+
+def synthetic_ratings(spec: SyntheticSpec, seed: int = 42) -> RatingArrays:
+    """
+    Генерирует воспроизводимый набор оценок
+
+    Args:
+        spec: Количество пользователей, фильмов и оценок
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        Оценки с id пользователей 1..users и фильмов 1..movies без повторов
+        пары (пользователь, фильм)
+    """
+    rng = np.random.default_rng(seed)
+
+    # Фильм с рангом r (1 — самый популярный) выбирается с весом 1 / r^a;
+    # ранги перемешаны, чтобы популярность не совпадала с порядком id
+    ranks = rng.permutation(spec.movies) + 1
+    popularity = 1.0 / ranks.astype(np.float64) ** spec.popularity_exponent
+    popularity /= popularity.sum()
+    cumulative = np.cumsum(popularity)
+
+    # Активность пользователей: логнормальное распределение, нормированное
+    # к общему количеству оценок. Масштаб подбирается бинарным поиском,
+    # чтобы после ограничения снизу и сверху сумма осталась около ratings
+    max_per_user: int = min(spec.movies, max(spec.min_per_user, spec.movies // 2))
+    min_per_user: int = min(spec.min_per_user, max_per_user)
+    activity = rng.lognormal(mean=0.0, sigma=1.0, size=spec.users)
+    activity /= activity.sum()
+
+    low, high = 0.0, float(spec.ratings) * spec.users
+    for _ in range(60):
+        scale: float = (low + high) / 2
+        total = np.clip(np.round(activity * scale), min_per_user, max_per_user).sum()
+        if total < spec.ratings:
+            low = scale
+        else:
+            high = scale
+    counts = np.clip(np.round(activity * high), min_per_user, max_per_user).astype(
+        np.int64
+    )
+
+    quality = rng.normal(3.5, 0.6, size=spec.movies)
+    bias = rng.normal(0.0, 0.5, size=spec.users)
+
+    user_parts: list[np.ndarray] = []
+    movie_parts: list[np.ndarray] = []
+    for user_index, count in enumerate(counts.tolist()):
+        # Выборка с возвращением и удалением повторов быстрее выборки
+        # без возвращения по весам; добираем, пока не наберём count фильмов
+        chosen = np.empty(0, dtype=np.int64)
+        while len(chosen) < count:
+            draw = np.searchsorted(cumulative, rng.random(2 * count), side="right")
+            chosen = np.unique(
+                np.concatenate((chosen, np.minimum(draw, spec.movies - 1)))
+            )
+        chosen = rng.permutation(chosen)[:count]
+
+        user_parts.append(np.full(count, user_index, dtype=np.int64))
+        movie_parts.append(chosen)
+
+    user_index = np.concatenate(user_parts)
+    movie_index = np.concatenate(movie_parts)
+
+    noise = rng.normal(0.0, 1.0, size=len(user_index))
+    ratings = np.clip(
+        np.round(quality[movie_index] + bias[user_index] + noise), 1, 5
+    ).astype(np.int64)
+    timestamps = rng.integers(*TIMESTAMP_RANGE, size=len(user_index))
+
+    order = np.argsort(timestamps, kind="stable")
+    return RatingArrays(
+        user_ids=user_index[order] + 1,
+        movie_ids=movie_index[order] + 1,
+        ratings=ratings[order],
+        timestamps=timestamps[order],
+    )
+
+
+def movielens_ratings(path: Path = RATINGS_FILE) -> RatingArrays:
+    """Читает u.data в порядке строк файла."""
+    data = np.loadtxt(path, dtype=np.int64, delimiter="\t", ndmin=2)
+    return RatingArrays(
+        user_ids=data[:, 0],
+        movie_ids=data[:, 1],
+        ratings=data[:, 2],
+        timestamps=data[:, 3],
+    )
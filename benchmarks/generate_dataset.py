@@ -0,0 +1,127 @@
+"""
+Генератор синтетического датасета в формате MovieLens 100k.
+
+Пишет u.data, u.item, u.user, u.genre и u.occupation заданного размера,
+которые MovieLensImporter загружает без изменений. Оценки строятся
+benchmarks.datasets.synthetic_ratings (степенная популярность фильмов,
+логнормальная активность пользователей), жанры и профессии берутся
+из ml-100k в assets.
+
+Запуск:
+    python -m benchmarks.generate_dataset --users 100000 --movies 20000 \\
+        --ratings 10000000 --output /tmp/ml-synthetic
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.datasets import RatingArrays, SyntheticSpec, synthetic_ratings
+from benchmarks.neighbors import ROOT_DIR
+
+ASSETS_DIR = ROOT_DIR / "assets"
+
+
+def read_lines(path: Path) -> list[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def write_ratings(path: Path, data: RatingArrays) -> None:
+    np.savetxt(
+        path,
+        np.column_stack((data.user_ids, data.movie_ids, data.ratings, data.timestamps)),
+        fmt="%d",
+        delimiter="\t",
+    )
+
+
+def write_movies(path: Path, movies: int, genres: int, rng: random.Random) -> None:
+    first_day = date(1930, 1, 1)
+    days: int = (date(2020, 12, 31) - first_day).days
+
+    with open(path, "w", encoding="utf-8") as f:
+        for movie_id in range(1, movies + 1):
+            released = first_day + timedelta(days=rng.randrange(days))
+            title = f"Synthetic Movie {movie_id} ({released.year})"
+            url = f"http://us.imdb.com/M/title-exact?Synthetic%20Movie%20{movie_id}"
+
+            flags = [0] * genres
+            # Жанр 0 — unknown, остальные выбираются по одному–три
+            for genre_id in rng.sample(range(1, genres), k=rng.randint(1, 3)):
+                flags[genre_id] = 1
+
+            f.write(
+                "|".join(
+                    [
+                        str(movie_id),
+                        title,
+                        released.strftime("%d-%b-%Y"),
+                        "",
+                        url,
+                        *map(str, flags),
+                    ]
+                )
+                + "\n"
+            )
+
+
+def write_users(
+    path: Path, users: int, occupations: list[str], rng: random.Random
+) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for user_id in range(1, users + 1):
+            age = min(73, max(7, int(rng.gauss(34, 12))))
+            gender = "M" if rng.random() < 0.7 else "F"
+            occupation = rng.choice(occupations)
+            zipcode = f"{rng.randrange(100_000):05d}"
+            f.write(f"{user_id}|{age}|{gender}|{occupation}|{zipcode}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--movies", type=int, default=5_000)
+    parser.add_argument("--ratings", type=int, default=1_000_000)
+    parser.add_argument("--popularity-exponent", type=float, default=1.0)
+    parser.add_argument("--min-per-user", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    spec = SyntheticSpec(
+        users=args.users,
+        movies=args.movies,
+        ratings=args.ratings,
+        popularity_exponent=args.popularity_exponent,
+        min_per_user=args.min_per_user,
+    )
+    rng = random.Random(args.seed)
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    genres: list[str] = read_lines(ASSETS_DIR / "u.genre")
+    occupations: list[str] = read_lines(ASSETS_DIR / "u.occupation")
+
+    (args.output / "u.genre").write_text("\n".join(genres) + "\n", encoding="utf-8")
+    (args.output / "u.occupation").write_text(
+        "\n".join(occupations) + "\n", encoding="utf-8"
+    )
+    write_users(args.output / "u.user", spec.users, occupations, rng)
+    write_movies(args.output / "u.item", spec.movies, len(genres), rng)
+
+    data: RatingArrays = synthetic_ratings(spec, args.seed)
+    write_ratings(args.output / "u.data", data)
+
+    print(
+        f"{args.output}: {spec.users} users, {spec.movies} movies, "
+        f"{len(data)} ratings"
+    )
+
+
+if __name__ == "__main__":
+    main()
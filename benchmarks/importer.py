@@ -0,0 +1,62 @@
+"""
+Бенчмарк импорта MovieLens в БД (MovieLensImporter).
+
+Импортирует каталог датасета в БД из настроек (DB_DSN) и печатает JSON
+с длительностью импорта справочников и рейтингов и скоростью вставки
+рейтингов. Рейтинги импортируются, только если таблица пуста, поэтому
+запускать стоит на пустой БД; benchmarks.suite сам создаёт временную.
+
+Запуск:
+    DB_DSN=/tmp/bench.sqlite python -m benchmarks.importer --data-dir assets
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from src.infrastructure.db.db import init_db
+from src.infrastructure.db.uow import UnitOfWork
+from src.infrastructure.services.movie_lens_importer import MovieLensImporter
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", type=Path, default=ROOT_DIR / "assets")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    await init_db()
+    importer = MovieLensImporter(args.data_dir, chunk_size=args.chunk_size)
+
+    with open(importer.rating_file, "rb") as f:
+        ratings: int = sum(1 for _ in f)
+
+    async with UnitOfWork() as uow:
+        start = time.perf_counter()
+        await importer._import_genres(uow)
+        await importer._import_occupations(uow)
+        await importer._import_users(uow)
+        await importer._import_movies(uow)
+        catalog_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await importer._import_ratings(uow)
+        ratings_seconds = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "catalog_seconds": catalog_seconds,
+                "ratings_seconds": ratings_seconds,
+                "ratings_per_second": ratings / ratings_seconds,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""
+Нагрузочный тест HTTP API рекомендаций и каталога.
+
+Запускает --concurrency асинхронных клиентов, которые в течение --duration
+секунд (или до --requests запросов) отправляют запросы к работающему
+серверу вперемешку в пропорции --mix:
+- recommendations: GET /api/v1/recommendations/{user_id}?top_n=...
+  для случайного пользователя 1..--max-user-id
+- movies: GET /api/v1/movies/?limit=...&after_id=... со случайной
+  страницы каталога 0..--max-movie-id
+
+Для каждого типа запросов выводит количество, ошибки (ответы не 2xx/304
+и сбои соединения), запросов в секунду и p50/p90/p99/max задержки.
+
+Запуск:
+    python -m benchmarks.load_test --base-url http://localhost:8000 \\
+        --concurrency 64 --duration 30 --mix recommendations=0.8,movies=0.2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from benchmarks.neighbors import percentile
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def report(self, duration: float) -> dict[str, float]:
+        latencies: list[float] = self.latencies or [0.0]
+        return {
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "rps": len(self.latencies) / duration,
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p90_ms": percentile(latencies, 0.9) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": max(latencies) * 1000,
+        }
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in ("recommendations", "movies"):
+            raise argparse.ArgumentTypeError(f"Неизвестный тип запроса: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def make_request(
+    kind: str, args: argparse.Namespace, rng: random.Random
+) -> tuple[str, dict[str, int]]:
+    if kind == "recommendations":
+        user_id: int = rng.randint(1, args.max_user_id)
+        return f"/api/v1/recommendations/{user_id}", {"top_n": args.top_n}
+
+    params: dict[str, int] = {"limit": args.page_size}
+    after_id: int = rng.randint(0, args.max_movie_id)
+    if after_id:
+        params["after_id"] = after_id
+    return "/api/v1/movies/", params
+
+
+async def client(
+    http: httpx.AsyncClient,
+    args: argparse.Namespace,
+    stats: dict[str, EndpointStats],
+    deadline: float,
+    budget: list[int],
+    rng: random.Random,
+) -> None:
+    kinds: list[str] = list(args.mix)
+    weights: list[float] = list(args.mix.values())
+
+    while time.perf_counter() < deadline:
+        if budget[0] <= 0:
+            return
+        budget[0] -= 1
+
+        kind: str = rng.choices(kinds, weights)[0]
+        path, params = make_request(kind, args, rng)
+
+        start = time.perf_counter()
+        try:
+            response = await http.get(path, params=params)
+        except httpx.HTTPError:
+            stats[kind].errors += 1
+            continue
+
+        if response.status_code >= 400:
+            stats[kind].errors += 1
+        else:
+            stats[kind].latencies.append(time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument(
+        "--mix", type=parse_mix, default="recommendations=0.8,movies=0.2"
+    )
+    parser.add_argument("--max-user-id", type=int, default=943)
+    parser.add_argument("--max-movie-id", type=int, default=1682)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument(
+        "--api-key", default=None, help="Bearer-токен, если включена авторизация"
+    )
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    headers: dict[str, str] = {"Accept-Encoding": "gzip"}
+    if args.api_key:
+        headers["Authorization"] = f"Bearer {args.api_key}"
+
+    stats: dict[str, EndpointStats] = {kind: EndpointStats() for kind in args.mix}
+    budget: list[int] = [args.requests if args.requests is not None else 1 << 62]
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers=headers,
+        limits=limits,
+        timeout=args.timeout,
+    ) as http:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                client(
+                    http, args, stats, deadline, budget, random.Random(args.seed + i)
+                )
+                for i in range(args.concurrency)
+            )
+        )
+        duration = time.perf_counter() - started
+
+    report: dict[str, dict[str, float]] = {
+        kind: endpoint.report(duration) for kind, endpoint in stats.items()
+    }
+    total = EndpointStats(
+        latencies=[
+            value for endpoint in stats.values() for value in endpoint.latencies
+        ],
+        errors=sum(endpoint.errors for endpoint in stats.values()),
+    )
+    report["total"] = total.report(duration)
+
+    print(
+        f"{'endpoint':>16} {'requests':>9} {'errors':>7} {'rps':>8} "
+        f"{'p50, ms':>8} {'p90, ms':>8} {'p99, ms':>8} {'max, ms':>8}"
+    )
+    for kind, row in report.items():
+        print(
+            f"{kind:>16} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.2f} {row['p90_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+            f"{row['max_ms']:>8.2f}"
+        )
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(
+                {"parameters": vars(args) | {"mix": args.mix}, "results": report},
+                indent=2,
+                default=str,
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+Полнота приближённой матрицы сходства (LSH) относительно точной.
+
+Строит точную матрицу SparseSimilarityMatrixBuilder и приближённые
+LSHSimilarityMatrixBuilder для каждой пары --bands × --rows на обучающей
+части ml-100k (или синтетического набора) и выводит:
+- время построения
+- долю пар фильмов, попавших в кандидаты LSH
+- recall@K соседей: доля точных K ближайших соседей фильма, найденных LSH
+- recall@10 соседей — то же для 10 самых похожих
+- precision@N рекомендаций на отложенных оценках (релевантными считаются
+  оценки ≥ 4), чтобы видеть, как потеря соседей сказывается на выдаче
+
+По умолчанию --exact-density 1.0: блоки с плотными кандидатами не
+досчитываются точно, и отчёт показывает полноту самого LSH-индекса.
+
+Запуск:
+    python -m benchmarks.lsh_recall --bands 16 32 64 --rows 6 8 10
+    python -m benchmarks.lsh_recall --dataset synthetic:30000x20000x2000000 \\
+        --bands 32 --rows 10 --skip-precision
+"""
+
+import argparse
+import asyncio
+import time
+from itertools import product
+
+import numpy as np
+
+from benchmarks.datasets import SyntheticSpec, synthetic_ratings
+from benchmarks.neighbors import (
+    RATINGS_FILE,
+    evaluate,
+    load_ratings,
+    split_ratings,
+)
+from src.domain.entities.movie_lens.movie import Movie
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    ItemBasedCFRecommender,
+)
+from src.infrastructure.services.recommender_module.similarity.lsh_builder import (
+    LSHParams,
+    LSHSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.sparse_builder import (
+    SparseSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+
+
+def neighbor_recall(
+    exact: dict[int, dict[int, float]],
+    approximate: dict[int, dict[int, float]],
+    k: int,
+) -> float:
+    """Доля k самых похожих соседей точной матрицы, найденных в приближённой."""
+    found: int = 0
+    total: int = 0
+    for movie_id, row in exact.items():
+        top = sorted(row, key=row.__getitem__, reverse=True)[:k]
+        found += len(approximate.get(movie_id, {}).keys() & top)
+        total += len(top)
+    return found / total if total else 1.0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--dataset", default="ml-100k")
+    parser.add_argument("--bands", type=int, nargs="+", default=[16, 32, 64])
+    parser.add_argument("--rows", type=int, nargs="+", default=[6, 8, 10])
+    parser.add_argument("--exact-density", type=float, default=1.0)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-precision", action="store_true")
+    args = parser.parse_args()
+
+    if args.dataset == "ml-100k":
+        users = load_ratings(RATINGS_FILE)
+    else:
+        spec = SyntheticSpec.parse(args.dataset.split(":", 1)[1])
+        users = synthetic_ratings(spec, args.seed).to_users()
+
+    train, relevant = split_ratings(users, args.test_fraction, args.seed)
+    movie_ids = sorted({movie_id for movies in train.values() for movie_id in movies})
+    movies = [
+        Movie(
+            id=movie_id,
+            title="",
+            release_date=None,
+            video_release_date=None,
+            imdb_url="",
+            genres=[],
+        )
+        for movie_id in movie_ids
+    ]
+
+    storage = RatingsStorage()
+    storage.set_users(train)
+    policy = NeighborPolicy(max_neighbors=args.k)
+    normalized = SparseSimilarityMatrixBuilder._normalized_matrix(train, movie_ids)
+    rated: int = int(np.count_nonzero(np.diff(normalized.indptr)))
+    all_pairs: int = rated * (rated - 1) // 2
+
+    async def precision(matrix: dict[int, dict[int, float]]) -> float:
+        if args.skip_precision:
+            return float("nan")
+        recommender = ItemBasedCFRecommender(matrix, storage, policy)
+        _, value = await evaluate(recommender, relevant, args.top_n)
+        return value
+
+    print(
+        f"{'builder':>12} {'build, s':>9} {'pairs, %':>9} "
+        f"{f'R@{args.k}':>7} {'R@10':>7} {f'P@{args.top_n}':>7}"
+    )
+
+    start = time.perf_counter()
+    exact = SparseSimilarityMatrixBuilder(neighbor_policy=policy).build(train, movies)
+    build_time = time.perf_counter() - start
+    print(
+        f"{'exact':>12} {build_time:>9.2f} {100.0:>9.1f} {1.0:>7.3f} {1.0:>7.3f} "
+        f"{await precision(exact):>7.3f}"
+    )
+
+    for bands, rows in product(args.bands, args.rows):
+        builder = LSHSimilarityMatrixBuilder(
+            neighbor_policy=policy,
+            params=LSHParams(
+                bands=bands,
+                rows=rows,
+                seed=args.seed,
+                exact_density=args.exact_density,
+            ),
+        )
+
+        start = time.perf_counter()
+        approximate = builder.build(train, movies)
+        build_time = time.perf_counter() - start
+
+        candidates: int = sum(
+            len(left) for _, _, left, _ in builder.candidate_pairs(normalized)
+        )
+        print(
+            f"{f'lsh {bands}x{rows}':>12} {build_time:>9.2f} "
+            f"{100 * candidates / max(all_pairs, 1):>9.1f} "
+            f"{neighbor_recall(exact, approximate, args.k):>7.3f} "
+            f"{neighbor_recall(exact, approximate, 10):>7.3f} "
+            f"{await precision(approximate):>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
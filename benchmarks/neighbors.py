@@ -0,0 +1,147 @@
+"""
+Бенчмарк обрезки соседей в матрице сходства (max_neighbors).
+
+Для каждого K строит матрицу сходства на обучающей части ml-100k и выводит:
+- время построения
+- количество хранимых пар и размер pickle-снимка матрицы
+- p50/p99 времени recommend_for_user
+- precision@N на отложенных оценках (релевантными считаются оценки ≥ 4)
+
+Запуск:
+    python -m benchmarks.neighbors --k 0 10 20 50 100 200
+"""
+
+import argparse
+import asyncio
+import pickle
+import random
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    ItemBasedCFRecommender,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.sparse_builder import (
+    SparseSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RATINGS_FILE = ROOT_DIR / "assets" / "u.data"
+
+
+def load_ratings(path: Path) -> dict[int, dict[int, int]]:
+    users: dict[int, dict[int, int]] = defaultdict(dict)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            user_id, movie_id, rating, _ = line.split("\t")
+            users[int(user_id)][int(movie_id)] = int(rating)
+
+    return users
+
+
+def split_ratings(
+    users: dict[int, dict[int, int]], test_fraction: float, seed: int
+) -> tuple[dict[int, dict[int, int]], dict[int, set[int]]]:
+    """Откладывает часть оценок каждого пользователя для проверки точности."""
+    rng = random.Random(seed)
+    train: dict[int, dict[int, int]] = defaultdict(dict)
+    relevant: dict[int, set[int]] = {}
+
+    for user_id, movies in users.items():
+        items = sorted(movies.items())
+        rng.shuffle(items)
+        cut = int(len(items) * test_fraction)
+
+        train[user_id].update(items[cut:])
+        liked = {movie_id for movie_id, rating in items[:cut] if rating >= 4}
+        if liked:
+            relevant[user_id] = liked
+
+    return train, relevant
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def evaluate(
+    recommender: ItemBasedCFRecommender, relevant: dict[int, set[int]], top_n: int
+) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    precisions: list[float] = []
+
+    for user_id, liked in relevant.items():
+        start = time.perf_counter()
+        recommended = await recommender.recommend_for_user(user_id, top_n)
+        latencies.append(time.perf_counter() - start)
+
+        precisions.append(len(liked.intersection(recommended)) / top_n)
+
+    return latencies, statistics.fmean(precisions)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--k", type=int, nargs="+", default=[0, 10, 20, 50, 100, 200])
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    train, relevant = split_ratings(
+        load_ratings(RATINGS_FILE), args.test_fraction, args.seed
+    )
+    movie_ids = sorted({movie_id for movies in train.values() for movie_id in movies})
+    movies = [
+        Movie(
+            id=movie_id,
+            title="",
+            release_date=None,
+            video_release_date=None,
+            imdb_url="",
+            genres=[],
+        )
+        for movie_id in movie_ids
+    ]
+
+    storage = RatingsStorage()
+    storage.set_users(train)
+
+    print(
+        f"{'K':>6} {'build, s':>9} {'pairs':>10} {'pickle, MB':>11} "
+        f"{'p50, ms':>8} {'p99, ms':>8} {f'P@{args.top_n}':>7}"
+    )
+    for k in args.k:
+        policy = NeighborPolicy(max_neighbors=k or None)
+
+        start = time.perf_counter()
+        matrix = SparseSimilarityMatrixBuilder(neighbor_policy=policy).build(
+            train, movies
+        )
+        build_time = time.perf_counter() - start
+
+        pairs = sum(len(row) for row in matrix.values())
+        size_mb = len(pickle.dumps(dict(matrix))) / 2**20
+
+        recommender = ItemBasedCFRecommender(matrix, storage, policy)
+        latencies, precision = await evaluate(recommender, relevant, args.top_n)
+
+        print(
+            f"{k or 'all':>6} {build_time:>9.2f} {pairs:>10} {size_mb:>11.1f} "
+            f"{percentile(latencies, 0.5) * 1000:>8.2f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.2f} {precision:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""
+Бенчмарк расчёта рекомендаций вне цикла событий (ScoringExecutor).
+
+Несколько клиентов непрерывно запрашивают recommend_for_user для
+пользователей с наибольшим числом оценок, а проба раз в --probe-interval
+измеряет, на сколько позже срока просыпается дешёвая корутина (аналог
+/health), то есть сколько она ждёт своей очереди в цикле событий.
+Между запросами клиент отдаёт управление циклу, как сервер между
+HTTP-запросами. Для режимов без пула и с пулом выводится:
+- p50/p99 задержки пробы
+- p50/p99 времени recommend_for_user
+- количество рекомендаций в секунду и число отказов по таймауту
+
+Запуск:
+    python -m benchmarks.scoring_offload --clients 16 --duration 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.neighbors import RATINGS_FILE, load_ratings, percentile
+from src.domain.entities.movie_lens.movie import Movie
+from src.infrastructure.exceptions.recommender import ScoringTimeoutError
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    ItemBasedCFRecommender,
+)
+from src.infrastructure.services.recommender_module.recommender.scoring_executor import (
+    ScoringExecutor,
+)
+from src.infrastructure.services.recommender_module.similarity.sparse_builder import (
+    SparseSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+
+
+async def run(
+    recommender: ItemBasedCFRecommender,
+    users: list[int],
+    clients: int,
+    duration: float,
+    probe_interval: float,
+) -> tuple[list[float], list[float], int]:
+    probes: list[float] = []
+    latencies: list[float] = []
+    timeouts: int = 0
+    deadline: float = time.perf_counter() + duration
+
+    async def client(offset: int) -> None:
+        nonlocal timeouts
+        position: int = offset
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0)
+            user_id: int = users[position % len(users)]
+            position += clients
+
+            start = time.perf_counter()
+            try:
+                await recommender.recommend_for_user(user_id, 10)
+            except ScoringTimeoutError:
+                timeouts += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    async def probe() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(probe_interval)
+            probes.append(time.perf_counter() - start - probe_interval)
+
+    await asyncio.gather(probe(), *(client(offset) for offset in range(clients)))
+    return probes, latencies, timeouts
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--heavy-users", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    ratings = load_ratings(RATINGS_FILE)
+    movie_ids = sorted({movie_id for movies in ratings.values() for movie_id in movies})
+    movies = [
+        Movie(
+            id=movie_id,
+            title="",
+            release_date=None,
+            video_release_date=None,
+            imdb_url="",
+            genres=[],
+        )
+        for movie_id in movie_ids
+    ]
+
+    storage = RatingsStorage()
+    storage.set_users(ratings)
+    matrix = SparseSimilarityMatrixBuilder().build(ratings, movies)
+
+    users = sorted(ratings, key=lambda user_id: -len(ratings[user_id]))
+    users = users[: args.heavy_users]
+
+    print(
+        f"{'mode':>8} {'probe p50':>10} {'probe p99':>10} "
+        f"{'rec p50':>8} {'rec p99':>8} {'rec/s':>7} {'timeouts':>9}"
+    )
+    for mode in ("loop", "executor"):
+        executor = (
+            ScoringExecutor(
+                workers=args.workers,
+                max_concurrency=args.max_concurrency,
+                timeout=args.timeout,
+            )
+            if mode == "executor"
+            else None
+        )
+        recommender = ItemBasedCFRecommender(matrix, storage, scoring_executor=executor)
+
+        probes, latencies, timeouts = await run(
+            recommender, users, args.clients, args.duration, args.probe_interval
+        )
+        if executor is not None:
+            executor.shutdown()
+
+        print(
+            f"{mode:>8} {percentile(probes, 0.5) * 1000:>10.2f} "
+            f"{percentile(probes, 0.99) * 1000:>10.2f} "
+            f"{percentile(latencies, 0.5) * 1000:>8.2f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.2f} "
+            f"{len(latencies) / args.duration:>7.1f} {timeouts:>9}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,414 @@
+"""
+Воспроизводимый набор бенчмарков конвейера рекомендаций.
+
+Для каждого набора данных (ml-100k из assets и синтетические заданного
+размера) измеряет:
+- построение: заполнение RatingsStorage, матрица сходства, статистики
+  для онлайн-обновлений и пиковую память построения (tracemalloc)
+- p50/p99 recommend_for_user на фиксированной выборке пользователей
+- p50/p99 онлайн-обновления по одному рейтингу
+- запись и загрузку снимка (бинарный mmap и pickle) и их размер
+- скорость импорта рейтингов MovieLensImporter во временную SQLite БД
+
+Результаты пишутся в JSON вместе с окружением (Python, NumPy, коммит),
+а режим --compare сравнивает два таких файла и завершается с кодом 1,
+если какая-то метрика ухудшилась больше чем на --threshold.
+
+Запуск:
+    python -m benchmarks.suite --dataset ml-100k --output base.json
+    python -m benchmarks.suite --dataset ml-100k synthetic:20000x5000x2000000
+    python -m benchmarks.suite --compare base.json new.json --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.datasets import (
+    RatingArrays,
+    SyntheticSpec,
+    movielens_ratings,
+    synthetic_ratings,
+)
+from benchmarks.generate_dataset import (
+    ASSETS_DIR,
+    read_lines,
+    write_movies,
+    write_ratings,
+    write_users,
+)
+from benchmarks.neighbors import ROOT_DIR, percentile
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.binary_similarity_cache import BinarySimilarityCache
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    ItemBasedCFRecommender,
+)
+from src.infrastructure.services.recommender_module.similarity.builder import (
+    SimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.lsh_builder import (
+    LSHSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.sparse_builder import (
+    SparseSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.statistics import (
+    CosineStatistics,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+from src.infrastructure.services.similarity_cache import PickleSimilarityCache
+
+ML_100K_USERS: int = 943
+ML_100K_MOVIES: int = 1682
+
+# Метрики, для которых больше — лучше; для остальных с единицами
+# измерения (_seconds, _ms, _mb, _bytes) лучше меньше
+HIGHER_IS_BETTER: tuple[str, ...] = ("_per_second",)
+LOWER_IS_BETTER: tuple[str, ...] = ("_seconds", "_ms", "_mb", "_bytes")
+
+
+def load_dataset(name: str, seed: int) -> RatingArrays:
+    if name == "ml-100k":
+        return movielens_ratings(ASSETS_DIR / "u.data")
+    if name.startswith("synthetic:"):
+        return synthetic_ratings(SyntheticSpec.parse(name.split(":", 1)[1]), seed)
+    raise ValueError(f"Неизвестный набор данных: {name}")
+
+
+def make_builder(engine: str, policy: NeighborPolicy):
+    if engine == "python":
+        return SimilarityMatrixBuilder(neighbor_policy=policy)
+    if engine == "lsh":
+        return LSHSimilarityMatrixBuilder(neighbor_policy=policy)
+    return SparseSimilarityMatrixBuilder(neighbor_policy=policy)
+
+
+def build(
+    data: RatingArrays, engine: str, policy: NeighborPolicy
+) -> tuple[RatingsStorage, dict[int, dict[int, float]], dict[str, float]]:
+    results: dict[str, float] = {}
+
+    start = time.perf_counter()
+    storage = RatingsStorage()
+    storage.fill(
+        RatingRecord(*row)
+        for row in zip(
+            data.user_ids.tolist(),
+            data.movie_ids.tolist(),
+            data.ratings.tolist(),
+            data.timestamps.tolist(),
+        )
+    )
+    results["storage_seconds"] = time.perf_counter() - start
+
+    movies = [
+        Movie(
+            id=movie_id,
+            title="",
+            release_date=None,
+            video_release_date=None,
+            imdb_url="",
+            genres=[],
+        )
+        for movie_id in sorted(storage.movies)
+    ]
+
+    start = time.perf_counter()
+    matrix = make_builder(engine, policy).build(storage.users, movies)
+    results["similarity_seconds"] = time.perf_counter() - start
+    results["nnz"] = sum(len(row) for row in matrix.values())
+
+    return storage, matrix, results
+
+
+def build_peak_memory(data: RatingArrays, engine: str, policy: NeighborPolicy) -> float:
+    """Пиковая память построения в МБ; отдельный прогон, так как tracemalloc
+    заметно замедляет код на объектах Python."""
+    tracemalloc.start()
+    try:
+        build(data, engine, policy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+async def measure_recommend(
+    recommender: ItemBasedCFRecommender, users: list[int], top_n: int
+) -> dict[str, float]:
+    latencies: list[float] = []
+    for user_id in users:
+        start = time.perf_counter()
+        await recommender.recommend_for_user(user_id, top_n)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def measure_update(
+    recommender: ItemBasedCFRecommender,
+    data: RatingArrays,
+    updates: int,
+    rng: random.Random,
+) -> dict[str, float]:
+    user_ids: list[int] = np.unique(data.user_ids).tolist()
+    movie_ids: list[int] = np.unique(data.movie_ids).tolist()
+    timestamp: int = int(data.timestamps.max()) + 1
+
+    latencies: list[float] = []
+    for _ in range(updates):
+        record = RatingRecord(
+            user_id=rng.choice(user_ids),
+            movie_id=rng.choice(movie_ids),
+            rating=rng.randint(1, 5),
+            timestamp=timestamp,
+        )
+        start = time.perf_counter()
+        await recommender.update_for_record(record)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def measure_snapshots(
+    storage: RatingsStorage, matrix: dict[int, dict[int, float]], directory: Path
+) -> dict[str, float]:
+    state = {
+        "user_ratings": storage.users,
+        "movie_ratings": storage.movies,
+        "similarity_matrix": matrix,
+        "sequence": 0,
+    }
+    results: dict[str, float] = {}
+
+    for name, cache in (
+        ("binary", BinarySimilarityCache(directory / "similarity.snapshot")),
+        ("pickle", PickleSimilarityCache(directory / "similarity.pickle")),
+    ):
+        start = time.perf_counter()
+        await cache.save(state)
+        results[f"{name}_save_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = await cache.load()
+        results[f"{name}_load_seconds"] = time.perf_counter() - start
+        results[f"{name}_bytes"] = cache.path.stat().st_size
+        del loaded
+
+    return results
+
+
+def measure_importer(data: RatingArrays, directory: Path) -> dict[str, float]:
+    """Импортирует набор во временную SQLite БД в отдельном процессе.
+
+    Справочники ml-100k копируются из assets, если id набора в них
+    помещаются, а иначе пользователи и фильмы генерируются под набор.
+    """
+    dataset_dir = directory / "dataset"
+    dataset_dir.mkdir()
+    for name in ("u.genre", "u.occupation"):
+        shutil.copy(ASSETS_DIR / name, dataset_dir / name)
+
+    rng = random.Random(0)
+    users: int = int(data.user_ids.max())
+    movies: int = int(data.movie_ids.max())
+    if users <= ML_100K_USERS and movies <= ML_100K_MOVIES:
+        shutil.copy(ASSETS_DIR / "u.user", dataset_dir / "u.user")
+        shutil.copy(ASSETS_DIR / "u.item", dataset_dir / "u.item")
+    else:
+        occupations: list[str] = read_lines(ASSETS_DIR / "u.occupation")
+        genres: int = len(read_lines(ASSETS_DIR / "u.genre"))
+        write_users(dataset_dir / "u.user", users, occupations, rng)
+        write_movies(dataset_dir / "u.item", movies, genres, rng)
+    write_ratings(dataset_dir / "u.data", data)
+
+    env = dict(os.environ)
+    env["DB_DSN"] = str(directory / "bench.sqlite")
+    # Настройки без значений по умолчанию; импорт их не использует
+    env.setdefault("BOT_TOKEN", "benchmark")
+    env.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-benchmark")
+    env.setdefault("SECURITY_APIKEYS", '["benchmark"]')
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.importer", "--data-dir", str(dataset_dir)],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+async def run_dataset(name: str, args: argparse.Namespace) -> dict[str, float]:
+    rng = random.Random(args.seed)
+    policy = NeighborPolicy(max_neighbors=args.max_neighbors)
+
+    data: RatingArrays = load_dataset(name, args.seed)
+    results: dict[str, float] = {
+        "ratings": len(data),
+        "users": len(np.unique(data.user_ids)),
+        "movies": len(np.unique(data.movie_ids)),
+    }
+
+    storage, matrix, build_results = build(data, args.engine, policy)
+    results.update({f"build.{key}": value for key, value in build_results.items()})
+
+    start = time.perf_counter()
+    statistics = CosineStatistics.from_ratings(storage.movies)
+    results["build.statistics_seconds"] = time.perf_counter() - start
+
+    if not args.skip_memory:
+        results["build.peak_memory_mb"] = build_peak_memory(data, args.engine, policy)
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = await measure_snapshots(storage, matrix, Path(directory))
+    results.update({f"snapshot.{key}": value for key, value in snapshot.items()})
+
+    recommender = ItemBasedCFRecommender(matrix, storage, policy, statistics)
+    users: list[int] = sorted(storage.users)
+    sample: list[int] = rng.sample(users, min(args.users, len(users)))
+
+    recommend = await measure_recommend(recommender, sample, args.top_n)
+    results.update({f"recommend.{key}": value for key, value in recommend.items()})
+
+    update = await measure_update(recommender, data, args.updates, rng)
+    results.update({f"update.{key}": value for key, value in update.items()})
+
+    if not args.skip_importer:
+        with tempfile.TemporaryDirectory() as directory:
+            importer = measure_importer(data, Path(directory))
+        results.update({f"importer.{key}": value for key, value in importer.items()})
+
+    return results
+
+
+def environment() -> dict[str, str | None]:
+    try:
+        commit: str | None = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(base_path: Path, new_path: Path, threshold: float) -> int:
+    """
+    Печатает изменение метрик между двумя прогонами
+
+    Returns:
+        Количество ухудшившихся метрик
+    """
+    base = json.loads(base_path.read_text(encoding="utf-8"))
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+
+    regressions: int = 0
+    print(f"{'metric':<50} {'base':>12} {'new':>12} {'change':>8}")
+    for dataset, metrics in new["results"].items():
+        base_metrics: dict[str, float] = base["results"].get(dataset, {})
+        for metric, value in metrics.items():
+            old = base_metrics.get(metric)
+            if old is None:
+                continue
+
+            change: float = (value - old) / old if old else 0.0
+            worse: bool = (
+                metric.endswith(HIGHER_IS_BETTER) and change < -threshold
+            ) or (metric.endswith(LOWER_IS_BETTER) and change > threshold)
+            regressions += worse
+
+            print(
+                f"{dataset + '/' + metric:<50} {old:>12.4g} {value:>12.4g} "
+                f"{change:>+7.1%}{'  REGRESSION' if worse else ''}"
+            )
+
+    return regressions
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--dataset", nargs="+", default=["ml-100k"])
+    parser.add_argument(
+        "--engine", choices=("sparse", "lsh", "python"), default="sparse"
+    )
+    parser.add_argument("--max-neighbors", type=int, default=None)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-memory", action="store_true")
+    parser.add_argument("--skip-importer", action="store_true")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("BASE", "NEW"))
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        print(f"\nRegressions over {args.threshold:.0%}: {regressions}")
+        sys.exit(1 if regressions else 0)
+
+    report = {
+        "environment": environment(),
+        "parameters": {
+            "engine": args.engine,
+            "max_neighbors": args.max_neighbors,
+            "users": args.users,
+            "updates": args.updates,
+            "top_n": args.top_n,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for name in args.dataset:
+        results = await run_dataset(name, args)
+        report["results"][name] = results
+        for metric, value in results.items():
+            print(f"{name + '/' + metric:<50} {value:>12.4g}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+from src.domain.entities.movie_lens.user import User, UserGender
+from src.shared.types.roles import Role
+
+
+@dataclass(frozen=True, slots=True)
+class UserDTO:
+    id: int
+    age: int
+    gender: UserGender
+    occupation: str
+    role: Role = Role.UNSUBSCRIBED
+
+    @classmethod
+    def from_entity(cls, user: User) -> "UserDTO":
+        return cls(
+            id=user.id,
+            age=user.age,
+            gender=user.gender,
+            occupation=user.occupation.name,
+        )
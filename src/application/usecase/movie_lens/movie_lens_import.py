@@ -1,12 +1,16 @@
 from pathlib import Path
 
+from src.domain.interfaces.movie_catalog import IMovieCatalog
 from src.infrastructure.services.movie_lens_importer import MovieLensImporter
 
 
 class MovieLensImportUseCase:
-    def __init__(self):
-        pass
+    def __init__(self, catalog: IMovieCatalog | None = None):
+        self.catalog = catalog
 
     async def execute(self, movie_lens_path: Path):
         service = MovieLensImporter(movie_lens_path)
         await service.import_all()
+
+        if self.catalog is not None:
+            self.catalog.invalidate()
@@ -0,0 +1,46 @@
+from collections.abc import Collection
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.interfaces.movie_catalog import IMovieCatalog
+from src.domain.repositories.movie import MovieRepositoryInterface
+
+
+class MoviesGetPageUseCase:
+    def __init__(
+        self, catalog: IMovieCatalog, movie_repository: MovieRepositoryInterface
+    ):
+        self.catalog = catalog
+        self.movie_repository = movie_repository
+
+    async def execute(
+        self,
+        after_id: int | None = None,
+        limit: int = 100,
+        genre_ids: Collection[int] = (),
+        year_from: int | None = None,
+        year_to: int | None = None,
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Movie], int | None]:
+        """
+        Возвращает страницу каталога
+
+        Пока каталог в памяти не загружен (идёт прогрев или каталог сброшен
+        импортом), страница читается из БД тем же keyset-запросом
+
+        Returns:
+            Фильмы страницы и after_id для следующей страницы
+            (None, если страница последняя)
+        """
+        source: IMovieCatalog | MovieRepositoryInterface = (
+            self.catalog if self.catalog.loaded else self.movie_repository
+        )
+        movies: list[Movie] = await source.get_page(
+            after_id=after_id,
+            limit=limit,
+            genre_ids=genre_ids,
+            year_from=year_from,
+            year_to=year_to,
+            fields=fields,
+        )
+        next_after_id: int | None = movies[-1].id if len(movies) == limit else None
+        return movies, next_after_id
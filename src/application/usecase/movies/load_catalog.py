@@ -0,0 +1,15 @@
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.interfaces.movie_catalog import IMovieCatalog
+from src.domain.repositories.base import RepositoryInterface
+
+
+class MovieCatalogLoadUseCase:
+    def __init__(
+        self, movie_repository: RepositoryInterface[Movie], catalog: IMovieCatalog
+    ):
+        self.movie_repository = movie_repository
+        self.catalog = catalog
+
+    async def execute(self) -> None:
+        movies: list[Movie] = await self.movie_repository.get_all()
+        self.catalog.load(movies)
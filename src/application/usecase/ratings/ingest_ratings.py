@@ -0,0 +1,56 @@
+import logging
+from collections.abc import Callable
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.domain.interfaces.recommender import IRecommender
+from src.domain.repositories.rating import RatingRepositoryInterface
+
+logger = logging.getLogger(__name__)
+
+
+class IngestRatingsUseCase:
+    def __init__(
+        self,
+        rating_repository: RatingRepositoryInterface,
+        recommender: Callable[[], IRecommender],
+    ):
+        """
+        Args:
+            rating_repository: Репозиторий рейтингов
+            recommender: Функция, возвращающая текущий рекомендатель
+        """
+        self.rating_repository = rating_repository
+        self.recommender = recommender
+
+    async def execute(self, records: list[RatingRecord]) -> list[RatingRecord]:
+        """
+        Сохраняет пачку рейтингов одной транзакцией и применяет её к модели
+
+        Рейтинги пользователей, которых нет в БД, не сохраняются. Рекомендатель
+        обновляется только после успешной записи в БД, а ошибка обновления
+        по одному рейтингу логируется и не мешает применить остальные:
+        рейтинг уже в БД и попадёт в модель при следующей пересборке
+
+        Returns:
+            Рейтинги, отклонённые из-за неизвестного пользователя
+        """
+        unknown: set[int] = await self.rating_repository.missing_user_ids(
+            record.user_id for record in records
+        )
+        rejected: list[RatingRecord] = [
+            record for record in records if record.user_id in unknown
+        ]
+        accepted: list[RatingRecord] = [
+            record for record in records if record.user_id not in unknown
+        ]
+
+        await self.rating_repository.add_many(accepted, commit=True)
+
+        recommender: IRecommender = self.recommender()
+        for record in accepted:
+            try:
+                await recommender.update_for_record(record)
+            except Exception:
+                logger.exception("Не удалось применить рейтинг %s к модели", record)
+
+        return rejected
@@ -0,0 +1,9 @@
+from src.domain.repositories.rating import RatingRepositoryInterface
+
+
+class PopularMoviesUseCase:
+    def __init__(self, rating_repository: RatingRepositoryInterface):
+        self.rating_repository = rating_repository
+
+    async def execute(self, limit: int | None = None) -> list[int]:
+        return await self.rating_repository.get_popular_movie_ids(limit)
@@ -1,13 +1,13 @@
 from src.domain.entities.movie_lens.movie import Movie
-from src.domain.entities.movie_lens.raitings import Rating
 from src.domain.interfaces.recommender import IRecommender, IRecommenderBuilder
 from src.domain.repositories.base import RepositoryInterface
+from src.domain.repositories.rating import RatingRepositoryInterface
 
 
 class RecommenderBuilderUseCase:
     def __init__(
         self,
-        rating_repository: RepositoryInterface[Rating],
+        rating_repository: RatingRepositoryInterface,
         movie_repository: RepositoryInterface[Movie],
         recommender: IRecommenderBuilder,
     ):
@@ -15,9 +15,19 @@ class RecommenderBuilderUseCase:
         self.movie_repository = movie_repository
         self.recommender = recommender
 
-    async def execute(self) -> IRecommender:
-        ratings = self.rating_repository.get_all
+    async def execute(self, rebuild: bool = False) -> IRecommender:
+        def ratings(max_id: int | None, after_id: int | None):
+            # Строки порции разбираются в цикле событий, поэтому порции
+            # небольшие: пересборка идёт, пока обслуживаются запросы
+            return self.rating_repository.iter_records(
+                chunk_size=10_000, max_id=max_id, after_id=after_id
+            )
+
         movies = self.movie_repository.get_all
 
-        recommender_service = await self.recommender.build(ratings, movies)
+        fingerprint = self.rating_repository.get_fingerprint
+
+        recommender_service = await self.recommender.build(
+            ratings, movies, fingerprint, rebuild=rebuild
+        )
         return recommender_service
@@ -0,0 +1,15 @@
+from src.application.dto.user.user import UserDTO
+from src.domain.entities.movie_lens.user import User
+from src.domain.repositories.base import RepositoryInterface
+
+
+class GetUserUseCase:
+    def __init__(self, user_repository: RepositoryInterface[User]):
+        self.user_repository = user_repository
+
+    async def execute(self, user_id: int) -> UserDTO | None:
+        user: User | None = await self.user_repository.get(user_id, "id")
+        if user is None:
+            return None
+
+        return UserDTO.from_entity(user)
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetFingerprint:
+    """Отпечаток набора рейтингов в БД.
+
+    Описывает строки рейтингов с id не больше max_id. Новые строки
+    в отпечаток не попадают, поэтому он меняется только при изменении
+    или удалении уже существовавших рейтингов.
+    """
+
+    max_id: int
+    count: int
+    rating_sum: int
+    timestamp_sum: int
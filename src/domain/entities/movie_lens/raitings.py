@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import NamedTuple
 
 from src.domain.entities.movie_lens.movie import Movie
 from src.domain.entities.movie_lens.user import User
@@ -10,3 +11,12 @@ class Rating:
     movie: Movie
     rating: int
     timestamp: int
+
+
+class RatingRecord(NamedTuple):
+    """Рейтинг в виде плоской записи из идентификаторов, без графа сущностей."""
+
+    user_id: int
+    movie_id: int
+    rating: int
+    timestamp: int
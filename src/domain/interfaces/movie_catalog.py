@@ -0,0 +1,57 @@
+from collections.abc import Collection
+from typing import Protocol
+
+from src.domain.entities.movie_lens.movie import Movie
+
+
+class IMovieCatalog(Protocol):
+    """Каталог фильмов, из которого отдаются страницы /movies."""
+
+    @property
+    def loaded(self) -> bool:
+        """True, если каталог загружен и актуален."""
+        ...
+
+    def load(self, movies: list[Movie]) -> None:
+        """
+        Заменяет содержимое каталога
+
+        Args:
+            movies: Все фильмы каталога
+        """
+        ...
+
+    def has_movie(self, movie_id: int) -> bool:
+        """Проверяет, что фильм есть в каталоге."""
+        ...
+
+    def invalidate(self) -> None:
+        """Помечает каталог устаревшим, например после импорта фильмов."""
+        ...
+
+    async def get_page(
+        self,
+        after_id: int | None = None,
+        limit: int = 100,
+        genre_ids: Collection[int] = (),
+        year_from: int | None = None,
+        year_to: int | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[Movie]:
+        """
+        Возвращает страницу фильмов по возрастанию id (keyset-пагинация)
+
+        Args:
+            after_id: Вернуть фильмы с id строго больше этого значения
+            limit: Максимальное количество фильмов на странице
+            genre_ids: Вернуть только фильмы хотя бы одного из этих жанров
+            year_from: Нижняя граница года выхода (включительно)
+            year_to: Верхняя граница года выхода (включительно)
+            fields: Поля фильма, которые нужно вернуть. Остальные поля
+                сущности остаются пустыми (None, пустая строка или список).
+                Если не указаны, возвращаются все поля
+
+        Returns:
+            list[Movie]: Фильмы страницы
+        """
+        ...
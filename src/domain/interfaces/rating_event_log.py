@@ -0,0 +1,49 @@
+from typing import Iterator, Protocol
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+
+
+class IRatingEventLog(Protocol):
+    @property
+    def last_sequence(self) -> int:
+        """Номер последнего записанного события (0, если журнал пуст)."""
+        ...
+
+    def append(self, record: RatingRecord) -> int:
+        """
+        Дописывает рейтинг в конец журнала
+
+        Args:
+            record: Новый или обновлённый рейтинг
+
+        Returns:
+            Порядковый номер события
+        """
+        ...
+
+    def read_since(self, sequence: int) -> Iterator[tuple[int, RatingRecord]]:
+        """
+        Читает события, записанные после указанного номера
+
+        Args:
+            sequence: Номер последнего уже учтённого события
+
+        Returns:
+            Пары (номер события, рейтинг) в порядке записи
+        """
+        ...
+
+    def compact(self, sequence: int) -> None:
+        """
+        Удаляет события до указанного номера, уже учтённые в снимке модели
+
+        Событие с этим номером остаётся, чтобы нумерация продолжалась
+
+        Args:
+            sequence: Номер последнего события, сохранённого в снимке
+        """
+        ...
+
+    def close(self) -> None:
+        """Закрывает файл журнала."""
+        ...
@@ -1,7 +1,9 @@
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
 from typing import Protocol, Callable, Awaitable
 
 from src.domain.entities.movie_lens.movie import Movie
-from src.domain.entities.movie_lens.raitings import Rating
+from src.domain.entities.dataset_fingerprint import DatasetFingerprint
+from src.domain.entities.movie_lens.raitings import Rating, RatingRecord
 
 
 class IRecommender(Protocol):
@@ -18,6 +20,54 @@ class IRecommender(Protocol):
         """
         ...
 
+    def recommend_for_users(
+        self, requests: Sequence[tuple[int, int]]
+    ) -> AsyncIterator[tuple[int, list[int]]]:
+        """
+        Формирует рекомендации для группы пользователей за один проход
+
+        Результат совпадает с recommend_for_user для каждого пользователя,
+        но оценки считаются сразу для блока пользователей, а готовые
+        рекомендации отдаются по мере расчёта блоков
+
+        Args:
+            requests: Пары (идентификатор пользователя, количество фильмов)
+
+        Returns:
+            Асинхронный поток пар (идентификатор пользователя, рекомендации)
+            в порядке запросов
+        """
+        ...
+
+    async def materialize(self, top_n: int, workers: int = 1) -> None:
+        """
+        Заранее считает top-N рекомендации всех пользователей с оценками
+
+        После материализации recommend_for_user отвечает для этих
+        пользователей из готовой таблицы, пока их рекомендации не изменятся
+        после онлайн-обновления
+
+        Args:
+            top_n: Количество фильмов на пользователя
+            workers: Количество параллельных потоков расчёта
+
+        Returns:
+            None
+        """
+        ...
+
+    def catch_up(self) -> int:
+        """
+        Применяет события журнала, записанные после последнего учтённого
+
+        Вызывается перед подменой рабочей модели только что собранной,
+        чтобы новая модель учла рейтинги, пришедшие во время сборки
+
+        Returns:
+            Количество применённых событий
+        """
+        ...
+
     async def update_for_rating(self, rating: Rating) -> None:
         """
         Обновляет рекомендационную модель после появления нового рейтинга.
@@ -34,23 +84,55 @@ class IRecommender(Protocol):
         """
         ...
 
+    async def update_for_record(self, record: RatingRecord) -> None:
+        """
+        Обновляет рекомендационную модель по плоской записи рейтинга.
+
+        Если у модели есть журнал событий, запись сначала дописывается
+        в него, чтобы после перезапуска её можно было применить к снимку.
+
+        Args:
+            record (RatingRecord): Новый или обновлённый рейтинг
+
+        Returns:
+            None
+        """
+        ...
+
 
 class IRecommenderBuilder(Protocol):
     async def build(
         self,
-        ratings_loader: Callable[[], Awaitable[list[Rating]]],
+        ratings_loader: Callable[
+            [int | None, int | None], AsyncIterable[list[RatingRecord]]
+        ],
         movies_loader: Callable[[], Awaitable[list[Movie]]],
+        fingerprint_loader: (
+            Callable[[int | None], Awaitable[DatasetFingerprint]] | None
+        ) = None,
+        rebuild: bool = False,
     ) -> IRecommender:
         """
         Формирует внутреннюю модель рекомендаций на основе переданных данных.
 
         Метод загружает данные через переданные загрузчики, заполняет структуру
         пользовательских рейтингов и формирует матрицу сходства фильмов.
-        Если доступен кеш, данные читаются из него и сохраняются после расчёта
+        Если доступен кеш, данные читаются из него и сохраняются после расчёта.
+        Снимок из кеша отбрасывается, если отпечаток рейтингов в БД изменился,
+        а рейтинги, добавленные в БД после снимка, и события журнала
+        применяются поверх него
+
+        Тяжёлые по CPU шаги выполняются в отдельном потоке, поэтому сборка
+        не останавливает обработку запросов в цикле событий
 
         Args:
-            ratings_loader: Асинхронная функция, возвращающая список всех рейтингов
+            ratings_loader: Функция, возвращающая асинхронный поток порций
+                рейтингов в виде плоских записей с id не больше первого
+                аргумента и больше второго (None — без ограничения)
             movies_loader: Асинхронная функция, возвращающая список всех фильмов
+            fingerprint_loader: Асинхронная функция, возвращающая отпечаток
+                рейтингов с id не больше переданного
+            rebuild: Не читать снимок из кеша и собрать модель по БД заново
 
         Returns:
             None
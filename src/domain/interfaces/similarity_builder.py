@@ -0,0 +1,23 @@
+from typing import Protocol
+
+from src.domain.entities.movie_lens.movie import Movie
+
+
+class ISimilarityMatrixBuilder(Protocol):
+    def build(
+        self,
+        user_ratings: dict[int, dict[int, int]],
+        movies: list[Movie],
+    ) -> dict[int, dict[int, float]]:
+        """
+        Строит матрицу сходства фильмов
+
+        Args:
+            user_ratings: Словарь пользовательских оценок,
+                структура user_id → {movie_id → rating}
+            movies: Список всех фильмов
+
+        Returns:
+            Матрица сходства фильмов вида {movie_id: {other_movie_id: similarity}}
+        """
+        ...
@@ -1,7 +1,27 @@
-from typing import Protocol
+from collections.abc import MutableMapping
+from typing import Protocol, TypedDict, NotRequired
+
+
+class RecommenderState(TypedDict):
+    """Снимок состояния рекомендателя, который сохраняется в кэш.
+
+    Матрицы могут быть как обычными словарями, так и лениво декодируемыми
+    отображениями поверх бинарного снимка.
+    """
+
+    user_ratings: MutableMapping[int, dict[int, int]]
+    movie_ratings: NotRequired[MutableMapping[int, dict[int, int]]]
+    similarity_matrix: MutableMapping[int, dict[int, float]]
+    # Номер последнего события журнала рейтингов, учтённого в снимке
+    sequence: NotRequired[int]
+    # Статистики косинуса (нормы и скалярные произведения векторов фильмов)
+    statistics_norms: NotRequired[dict[int, int]]
+    statistics_dots: NotRequired[MutableMapping[int, dict[int, int]]]
+    # Отпечаток рейтингов БД, по которым построен снимок (поля DatasetFingerprint)
+    fingerprint: NotRequired[dict[str, int]]
 
 
 class ISimilarityCache(Protocol):
-    async def load(self) -> dict[int, dict[int, float]] | None: ...
+    async def load(self) -> RecommenderState | None: ...
 
-    async def save(self, matrix: dict[int, dict[int, float]]) -> None: ...
+    async def save(self, state: RecommenderState) -> None: ...
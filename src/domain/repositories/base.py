@@ -32,6 +32,14 @@ class RepositoryInterface[EntityType](Protocol):
         """
         ...
 
+    async def exists(self) -> bool:
+        """Проверяет, есть ли в базе данных хотя бы один объект.
+
+        Returns:
+            bool: True, если таблица не пуста, иначе False.
+        """
+        ...
+
     async def get_all_by_ids(self, ids: list[int] | list[str]) -> list[EntityType]:
         """Возвращает все объекты, чьи `id` входят в переданный список.
 
@@ -0,0 +1,38 @@
+from collections.abc import Collection
+from typing import Protocol
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.repositories.base import RepositoryInterface
+
+
+class MovieRepositoryInterface(RepositoryInterface[Movie], Protocol):
+    """Интерфейс репозитория фильмов."""
+
+    async def get_page(
+        self,
+        after_id: int | None = None,
+        limit: int = 100,
+        genre_ids: Collection[int] = (),
+        year_from: int | None = None,
+        year_to: int | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[Movie]:
+        """Возвращает страницу фильмов по возрастанию id (keyset-пагинация).
+
+        Все фильтры выполняются в SQL, поэтому размер страницы не зависит
+        от размера каталога.
+
+        Args:
+            after_id: Вернуть фильмы с id строго больше этого значения
+            limit: Максимальное количество фильмов на странице
+            genre_ids: Вернуть только фильмы хотя бы одного из этих жанров
+            year_from: Нижняя граница года выхода (включительно)
+            year_to: Верхняя граница года выхода (включительно)
+            fields: Поля фильма, которые нужно загрузить. Остальные поля
+                сущности остаются пустыми (None, пустая строка или список).
+                Если не указаны, загружаются все поля
+
+        Returns:
+            list[Movie]: Фильмы страницы
+        """
+        ...
@@ -0,0 +1,88 @@
+from collections.abc import AsyncIterator, Iterable
+from typing import Protocol
+
+from src.domain.entities.dataset_fingerprint import DatasetFingerprint
+from src.domain.entities.movie_lens.raitings import Rating, RatingRecord
+from src.domain.repositories.base import RepositoryInterface
+
+
+class RatingRepositoryInterface(RepositoryInterface[Rating], Protocol):
+    """Интерфейс репозитория рейтингов."""
+
+    async def add_many(
+        self, records: Iterable[RatingRecord], commit: bool = True
+    ) -> int:
+        """Добавляет рейтинги одним пакетным INSERT без построения сущностей.
+
+        Повторная оценка того же фильма пользователем добавляется новой
+        строкой, а прежняя помечается заменённой: строки, уже учтённые
+        в снимке рекомендателя, не меняются. Оценка, совпадающая
+        с действующей, не добавляется.
+
+        Args:
+            records: Рейтинги в виде плоских записей
+            commit: Зафиксировать транзакцию после вставки
+
+        Returns:
+            int: Количество добавленных рейтингов
+        """
+        ...
+
+    async def missing_user_ids(self, user_ids: Iterable[int]) -> set[int]:
+        """Находит пользователей, которых нет в таблице пользователей.
+
+        Args:
+            user_ids: Идентификаторы пользователей
+
+        Returns:
+            set[int]: Идентификаторы из user_ids без записи о пользователе
+        """
+        ...
+
+    def iter_records(
+        self,
+        chunk_size: int = 50_000,
+        max_id: int | None = None,
+        after_id: int | None = None,
+    ) -> AsyncIterator[list[RatingRecord]]:
+        """Потоково читает рейтинги только колонками идентификаторов.
+
+        Связанные пользователи и фильмы не загружаются, а строки не
+        превращаются в сущности, поэтому чтение для построения модели
+        не зависит от размера графа объектов. Заменённые оценки тоже
+        читаются: в порядке id их перекрывает более поздняя оценка пары.
+
+        Args:
+            chunk_size: Количество рейтингов в одной порции
+            max_id: Читать только рейтинги с id не больше этого значения
+            after_id: Читать только рейтинги с id больше этого значения
+
+        Returns:
+            AsyncIterator[list[RatingRecord]]: Порции рейтингов в порядке id
+        """
+        ...
+
+    async def get_fingerprint(self, max_id: int | None = None) -> DatasetFingerprint:
+        """Считает отпечаток рейтингов с id не больше max_id.
+
+        Args:
+            max_id: Граница по id. Если не указана, берётся текущий максимальный id
+
+        Returns:
+            DatasetFingerprint: Отпечаток набора рейтингов
+        """
+        ...
+
+    async def get_popular_movie_ids(self, limit: int | None = None) -> list[int]:
+        """Возвращает фильмы по убыванию количества оценок.
+
+        Считается одним агрегирующим запросом, без загрузки рейтингов в память.
+
+        Args:
+            limit: Максимальное количество фильмов (None — все оценённые)
+
+        Returns:
+            list[int]: Идентификаторы фильмов; при равном количестве оценок
+                фильмы упорядочены по id
+        """
+        ...
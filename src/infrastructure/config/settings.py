@@ -3,6 +3,12 @@ from pathlib import Path
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.shared.types.recommender import (
+    PopularityScore,
+    RecommenderModel,
+    SimilarityEngine,
+)
+
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent.parent
 
 
@@ -18,6 +24,8 @@ class TelegramSettings(BaseSettings):
 
 class SecuritySettings(BaseSettings):
     apikeys: list[str] = Field(...)
+    auth_cache_size: int = Field(default=10_000, ge=0)
+    auth_cache_ttl: float = Field(default=60.0, gt=0)
 
 
 class DBSettings(BaseSettings):
@@ -28,12 +36,54 @@ class DBSettings(BaseSettings):
         return f"sqlite+aiosqlite:///{self.dsn.as_posix()}"
 
 
+class RecommenderSettings(BaseSettings):
+    model: RecommenderModel = RecommenderModel.ITEM_CF
+    engine: SimilarityEngine = SimilarityEngine.SPARSE
+    popularity: PopularityScore = PopularityScore.COUNT
+    max_neighbors: int | None = Field(default=None, gt=0)
+    min_similarity: float = Field(default=0.0, ge=0.0)
+    incremental_updates: bool = True
+    build_workers: int = Field(default=1, ge=1)
+    lsh_bands: int = Field(default=32, ge=1)
+    lsh_rows: int = Field(default=8, ge=1, le=62)
+    lsh_seed: int = 0
+    lsh_max_bucket_size: int | None = Field(default=None, gt=1)
+    lsh_exact_density: float = Field(default=0.05, gt=0.0, le=1.0)
+    als_factors: int = Field(default=32, ge=1)
+    als_iterations: int = Field(default=15, ge=1)
+    als_regularization: float = Field(default=10.0, gt=0.0)
+    als_alpha: float = Field(default=1.0, gt=0.0)
+    als_cg_steps: int = Field(default=3, ge=0)
+    als_seed: int = 0
+    event_log_fsync: bool = False
+    result_cache_size: int = Field(default=10_000, ge=0)
+    result_cache_ttl: float = Field(default=300.0, gt=0)
+    materialize_top_n: int = Field(default=50, ge=0)
+    materialize_workers: int = Field(default=1, ge=1)
+    materialize_refresh_delay: float | None = Field(default=1.0, gt=0)
+    rebuild_interval: float | None = Field(default=None, gt=0)
+    scoring_offload: bool = False
+    scoring_workers: int = Field(default=1, ge=1)
+    scoring_max_concurrency: int = Field(default=32, ge=1)
+    scoring_timeout: float | None = Field(default=2.0, gt=0)
+
+
+class IngestionSettings(BaseSettings):
+    queue_size: int = Field(default=10_000, gt=0)
+    batch_size: int = Field(default=500, gt=0)
+    flush_interval: float = Field(default=0.5, gt=0)
+    max_retries: int = Field(default=3, ge=0)
+    retry_delay: float = Field(default=0.5, gt=0)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=ROOT_DIR / ".env",
         env_prefix="",
         extra="forbid",
         env_nested_delimiter="_",
+        # Делится только первый "_": RECOMMENDER_MAX_NEIGHBORS → recommender.max_neighbors
+        env_nested_max_split=1,
     )
 
     debug: bool = False
@@ -41,6 +91,8 @@ class Settings(BaseSettings):
     security: SecuritySettings = Field(default_factory=SecuritySettings)
     jwt: JWTSettings = Field(default_factory=JWTSettings)
     db: DBSettings = Field(default_factory=DBSettings)
+    recommender: RecommenderSettings = Field(default_factory=RecommenderSettings)
+    ingestion: IngestionSettings = Field(default_factory=IngestionSettings)
 
 
 settings = Settings()
@@ -1,3 +1,4 @@
+from src.infrastructure.db.migrations import rating_revisions_pending
 from src.infrastructure.db.models import Base
 from src.infrastructure.db.session import engine
 
@@ -6,6 +7,14 @@ async def init_db():
     async with engine.begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
 
+        # Существующие таблицы create_all не меняет, а миграция схемы
+        # выполняется только явно
+        if await rating_revisions_pending(connection):
+            raise RuntimeError(
+                "Схема таблицы rating устарела: выполните "
+                "python -m src.infrastructure.db.migrations"
+            )
+
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,76 @@
+"""
+Разовые миграции схемы БД
+
+create_all создаёт недостающие таблицы, но не меняет существующие. Изменения
+схемы уже созданных таблиц применяются явно:
+
+    python -m src.infrastructure.db.migrations
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.infrastructure.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+async def rating_revisions_pending(connection: AsyncConnection) -> bool:
+    """Проверяет, что в таблице рейтингов ещё нет колонки superseded."""
+    result = await connection.execute(text("PRAGMA table_info(rating)"))
+    columns: set[str] = {row[1] for row in result}
+    return bool(columns) and "superseded" not in columns
+
+
+async def migrate_rating_revisions(connection: AsyncConnection) -> int:
+    """
+    Переводит таблицу рейтингов на заменяемые оценки
+
+    Добавляет колонку superseded. Из повторных оценок одного фильма
+    действующей остаётся последняя по id, а остальные помечаются
+    заменёнными — строки не удаляются. Затем уникальный индекс пары
+    (user_id, movie_id) строится только по действующим оценкам
+
+    Returns:
+        Количество оценок, помеченных заменёнными
+    """
+    await connection.execute(
+        text("ALTER TABLE rating ADD COLUMN superseded BOOLEAN NOT NULL DEFAULT 0")
+    )
+    result = await connection.execute(
+        text(
+            "UPDATE rating SET superseded = 1 WHERE id NOT IN "
+            "(SELECT MAX(id) FROM rating GROUP BY user_id, movie_id)"
+        )
+    )
+    await connection.execute(text("DROP INDEX IF EXISTS ix_rating_user_movie"))
+    await connection.execute(
+        text(
+            "CREATE UNIQUE INDEX ix_rating_user_movie_live "
+            "ON rating (user_id, movie_id) WHERE superseded = 0"
+        )
+    )
+
+    return result.rowcount
+
+
+async def migrate() -> None:
+    async with engine.begin() as connection:
+        if not await rating_revisions_pending(connection):
+            logger.info("Схема БД актуальна, миграции не нужны")
+            return
+
+        superseded: int = await migrate_rating_revisions(connection)
+        logger.warning(
+            "Таблица rating переведена на заменяемые оценки: "
+            "%s повторных оценок помечены заменёнными",
+            superseded,
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate())
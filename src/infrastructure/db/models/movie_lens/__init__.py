@@ -3,3 +3,4 @@ from .user import *
 from .genre import *
 from .movie import *
 from .raitings import *
+from .import_progress import *
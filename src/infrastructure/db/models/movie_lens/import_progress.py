@@ -0,0 +1,18 @@
+from sqlmodel import Field
+
+from src.infrastructure.db.models import Base
+
+
+class ImportProgressORM(Base, table=True):
+    """Прогресс импорта файла датасета.
+
+    Обновляется в той же транзакции, что и очередной пакет строк, поэтому
+    прерванный импорт продолжается с первой незафиксированной строки.
+    """
+
+    __tablename__ = "import_progress"
+
+    name: str = Field(primary_key=True)
+    # Количество строк файла, уже записанных в БД
+    position: int = 0
+    completed: bool = False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from sqlalchemy import Index, text
 from sqlalchemy.orm import relationship
 from sqlmodel import Field, Relationship
 
@@ -8,13 +9,33 @@ from src.infrastructure.db.models import BaseORM
 
 
 class RatingORM(BaseORM, table=True):
+    """Оценка фильма пользователем.
+
+    Повторная оценка не меняет строку, а добавляет новую: прежняя остаётся
+    в таблице с superseded, поэтому строки с id не больше max_id снимка
+    рекомендателя не меняются, а новая оценка приходит в хвосте после него.
+    Действующая оценка у пары (user_id, movie_id) одна.
+    """
+
     __tablename__ = "rating"
+    __table_args__ = (
+        Index(
+            "ix_rating_user_movie_live",
+            "user_id",
+            "movie_id",
+            unique=True,
+            sqlite_where=text("superseded = 0"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     movie_id: int = Field(foreign_key="movie.id")
     rating: int
     timestamp: int
+    superseded: bool = Field(
+        default=False, sa_column_kwargs={"server_default": text("0")}
+    )
 
     user: "UserORM" = Relationship(
         sa_relationship=relationship(
@@ -0,0 +1,6 @@
+class ScoringTimeoutError(Exception):
+    """
+    Расчёт рекомендаций не уложился в отведённое время
+    """
+
+    pass
@@ -1,3 +1,6 @@
+import functools
+import time
+from collections.abc import Callable
 from typing import Type, TypeVar, Generic
 
 from sqlalchemy.exc import SQLAlchemyError
@@ -7,10 +10,33 @@ from src.domain.repositories.base import RepositoryInterface
 from src.infrastructure.db.models import BaseORM
 from src.infrastructure.db.uow import UnitOfWork
 from src.infrastructure.exceptions.repository import RepositoryError
+from src.infrastructure.services.metrics import Histogram, registry
 
 ModelType = TypeVar("ModelType", bound=BaseORM)
 EntityType = TypeVar("EntityType")
 
+repository_query_seconds: Histogram = registry.histogram(
+    "repository_query_seconds",
+    "Длительность запросов репозиториев к БД",
+    ("repository", "method"),
+)
+
+
+def timed_query(function: Callable) -> Callable:
+    """Замеряет длительность асинхронного метода репозитория."""
+
+    @functools.wraps(function)
+    async def wrapper(self, *args, **kwargs):
+        started: float = time.perf_counter()
+        try:
+            return await function(self, *args, **kwargs)
+        finally:
+            repository_query_seconds.labels(
+                type(self).__name__, function.__name__
+            ).observe(time.perf_counter() - started)
+
+    return wrapper
+
 
 class BaseRepository(Generic[ModelType, EntityType], RepositoryInterface[EntityType]):
     """Базовый универсальный репозиторий для работы с моделями SQLModel.
@@ -29,6 +55,7 @@ class BaseRepository(Generic[ModelType, EntityType], RepositoryInterface[EntityT
     def __init__(self, uow: UnitOfWork):
         self.uow = uow
 
+    @timed_query
     async def add(
         self, entity: EntityType, commit: bool = True, **kwargs
     ) -> EntityType:
@@ -42,6 +69,7 @@ class BaseRepository(Generic[ModelType, EntityType], RepositoryInterface[EntityT
         except SQLAlchemyError as e:
             raise RepositoryError(e)
 
+    @timed_query
     async def get(self, reference: int | str, field_search: str) -> EntityType | None:
         if not hasattr(self.model, field_search):
             raise RepositoryError(
@@ -73,12 +101,19 @@ class BaseRepository(Generic[ModelType, EntityType], RepositoryInterface[EntityT
         )
         return result.first()
 
+    @timed_query
     async def get_all(self, **kwargs) -> list[EntityType]:
         result = await self.uow.session.exec(select(self.model))
         models: list[ModelType] = result.all()
 
         return [model.to_entity() for model in models]
 
+    @timed_query
+    async def exists(self) -> bool:
+        result = await self.uow.session.exec(select(self.model.id).limit(1))
+        return result.first() is not None
+
+    @timed_query
     async def get_all_by_ids(self, ids: list[int] | list[str]) -> list[EntityType]:
         if not ids:
             return []
@@ -89,6 +124,7 @@ class BaseRepository(Generic[ModelType, EntityType], RepositoryInterface[EntityT
         models: list[ModelType] = result.all()
         return [model.to_entity() for model in models]
 
+    @timed_query
     async def delete(self, reference: int | str) -> bool:
         model: ModelType | None = await self._get_model(reference)
         if model is None:
@@ -97,6 +133,7 @@ class BaseRepository(Generic[ModelType, EntityType], RepositoryInterface[EntityT
         await self.uow.session.delete(model)
         return await self.uow.commit()
 
+    @timed_query
     async def update(self, entity: EntityType) -> EntityType:
         if not entity:
             raise RepositoryError("Cannot update non-existent entity")
@@ -1,12 +1,117 @@
+from collections.abc import Collection
+from datetime import date
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only, noload, selectinload
+from sqlmodel import select
+
 from src.domain.entities.movie_lens.movie import Movie
-from src.infrastructure.db.models import MovieORM
+from src.domain.repositories.movie import MovieRepositoryInterface
+from src.infrastructure.db.models import GenreORM, MovieORM
+from src.infrastructure.db.models.movie_lens.links import MovieGenreLink
 from src.infrastructure.db.uow import UnitOfWork
-from src.infrastructure.repositories.base import BaseRepository
+from src.infrastructure.exceptions.repository import RepositoryError
+from src.infrastructure.repositories.base import BaseRepository, timed_query
+
+# Колонки фильма, которые можно запросить через fields (id загружается всегда)
+MOVIE_COLUMNS: dict[str, object] = {
+    "title": MovieORM.title,
+    "release_date": MovieORM.release_date,
+    "video_release_date": MovieORM.video_release_date,
+    "imdb_url": MovieORM.imdb_url,
+}
 
 
-class MovieRepository(BaseRepository[MovieORM, Movie]):
+class MovieRepository(BaseRepository[MovieORM, Movie], MovieRepositoryInterface):
     model = MovieORM
     entity = Movie
 
     def __init__(self, uow: UnitOfWork):
         super().__init__(uow=uow)
+
+    @timed_query
+    async def get_all(self, **kwargs) -> list[Movie]:
+        # Жанры подгружаются без обратной связи GenreORM.movies,
+        # иначе вместе с каждым жанром загружаются все его фильмы
+        result = await self.uow.session.exec(
+            select(MovieORM).options(
+                selectinload(MovieORM.genres).noload(GenreORM.movies)
+            )
+        )
+        return [model.to_entity() for model in result.all()]
+
+    @timed_query
+    async def get_page(
+        self,
+        after_id: int | None = None,
+        limit: int = 100,
+        genre_ids: Collection[int] = (),
+        year_from: int | None = None,
+        year_to: int | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[Movie]:
+        statement = select(MovieORM).order_by(MovieORM.id).limit(limit)
+
+        if after_id is not None:
+            statement = statement.where(MovieORM.id > after_id)
+        if genre_ids:
+            statement = statement.where(
+                MovieORM.id.in_(
+                    select(MovieGenreLink.movie_id).where(
+                        MovieGenreLink.genre_id.in_(genre_ids)
+                    )
+                )
+            )
+        if year_from is not None:
+            statement = statement.where(MovieORM.release_date >= date(year_from, 1, 1))
+        if year_to is not None:
+            statement = statement.where(MovieORM.release_date <= date(year_to, 12, 31))
+
+        if fields is None or "genres" in fields:
+            statement = statement.options(
+                selectinload(MovieORM.genres).noload(GenreORM.movies)
+            )
+        else:
+            statement = statement.options(noload(MovieORM.genres))
+
+        if fields is not None:
+            statement = statement.options(
+                load_only(
+                    MovieORM.id,
+                    *(
+                        column
+                        for name, column in MOVIE_COLUMNS.items()
+                        if name in fields
+                    ),
+                    raiseload=True,
+                )
+            )
+
+        try:
+            result = await self.uow.session.exec(statement)
+            models: list[MovieORM] = result.all()
+        except SQLAlchemyError as e:
+            raise RepositoryError(e)
+
+        if fields is None:
+            return [model.to_entity() for model in models]
+
+        return [self._to_partial_entity(model, fields) for model in models]
+
+    @staticmethod
+    def _to_partial_entity(model: MovieORM, fields: Collection[str]) -> Movie:
+        """Собирает сущность только из загруженных полей."""
+        return Movie(
+            id=model.id,
+            title=model.title if "title" in fields else "",
+            release_date=model.release_date if "release_date" in fields else None,
+            video_release_date=(
+                model.video_release_date if "video_release_date" in fields else None
+            ),
+            imdb_url=model.imdb_url if "imdb_url" in fields else "",
+            genres=(
+                [genre.to_entity() for genre in model.genres]
+                if "genres" in fields
+                else []
+            ),
+        )
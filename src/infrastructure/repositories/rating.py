@@ -1,12 +1,156 @@
-from src.domain.entities.movie_lens.raitings import Rating
-from src.infrastructure.db.models import RatingORM
+from collections.abc import AsyncIterator, Iterable
+
+from sqlalchemy import bindparam, false, func, or_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+
+from src.domain.entities.dataset_fingerprint import DatasetFingerprint
+from src.domain.entities.movie_lens.raitings import Rating, RatingRecord
+from src.domain.repositories.rating import RatingRepositoryInterface
+from src.infrastructure.db.models import RatingORM, UserORM
 from src.infrastructure.db.uow import UnitOfWork
-from src.infrastructure.repositories.base import BaseRepository
+from src.infrastructure.exceptions.repository import RepositoryError
+from src.infrastructure.repositories.base import BaseRepository, timed_query
 
 
-class RatingRepository(BaseRepository[RatingORM, Rating]):
+class RatingRepository(BaseRepository[RatingORM, Rating], RatingRepositoryInterface):
     model = RatingORM
     entity = Rating
 
     def __init__(self, uow: UnitOfWork):
         super().__init__(uow=uow)
+
+    @timed_query
+    async def add_many(
+        self, records: Iterable[RatingRecord], commit: bool = True
+    ) -> int:
+        # Из повторов пары внутри пакета действует последний
+        rows: list[dict[str, int]] = list(
+            {
+                (record.user_id, record.movie_id): record._asdict()
+                for record in records
+            }.values()
+        )
+        if not rows:
+            return 0
+
+        table = RatingORM.__table__
+        live = table.c.superseded == false()
+        # Прежняя оценка остаётся в таблице: строки снимка не меняются
+        supersede = (
+            update(table)
+            .where(
+                live,
+                table.c.user_id == bindparam("b_user_id"),
+                table.c.movie_id == bindparam("b_movie_id"),
+                or_(
+                    table.c.rating != bindparam("b_rating"),
+                    table.c.timestamp != bindparam("b_timestamp"),
+                ),
+            )
+            .values(superseded=True)
+        )
+        # Совпадающая с действующей оценка не добавляется повторно
+        statement = insert(table).on_conflict_do_nothing(
+            index_elements=[table.c.user_id, table.c.movie_id], index_where=live
+        )
+
+        try:
+            await self.uow.session.execute(
+                supersede,
+                [{f"b_{key}": value for key, value in row.items()} for row in rows],
+            )
+            await self.uow.session.execute(statement, rows)
+
+            if commit:
+                await self.uow.commit()
+        except SQLAlchemyError as e:
+            raise RepositoryError(e)
+
+        return len(rows)
+
+    @timed_query
+    async def missing_user_ids(self, user_ids: Iterable[int]) -> set[int]:
+        requested: set[int] = set(user_ids)
+        if not requested:
+            return set()
+
+        try:
+            result = await self.uow.session.exec(
+                select(UserORM.id).where(UserORM.id.in_(requested))
+            )
+        except SQLAlchemyError as e:
+            raise RepositoryError(e)
+
+        return requested - set(result.all())
+
+    async def iter_records(
+        self,
+        chunk_size: int = 50_000,
+        max_id: int | None = None,
+        after_id: int | None = None,
+    ) -> AsyncIterator[list[RatingRecord]]:
+        statement = (
+            select(
+                RatingORM.user_id,
+                RatingORM.movie_id,
+                RatingORM.rating,
+                RatingORM.timestamp,
+            )
+            .order_by(RatingORM.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if max_id is not None:
+            statement = statement.where(RatingORM.id <= max_id)
+        if after_id is not None:
+            statement = statement.where(RatingORM.id > after_id)
+
+        try:
+            result = await self.uow.session.stream(statement)
+            async for partition in result.partitions():
+                yield [RatingRecord(*row) for row in partition]
+        except SQLAlchemyError as e:
+            raise RepositoryError(e)
+
+    @timed_query
+    async def get_fingerprint(self, max_id: int | None = None) -> DatasetFingerprint:
+        try:
+            if max_id is None:
+                result = await self.uow.session.exec(select(func.max(RatingORM.id)))
+                max_id = result.one() or 0
+
+            result = await self.uow.session.exec(
+                select(
+                    func.count(RatingORM.id),
+                    func.coalesce(func.sum(RatingORM.rating), 0),
+                    func.coalesce(func.sum(RatingORM.timestamp), 0),
+                ).where(RatingORM.id <= max_id)
+            )
+            count, rating_sum, timestamp_sum = result.one()
+        except SQLAlchemyError as e:
+            raise RepositoryError(e)
+
+        return DatasetFingerprint(
+            max_id=max_id,
+            count=count,
+            rating_sum=rating_sum,
+            timestamp_sum=timestamp_sum,
+        )
+
+    @timed_query
+    async def get_popular_movie_ids(self, limit: int | None = None) -> list[int]:
+        statement = (
+            select(RatingORM.movie_id)
+            .where(RatingORM.superseded == false())
+            .group_by(RatingORM.movie_id)
+            .order_by(func.count(RatingORM.id).desc(), RatingORM.movie_id)
+            .limit(limit)
+        )
+
+        try:
+            result = await self.uow.session.exec(statement)
+        except SQLAlchemyError as e:
+            raise RepositoryError(e)
+
+        return list(result.all())
@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from src.application.dto.user.user import UserDTO
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _ExpiringLRU(Generic[K, V]):
+    """LRU-словарь, в котором у каждой записи свой срок жизни."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K, now: float) -> V | None:
+        entry: tuple[V, float] | None = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AuthCache:
+    """Кеш проверенных JWT и пользователей для AuthMiddleware.
+
+    Токен хранится с payload после проверки подписи: повторный запрос
+    с тем же токеном не декодирует его заново. Запись живёт не дольше ttl
+    и не дольше срока действия токена (exp). Пользователи кешируются
+    отдельно по id, поэтому все токены одного пользователя делят одну
+    запись и одно обращение к БД.
+
+    Явной инвалидации нет: пользователи и токены меняются вне сервиса,
+    поэтому смена роли или удаление пользователя вступают в силу
+    не позже чем через ttl.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 10_000,
+        max_users: int = 10_000,
+        ttl: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            max_tokens: Максимальное количество проверенных токенов
+            max_users: Максимальное количество пользователей
+            ttl: Время жизни записи в секундах
+        """
+        self.ttl: float = ttl
+        self._tokens: _ExpiringLRU[str, dict] = _ExpiringLRU(max_tokens)
+        self._users: _ExpiringLRU[int, UserDTO] = _ExpiringLRU(max_users)
+
+    def get_payload(self, token: str) -> dict | None:
+        return self._tokens.get(token, time.monotonic())
+
+    def put_payload(self, token: str, payload: dict) -> None:
+        now: float = time.monotonic()
+        expires_at: float = now + self.ttl
+
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            # exp задан в unix time, а кеш живёт по монотонным часам
+            expires_at = min(expires_at, now + exp - time.time())
+
+        if expires_at > now:
+            self._tokens.put(token, payload, expires_at)
+
+    def get_user(self, user_id: int) -> UserDTO | None:
+        return self._users.get(user_id, time.monotonic())
+
+    def put_user(self, user: UserDTO) -> None:
+        self._users.put(user.id, user, time.monotonic() + self.ttl)
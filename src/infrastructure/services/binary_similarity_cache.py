@@ -0,0 +1,245 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import weakref
+import zlib
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.domain.interfaces.similarity_cache import ISimilarityCache, RecommenderState
+from src.infrastructure.services.recommender_module.storage.csr import CSRMapping
+
+logger = logging.getLogger(__name__)
+
+
+class BinarySimilarityCache(ISimilarityCache):
+    """Версионированный бинарный снимок состояния рекомендателя.
+
+    Матрица сходства, оценки пользователей и скалярные произведения
+    статистик косинуса хранятся в CSR-виде: ключи строк, смещения, ключи
+    столбцов и значения (сходства — float32), а нормы статистик — парой
+    массивов ключей и значений. При загрузке
+    файл отображается в память через mmap, а массивы NumPy ссылаются прямо
+    на страницы файла, поэтому время старта почти не зависит от размера
+    модели: строки декодируются лениво через CSRMapping.
+
+    Формат файла (little-endian):
+        header:  magic (8s) | version (I) | sections (I) | crc32 (I) | reserved (I)
+        table:   name (32s) | dtype (8s) | offset (Q) | count (Q) — на каждую секцию
+        payload: секции, выровненные по 8 байт
+
+    crc32 считается по всему файлу после заголовка и проверяется при каждой
+    загрузке: повреждённый снимок пропускается, и модель собирается по БД.
+    Остальные поля состояния (не матрицы) сохраняются JSON-ом в секции meta.
+
+    Запись идёт во временный файл в отдельном потоке и завершается атомарным
+    os.replace, так что читатели никогда не видят частично записанный снимок.
+    Перед заменой матрицы прежнего снимка копируются в память, а его mmap
+    закрывается: Windows не даёт заменить отображённый файл.
+    """
+
+    MAGIC: bytes = b"RECSNAP\x00"
+    VERSION: int = 1
+
+    _HEADER = struct.Struct("<8sIII4x")
+    _SECTION = struct.Struct("<32s8sQQ")
+    _ALIGNMENT: int = 8
+
+    # Матрицы состояния: ключ → (тип значений, тип ключей столбцов)
+    _MATRICES: dict[str, tuple[np.dtype, np.dtype]] = {
+        "similarity_matrix": (np.dtype("<f4"), np.dtype("<i4")),
+        "user_ratings": (np.dtype("<i2"), np.dtype("<i4")),
+        "movie_ratings": (np.dtype("<i2"), np.dtype("<i4")),
+        "statistics_dots": (np.dtype("<i8"), np.dtype("<i4")),
+    }
+    _PARTS: tuple[str, ...] = ("keys", "indptr", "indices", "values")
+    # Словари {key: value} состояния: ключ → тип значений
+    _VECTORS: dict[str, np.dtype] = {"statistics_norms": np.dtype("<i8")}
+    _META: str = "meta"
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Путь к файлу снимка
+        """
+        self.path = path
+
+        # Отображение загруженного снимка и матрицы поверх него
+        self._buffer: mmap.mmap | None = None
+        self._mapped: list[weakref.ref[CSRMapping]] = []
+
+    async def load(self) -> RecommenderState | None:
+        if not self.path.exists():
+            return None
+
+        return await asyncio.to_thread(self._read)
+
+    async def save(self, state: RecommenderState) -> None:
+        await asyncio.to_thread(self._write, state)
+
+    def _read(self) -> RecommenderState | None:
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self._HEADER.size:
+                logger.warning("Снимок %s повреждён: файл слишком мал", self.path)
+                return None
+
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, sections_count, checksum = self._HEADER.unpack_from(buffer)
+        if magic != self.MAGIC or version != self.VERSION:
+            logger.warning(
+                "Снимок %s пропущен: формат %r версии %s не поддерживается",
+                self.path,
+                magic,
+                version,
+            )
+            buffer.close()
+            return None
+
+        with memoryview(buffer) as view:
+            actual: int = zlib.crc32(view[self._HEADER.size :])
+        if actual != checksum:
+            logger.warning("Снимок %s повреждён: не совпал crc32", self.path)
+            buffer.close()
+            return None
+
+        arrays: dict[str, np.ndarray] = {}
+        for index in range(sections_count):
+            name, dtype, offset, count = self._SECTION.unpack_from(
+                buffer, self._HEADER.size + index * self._SECTION.size
+            )
+            arrays[name.rstrip(b"\x00").decode()] = np.frombuffer(
+                buffer,
+                dtype=np.dtype(dtype.rstrip(b"\x00").decode()),
+                count=count,
+                offset=offset,
+            )
+
+        state: dict[str, Any] = json.loads(arrays.pop(self._META).tobytes() or b"{}")
+        for key in self._MATRICES:
+            if f"{key}.keys" in arrays:
+                state[key] = CSRMapping(
+                    *(arrays[f"{key}.{part}"] for part in self._PARTS)
+                )
+        for key in self._VECTORS:
+            if f"{key}.keys" in arrays:
+                state[key] = dict(
+                    zip(
+                        arrays[f"{key}.keys"].tolist(),
+                        arrays[f"{key}.values"].tolist(),
+                    )
+                )
+
+        if "similarity_matrix" not in state or "user_ratings" not in state:
+            logger.warning("Снимок %s неполон: нет матриц модели", self.path)
+            return None
+
+        self._release()
+        self._buffer = buffer
+        self._mapped = [
+            weakref.ref(value)
+            for value in state.values()
+            if isinstance(value, CSRMapping)
+        ]
+        return state
+
+    def _write(self, state: RecommenderState) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary: Path = self.path.with_name(self.path.name + ".tmp")
+        self._dump(state, temporary)
+
+        # Массивы, записанные _dump, уже освобождены: прежний снимок
+        # держат только его матрицы
+        self._release()
+        os.replace(temporary, self.path)
+
+    def _dump(self, state: RecommenderState, path: Path) -> None:
+        sections: list[tuple[str, np.ndarray]] = []
+        meta: dict[str, Any] = {}
+
+        for key, value in state.items():
+            if key in self._VECTORS:
+                keys = np.fromiter(value, dtype=np.dtype("<i8"), count=len(value))
+                values = np.fromiter(
+                    value.values(), dtype=self._VECTORS[key], count=len(value)
+                )
+                sections.append((f"{key}.keys", keys))
+                sections.append((f"{key}.values", values))
+                continue
+
+            if key not in self._MATRICES:
+                meta[key] = value
+                continue
+
+            value_dtype, index_dtype = self._MATRICES[key]
+            matrix = CSRMapping.from_dict(value, value_dtype, index_dtype)
+            for part, array in zip(self._PARTS, matrix.arrays()):
+                dtype = {"indices": index_dtype, "values": value_dtype}.get(
+                    part, np.dtype("<i8")
+                )
+                sections.append((f"{key}.{part}", np.ascontiguousarray(array, dtype)))
+
+        sections.append(
+            (self._META, np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8))
+        )
+
+        table_size: int = self._SECTION.size * len(sections)
+        offset: int = self._align(self._HEADER.size + table_size)
+
+        table = bytearray()
+        for name, array in sections:
+            table += self._SECTION.pack(
+                name.encode(), array.dtype.str.encode(), offset, len(array)
+            )
+            offset = self._align(offset + array.nbytes)
+
+        checksum: int = zlib.crc32(table)
+        with open(path, "wb") as f:
+            f.write(b"\x00" * self._HEADER.size)
+            f.write(table)
+
+            for _, array in sections:
+                padding: bytes = b"\x00" * (self._align(f.tell()) - f.tell())
+                f.write(padding)
+                checksum = zlib.crc32(padding, checksum)
+
+                data = memoryview(array).cast("B")
+                f.write(data)
+                checksum = zlib.crc32(data, checksum)
+
+            f.seek(0)
+            f.write(
+                self._HEADER.pack(self.MAGIC, self.VERSION, len(sections), checksum)
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _release(self) -> None:
+        """Отвязывает матрицы прежнего снимка от файла и закрывает его mmap."""
+        if self._buffer is None:
+            return
+
+        for reference in self._mapped:
+            matrix: CSRMapping | None = reference()
+            if matrix is not None:
+                matrix.detach()
+
+        try:
+            self._buffer.close()
+        except BufferError:
+            # Массивы снимка ещё используются в обход CSRMapping: отображение
+            # закроется вместе с ними, а замена файла сработает везде,
+            # кроме Windows
+            logger.warning("Снимок %s ещё отображён в память", self.path)
+
+        self._buffer = None
+        self._mapped = []
+
+    @classmethod
+    def _align(cls, offset: int) -> int:
+        return (offset + cls._ALIGNMENT - 1) // cls._ALIGNMENT * cls._ALIGNMENT
@@ -0,0 +1,316 @@
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+# Границы корзин по умолчанию для длительностей в секундах
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Метрика с необязательными метками.
+
+    Значения для каждого набора меток хранятся в отдельном дочернем объекте.
+    Дочерний объект стоит получить через labels один раз и сохранить:
+    на горячем пути тогда остаётся только его inc/observe.
+    """
+
+    type_name: str = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+
+    def labels(self, *values: object) -> Any:
+        key: tuple[str, ...] = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"Метрика {self.name} ожидает метки {self.labelnames}, "
+                    f"получено {key}"
+                )
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[tuple[str, Sequence[str], Sequence[str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines: list[str] = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, names, values, value in self._samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} "
+                f"{_format_value(value)}"
+            )
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик.
+
+    Имя задаётся без суффикса: при выгрузке добавляется ``_total``.
+    """
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def _samples(self) -> Iterator[tuple[str, Sequence[str], Sequence[str], float]]:
+        for values, child in list(self._children.items()):
+            yield "_total", self.labelnames, values, child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """Текущее значение величины.
+
+    Значение задаётся через set/inc/dec либо считается функцией function
+    в момент выгрузки. Функция возвращает число для метрики без меток или
+    словарь {значения меток: число}; None означает, что значения нет.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: (
+            Callable[[], float | dict[tuple[str, ...], float] | None] | None
+        ) = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def _samples(self) -> Iterator[tuple[str, Sequence[str], Sequence[str], float]]:
+        if self.function is None:
+            for values, child in list(self._children.items()):
+                yield "", self.labelnames, values, child.value
+            return
+
+        value = self.function()
+        if value is None:
+            return
+        if isinstance(value, dict):
+            for values, sample in value.items():
+                yield "", self.labelnames, tuple(map(str, values)), sample
+        else:
+            yield "", (), (), value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds: tuple[float, ...] = bounds
+        # Последняя корзина — +Inf
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def timer(self) -> Iterator[None]:
+        """Наблюдает длительность блока with в секундах."""
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Распределение значений по корзинам с накопительными границами le.
+
+    Наблюдение — один бинарный поиск по границам и два сложения без
+    блокировки. Наблюдения из разных потоков в редких случаях могут
+    потеряться, что для статистики задержек допустимо.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def timer(self):
+        return self.labels().timer()
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _samples(self) -> Iterator[tuple[str, Sequence[str], Sequence[str], float]]:
+        bucket_names: tuple[str, ...] = (*self.labelnames, "le")
+        for values, child in list(self._children.items()):
+            counts: list[int] = list(child.counts)
+            cumulative: int = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels: tuple[str, ...] = (*values, _format_value(bound))
+                yield "_bucket", bucket_names, labels, cumulative
+            yield "_sum", self.labelnames, values, child.sum
+            yield "_count", self.labelnames, values, cumulative
+
+
+class MetricsRegistry:
+    """Набор метрик процесса с выгрузкой в текстовом формате Prometheus.
+
+    Метрика регистрируется по имени; повторная регистрация с тем же
+    именем возвращает уже существующую метрику того же типа, поэтому
+    модули могут объявлять свои метрики при импорте.
+    """
+
+    CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: (
+            Callable[[], float | dict[tuple[str, ...], float] | None] | None
+        ) = None,
+    ) -> Gauge:
+        gauge: Gauge = self._register(Gauge(name, documentation, labelnames, function))
+        # Функция привязана к текущему состоянию приложения и заменяется
+        # при повторной регистрации (например, при новом запуске lifespan)
+        gauge.function = function
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Выгружает все метрики в текстовом формате Prometheus."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def _register(self, metric: _Metric) -> Any:
+        existing: _Metric | None = self._metrics.get(metric.name)
+        if existing is None:
+            self._metrics[metric.name] = metric
+            return metric
+
+        if type(existing) is not type(metric) or (
+            existing.labelnames != metric.labelnames
+        ):
+            raise ValueError(f"Метрика {metric.name} уже объявлена иначе")
+        return existing
+
+
+registry = MetricsRegistry()
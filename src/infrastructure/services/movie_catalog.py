@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Collection, Hashable
+from dataclasses import dataclass
+from datetime import date
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.interfaces.movie_catalog import IMovieCatalog
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedResponse:
+    """Заранее закодированный ответ вместе с его ETag."""
+
+    body: bytes
+    gzip_body: bytes | None
+    etag: str
+
+
+class InMemoryMovieCatalog(IMovieCatalog):
+    """Каталог фильмов в памяти процесса.
+
+    Фильмы хранятся по возрастанию id, поэтому страница после after_id
+    находится бинарным поиском, а фильтры применяются при проходе от неё.
+    Кроме самих фильмов кешируются готовые ответы: тело JSON, его gzip-версия
+    и строгий ETag — хеш тела. Каталог и ответы сбрасываются вместе
+    при invalidate.
+    """
+
+    def __init__(
+        self,
+        max_responses: int = 1024,
+        gzip_min_size: int | None = 1024,
+    ) -> None:
+        """
+        Args:
+            max_responses: Сколько закодированных ответов держать в LRU-кеше
+            gzip_min_size: Минимальный размер тела, начиная с которого
+                хранится gzip-версия (None — не сжимать)
+        """
+        self.max_responses: int = max_responses
+        self.gzip_min_size: int | None = gzip_min_size
+
+        self._movies: list[Movie] = []
+        self._ids: list[int] = []
+        self._genres: list[frozenset[int]] = []
+        self._loaded: bool = False
+        self._responses: OrderedDict[Hashable, EncodedResponse] = OrderedDict()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, movies: list[Movie]) -> None:
+        self._movies = sorted(movies, key=lambda movie: movie.id)
+        self._ids = [movie.id for movie in self._movies]
+        self._genres = [
+            frozenset(genre.id for genre in movie.genres) for movie in self._movies
+        ]
+        self._responses.clear()
+        self._loaded = True
+
+    def has_movie(self, movie_id: int) -> bool:
+        position: int = bisect_right(self._ids, movie_id)
+        return position > 0 and self._ids[position - 1] == movie_id
+
+    def invalidate(self) -> None:
+        self._movies, self._ids, self._genres = [], [], []
+        self._responses.clear()
+        self._loaded = False
+
+    async def get_page(
+        self,
+        after_id: int | None = None,
+        limit: int = 100,
+        genre_ids: Collection[int] = (),
+        year_from: int | None = None,
+        year_to: int | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[Movie]:
+        start: int = 0 if after_id is None else bisect_right(self._ids, after_id)
+        wanted: frozenset[int] = frozenset(genre_ids)
+        date_from: date | None = (
+            date(year_from, 1, 1) if year_from is not None else None
+        )
+        date_to: date | None = date(year_to, 12, 31) if year_to is not None else None
+
+        page: list[Movie] = []
+        for position in range(start, len(self._movies)):
+            if len(page) == limit:
+                break
+
+            movie: Movie = self._movies[position]
+            if wanted and wanted.isdisjoint(self._genres[position]):
+                continue
+            if date_from is not None and (
+                movie.release_date is None or movie.release_date < date_from
+            ):
+                continue
+            if date_to is not None and (
+                movie.release_date is None or movie.release_date > date_to
+            ):
+                continue
+
+            page.append(movie if fields is None else self._select(movie, fields))
+
+        return page
+
+    def get_response(self, key: Hashable) -> EncodedResponse | None:
+        """
+        Возвращает ранее закодированный ответ
+
+        Args:
+            key: Нормализованные параметры запроса
+
+        Returns:
+            Тело, его gzip-версия и ETag или None, если ответа нет в кеше
+        """
+        response: EncodedResponse | None = self._responses.get(key)
+        if response is not None:
+            self._responses.move_to_end(key)
+
+        return response
+
+    def put_response(self, key: Hashable, body: bytes) -> EncodedResponse:
+        """
+        Сохраняет тело ответа вместе с gzip-версией и ETag
+
+        Args:
+            key: Нормализованные параметры запроса
+            body: Тело ответа
+
+        Returns:
+            Закодированный ответ
+        """
+        response: EncodedResponse = self.encode(body)
+
+        self._responses[key] = response
+        while len(self._responses) > self.max_responses:
+            self._responses.popitem(last=False)
+
+        return response
+
+    def encode(self, body: bytes) -> EncodedResponse:
+        """Считает gzip-версию и ETag тела, не сохраняя ответ."""
+        return EncodedResponse(
+            body=body,
+            gzip_body=(
+                gzip.compress(body, mtime=0)
+                if self.gzip_min_size is not None and len(body) >= self.gzip_min_size
+                else None
+            ),
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+
+    @staticmethod
+    def _select(movie: Movie, fields: Collection[str]) -> Movie:
+        """Оставляет в сущности только запрошенные поля, как и MovieRepository."""
+        return Movie(
+            id=movie.id,
+            title=movie.title if "title" in fields else "",
+            release_date=movie.release_date if "release_date" in fields else None,
+            video_release_date=(
+                movie.video_release_date if "video_release_date" in fields else None
+            ),
+            imdb_url=movie.imdb_url if "imdb_url" in fields else "",
+            genres=movie.genres if "genres" in fields else [],
+        )
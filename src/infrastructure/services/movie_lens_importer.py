@@ -1,16 +1,18 @@
 import csv
+import logging
 import re
+import time
+from collections.abc import Iterator
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
-import pandas as pd
-
 from src.domain.entities.movie_lens.genre import Genre
 from src.domain.entities.movie_lens.movie import Movie
 from src.domain.entities.movie_lens.occupation import Occupation
-from src.domain.entities.movie_lens.raitings import Rating
+from src.domain.entities.movie_lens.raitings import RatingRecord
 from src.domain.entities.movie_lens.user import User, UserGender
-from src.infrastructure.db.models import OccupationORM
+from src.infrastructure.db.models import ImportProgressORM, OccupationORM
 from src.infrastructure.db.models.movie_lens.links import MovieGenreLink
 from src.infrastructure.db.uow import UnitOfWork
 from src.infrastructure.repositories.genre import GenreRepository
@@ -19,9 +21,17 @@ from src.infrastructure.repositories.occupation import OccupationRepository
 from src.infrastructure.repositories.rating import RatingRepository
 from src.infrastructure.repositories.user import UserRepository
 
+logger = logging.getLogger(__name__)
+
 
 class MovieLensImporter:
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, chunk_size: int = 10_000):
+        """
+        Args:
+            base_path: Каталог с файлами датасета MovieLens
+            chunk_size: Количество рейтингов в одном пакете вставки
+        """
+        self.chunk_size = chunk_size
         self.genre_file = base_path / "u.genre"
         self.occupation_file = base_path / "u.occupation"
         self.user_file = base_path / "u.user"
@@ -39,7 +49,7 @@ class MovieLensImporter:
 
     async def _import_genres(self, uow: UnitOfWork):
         repo = GenreRepository(uow)
-        if await repo.get_all():
+        if await repo.exists():
             return
 
         with open(self.genre_file, "r", encoding="utf-8") as f:
@@ -56,7 +66,7 @@ class MovieLensImporter:
 
     async def _import_occupations(self, uow: UnitOfWork):
         repo = OccupationRepository(uow)
-        if await repo.get_all():
+        if await repo.exists():
             return
 
         with open(self.occupation_file, "r", encoding="utf-8") as f:
@@ -70,7 +80,7 @@ class MovieLensImporter:
     async def _import_users(self, uow: UnitOfWork):
         user_repo = UserRepository(uow)
         occ_repo = OccupationRepository(uow)
-        if await user_repo.get_all():
+        if await user_repo.exists():
             return
 
         with open(self.user_file, "r", encoding="utf-8") as f:
@@ -97,7 +107,7 @@ class MovieLensImporter:
 
     async def _import_movies(self, uow: UnitOfWork):
         movie_repo = MovieRepository(uow)
-        if await movie_repo.get_all():
+        if await movie_repo.exists():
             return
 
         genres = await GenreRepository(uow).get_all()
@@ -149,30 +159,64 @@ class MovieLensImporter:
         await uow.commit()
 
     async def _import_ratings(self, uow: UnitOfWork):
+        """
+        Импортирует рейтинги потоково, пакетами по chunk_size строк
+
+        Строки файла сразу превращаются в плоские записи и вставляются
+        пакетным INSERT без построения сущностей и ORM-объектов. Каждый пакет
+        фиксируется отдельной транзакцией вместе с номером следующей строки
+        файла, поэтому потребление памяти не зависит от размера файла,
+        а прерванный импорт при следующем запуске продолжается с места
+        остановки.
+        """
         rating_repo = RatingRepository(uow)
-        if await rating_repo.get_all():
-            return
 
-        user_repo = UserRepository(uow)
-        movie_repo = MovieRepository(uow)
+        progress: ImportProgressORM | None = await uow.session.get(
+            ImportProgressORM, "ratings"
+        )
+        if progress is None:
+            # Рейтинги импортированы до появления записи о прогрессе
+            if await rating_repo.exists():
+                return
+
+            progress = ImportProgressORM(name="ratings")
+            uow.session.add(progress)
+        elif progress.completed:
+            return
 
-        users = await user_repo.get_all()
-        users_map = {u.id: u for u in users}
+        position: int = progress.position
+        if position:
+            logger.info("Импорт рейтингов продолжается со строки %s", position)
 
-        movies = await movie_repo.get_all()
-        movies_map = {m.id: m for m in movies}
+        imported: int = 0
+        started: float = time.perf_counter()
 
         with open(self.rating_file, "r", encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter="\t")
-
-            for user_id, movie_id, rating, timestamp in reader:
-                rating_obj = Rating(
-                    user=users_map[int(user_id)],
-                    movie=movies_map[int(movie_id)],
-                    rating=int(rating),
-                    timestamp=int(timestamp),
+            records: Iterator[RatingRecord] = islice(
+                self._read_ratings(f), position, None
+            )
+
+            while chunk := list(islice(records, self.chunk_size)):
+                imported += await rating_repo.add_many(chunk, commit=False)
+                position += len(chunk)
+                progress.position = position
+                await uow.commit()
+
+                logger.info(
+                    "Импортировано рейтингов: %s (%.0f строк/с)",
+                    imported,
+                    imported / (time.perf_counter() - started),
                 )
 
-                await rating_repo.add(rating_obj, commit=False)
-
+        progress.completed = True
         await uow.commit()
+
+    @staticmethod
+    def _read_ratings(lines: Iterator[str]) -> Iterator[RatingRecord]:
+        for user_id, movie_id, rating, timestamp in csv.reader(lines, delimiter="\t"):
+            yield RatingRecord(
+                user_id=int(user_id),
+                movie_id=int(movie_id),
+                rating=int(rating),
+                timestamp=int(timestamp),
+            )
@@ -0,0 +1,50 @@
+import json
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+
+
+class RatingDeadLetterFile:
+    """Файл рейтингов, которые не удалось сохранить (JSON Lines).
+
+    Каждая строка — рейтинг, причина отказа и время записи. Файл только
+    дописывается: разбирать и повторно отправлять рейтинги предполагается
+    вручную или отдельным скриптом.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Путь к файлу
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, records: Sequence[RatingRecord], reason: str) -> None:
+        """
+        Дописывает рейтинги в файл
+
+        Args:
+            records: Рейтинги, которые не удалось сохранить
+            reason: Причина отказа
+        """
+        if not records:
+            return
+
+        failed_at: int = int(time.time())
+        lines: str = "".join(
+            json.dumps(
+                record._asdict() | {"reason": reason, "failed_at": failed_at},
+                ensure_ascii=False,
+            )
+            + "\n"
+            for record in records
+        )
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
@@ -0,0 +1,121 @@
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.domain.interfaces.rating_event_log import IRatingEventLog
+
+
+class FileRatingEventLog(IRatingEventLog):
+    """Журнал рейтингов в файле, открытом только на дозапись.
+
+    Каждое событие — запись фиксированного размера
+    (sequence, user_id, movie_id, rating, timestamp), а номера событий идут
+    подряд, поэтому события после нужного номера читаются одним np.fromfile
+    со смещения, вычисленного по номеру первой записи файла. Недописанная
+    при аварии последняя запись отбрасывается при открытии журнала.
+
+    После сохранения снимка учтённые в нём события удаляются compact,
+    но последняя запись остаётся, чтобы нумерация продолжалась.
+    """
+
+    _RECORD = struct.Struct("<QqqhQ")
+    _DTYPE = np.dtype(
+        [
+            ("sequence", "<u8"),
+            ("user_id", "<i8"),
+            ("movie_id", "<i8"),
+            ("rating", "<i2"),
+            ("timestamp", "<u8"),
+        ]
+    )
+
+    def __init__(self, path: Path, fsync: bool = False):
+        """
+        Args:
+            path: Путь к файлу журнала
+            fsync: Сбрасывать каждую запись на диск через os.fsync
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+
+        size: int = os.fstat(self._file.fileno()).st_size
+        torn: int = size % self._RECORD.size
+        if torn:
+            self._file.truncate(size - torn)
+            size -= torn
+
+        # Номера первого и последнего событий в файле (0, если файл пуст)
+        self._first: int = 0
+        self._sequence: int = 0
+        if size:
+            with open(self.path, "rb") as f:
+                self._first = self._RECORD.unpack(f.read(self._RECORD.size))[0]
+                f.seek(size - self._RECORD.size)
+                self._sequence = self._RECORD.unpack(f.read(self._RECORD.size))[0]
+
+    @property
+    def last_sequence(self) -> int:
+        return self._sequence
+
+    def append(self, record: RatingRecord) -> int:
+        with self._lock:
+            sequence: int = self._sequence + 1
+            self._file.write(self._RECORD.pack(sequence, *record))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+            self._sequence = sequence
+            if not self._first:
+                self._first = sequence
+            return sequence
+
+    def read_since(self, sequence: int) -> Iterator[tuple[int, RatingRecord]]:
+        with self._lock:
+            if not self._first or sequence >= self._sequence:
+                return
+
+            self._file.flush()
+            events = np.fromfile(
+                self.path, dtype=self._DTYPE, offset=self._offset(sequence)
+            )
+
+        for number, user_id, movie_id, rating, timestamp in events.tolist():
+            yield number, RatingRecord(user_id, movie_id, rating, timestamp)
+
+    def compact(self, sequence: int) -> None:
+        with self._lock:
+            keep: int = min(sequence, self._sequence)
+            if keep <= self._first:
+                return
+
+            # Последнее учтённое событие остаётся: по нему продолжается нумерация
+            self._file.flush()
+            events = np.fromfile(
+                self.path, dtype=self._DTYPE, offset=self._offset(keep - 1)
+            )
+
+            self._file.close()
+            temporary: Path = self.path.with_name(self.path.name + ".tmp")
+            events.tofile(temporary)
+            os.replace(temporary, self.path)
+
+            self._file = open(self.path, "ab")
+            self._first = keep
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _offset(self, sequence: int) -> int:
+        """Смещение в файле первой записи после события sequence."""
+        return max(0, sequence - self._first + 1) * self._RECORD.size
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.rating_dead_letter import RatingDeadLetterFile
+
+logger = logging.getLogger(__name__)
+
+
+class RatingWriteBehindQueue:
+    """Очередь рейтингов с отложенной пакетной записью.
+
+    Рейтинги принимаются в asyncio.Queue без ожидания записи. Фоновая задача
+    забирает их пачками: первая запись ждётся без ограничения, а следующие
+    добираются, пока пачка не заполнится или не выйдет flush_interval
+    с момента первой. Пачка целиком передаётся в flush, например одной
+    транзакцией в БД и затем в рекомендатель.
+
+    Пачка, которую не удалось записать, повторяется max_retries раз
+    с удваивающейся задержкой. Если все попытки неудачны, рейтинги пачки
+    записываются по одному, чтобы одна ошибочная строка не потянула за собой
+    остальные, а те, что не записались и по одному, уходят в dead_letter.
+    Туда же попадают рейтинги, которые flush отклонил как невалидные.
+    При остановке очередь перестаёт принимать рейтинги и дописывает
+    всё, что в ней осталось.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[RatingRecord]], Awaitable[list[RatingRecord]]],
+        max_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        dead_letter: RatingDeadLetterFile | None = None,
+    ) -> None:
+        """
+        Args:
+            flush: Асинхронная функция, сохраняющая пачку рейтингов.
+                Возвращает рейтинги, которые отклонены и не должны повторяться
+            max_size: Максимальное количество рейтингов, ожидающих записи
+            batch_size: Максимальный размер пачки
+            flush_interval: Сколько секунд пачка добирается после первого рейтинга
+            max_retries: Сколько раз повторить запись пачки после ошибки
+            retry_delay: Задержка перед первым повтором в секундах,
+                каждый следующий повтор ждёт вдвое дольше
+            dead_letter: Файл для рейтингов, которые не удалось сохранить.
+                Если не задан, такие рейтинги только логируются
+        """
+        self.flush = flush
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.max_retries: int = max_retries
+        self.retry_delay: float = retry_delay
+        self.dead_letter: RatingDeadLetterFile | None = dead_letter
+
+        self._queue: asyncio.Queue[RatingRecord] = asyncio.Queue(maxsize=max_size)
+        self._worker: asyncio.Task | None = None
+        self._closed: bool = False
+
+    @property
+    def depth(self) -> int:
+        """Количество рейтингов, ожидающих записи."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._closed = False
+            self._worker = asyncio.create_task(self._run())
+
+    def submit(self, records: Sequence[RatingRecord]) -> bool:
+        """
+        Ставит рейтинги в очередь, не дожидаясь записи
+
+        Рейтинги принимаются только все вместе: если свободного места
+        меньше, чем их количество, не принимается ни один.
+
+        Returns:
+            True, если рейтинги приняты
+        """
+        if self._closed or self._worker is None:
+            return False
+
+        queue: asyncio.Queue[RatingRecord] = self._queue
+        if queue.maxsize and queue.maxsize - queue.qsize() < len(records):
+            return False
+
+        for record in records:
+            queue.put_nowait(record)
+
+        return True
+
+    async def stop(self) -> None:
+        """Перестаёт принимать рейтинги и дожидается записи оставшихся."""
+        self._closed = True
+        if self._worker is None:
+            return
+
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: list[RatingRecord] = [await self._queue.get()]
+            deadline: float = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout: float = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: list[RatingRecord]) -> None:
+        """Записывает пачку с повторами, а при неудаче — по одному рейтингу."""
+        try:
+            rejected: list[RatingRecord] = await self._flush_with_retry(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self._reject(batch, repr(e))
+                return
+
+            logger.exception(
+                "Не удалось записать пачку из %s рейтингов, записываем по одному",
+                len(batch),
+            )
+            rejected = []
+            for record in batch:
+                try:
+                    rejected.extend(await self.flush([record]))
+                except Exception as e:
+                    self._reject([record], repr(e))
+
+        self._reject(rejected, "rejected")
+
+    async def _flush_with_retry(self, batch: list[RatingRecord]) -> list[RatingRecord]:
+        """Вызывает flush, повторяя его с экспоненциальной задержкой."""
+        delay: float = self.retry_delay
+        for attempt in range(self.max_retries):
+            try:
+                return await self.flush(batch)
+            except Exception:
+                logger.warning(
+                    "Не удалось записать пачку из %s рейтингов (попытка %s из %s), "
+                    "повтор через %.1f с",
+                    len(batch),
+                    attempt + 1,
+                    self.max_retries + 1,
+                    delay,
+                    exc_info=True,
+                )
+            await asyncio.sleep(delay)
+            delay *= 2
+
+        return await self.flush(batch)
+
+    def _reject(self, records: list[RatingRecord], reason: str) -> None:
+        if not records:
+            return
+
+        logger.error(
+            "%s рейтингов не сохранены (%s)%s",
+            len(records),
+            reason,
+            "" if self.dead_letter is None else f", записаны в {self.dead_letter.path}",
+        )
+        if self.dead_letter is not None:
+            try:
+                self.dead_letter.append(records, reason)
+            except OSError:
+                logger.exception("Не удалось записать рейтинги в dead letter")
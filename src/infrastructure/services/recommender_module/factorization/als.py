@@ -0,0 +1,310 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+
+@dataclass(frozen=True, slots=True)
+class ALSParams:
+    """Параметры матричной факторизации методом ALS.
+
+    Оценки трактуются как неявный отклик (Hu, Koren, Volinsky, 2008):
+    оценённый фильм считается интересным пользователю с уверенностью
+    1 + alpha · rating, неоценённый — неинтересным с уверенностью 1.
+
+    Attributes:
+        factors: Размерность скрытых векторов пользователей и фильмов
+        iterations: Количество чередований шагов по пользователям и фильмам
+        regularization: Коэффициент L2-регуляризации векторов
+        alpha: Вес оценки в уверенности
+        cg_steps: Шагов метода сопряжённых градиентов на каждую половину
+            итерации. 0 — решать системы точно
+        seed: Зерно генератора начальных векторов
+    """
+
+    factors: int = 32
+    iterations: int = 15
+    regularization: float = 10.0
+    alpha: float = 1.0
+    cg_steps: int = 3
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class LatentFactors:
+    """Скрытые векторы пользователей и фильмов.
+
+    Attributes:
+        user_ids: Пользователи по порядку строк user_factors
+        movie_ids: Фильмы по возрастанию id, по порядку строк movie_factors
+        user_factors: Матрица user × factors
+        movie_factors: Матрица movie × factors
+        movie_gram: movie_factorsᵀ · movie_factors + regularization · I,
+            общая часть системы для всех пользователей
+    """
+
+    user_ids: np.ndarray
+    movie_ids: np.ndarray
+    user_factors: np.ndarray
+    movie_factors: np.ndarray
+    movie_gram: np.ndarray
+
+
+class ALSTrainer:
+    """Обучает скрытые векторы чередующимися наименьшими квадратами.
+
+    На каждом шаге векторы одной стороны фиксированы, и вектор каждого
+    пользователя (фильма) — решение своей системы k × k:
+        (YᵀY + λI + Yᵤᵀ(Cᵤ − I)Yᵤ) · xᵤ = YᵤᵀCᵤ·1,
+    где Yᵤ — векторы фильмов пользователя, Cᵤ — уверенности его оценок.
+    YᵀY считается один раз на шаг, а системы собираются и решаются
+    пакетами: строки близкой длины дополняются до общей длины блока,
+    и все системы блока решаются одним вызовом np.linalg.solve.
+    """
+
+    # Сколько чисел float64 занимают векторы фильмов одного блока систем
+    _BLOCK_BUDGET: int = 1 << 22
+    # Заполненность матрицы оценок, с которой скалярные произведения на месте
+    # оценок берутся из плотного произведения блоков
+    _DENSE_DENSITY: float = 0.01
+
+    def __init__(self, params: ALSParams = ALSParams()) -> None:
+        """
+        Args:
+            params: Параметры факторизации
+        """
+        self.params = params
+
+    def train(self, user_ratings: Mapping[int, dict[int, int]]) -> LatentFactors:
+        """
+        Обучает векторы по оценкам пользователей
+
+        Args:
+            user_ratings: Оценки вида user_id → {movie_id → rating}
+
+        Returns:
+            Векторы всех пользователей и фильмов, у которых есть оценки
+        """
+        user_ids, movie_ids, ratings = self._ratings_matrix(user_ratings)
+        confidence: sparse.csr_matrix = ratings * self.params.alpha
+        transposed: sparse.csr_matrix = confidence.T.tocsr()
+
+        rng = np.random.default_rng(self.params.seed)
+        scale: float = 0.01
+        users = rng.normal(0.0, scale, (len(user_ids), self.params.factors))
+        movies = rng.normal(0.0, scale, (len(movie_ids), self.params.factors))
+
+        for _ in range(self.params.iterations):
+            if self.params.cg_steps > 0:
+                users = self._conjugate_gradient(confidence, movies, users)
+                movies = self._conjugate_gradient(transposed, users, movies)
+            else:
+                users = self.solve(confidence, movies, self.gram(movies))
+                movies = self.solve(transposed, users, self.gram(users))
+
+        return LatentFactors(
+            user_ids=user_ids,
+            movie_ids=movie_ids,
+            user_factors=users,
+            movie_factors=movies,
+            movie_gram=self.gram(movies),
+        )
+
+    def gram(self, fixed: np.ndarray) -> np.ndarray:
+        """Считает YᵀY + λI для фиксированных векторов Y."""
+        return fixed.T @ fixed + self.params.regularization * np.eye(fixed.shape[1])
+
+    def solve(
+        self, confidence: sparse.csr_matrix, fixed: np.ndarray, gram: np.ndarray
+    ) -> np.ndarray:
+        """
+        Решает системы ALS для всех строк матрицы уверенностей
+
+        Args:
+            confidence: Матрица alpha · rating вида строка × столбец
+            fixed: Фиксированные векторы столбцов
+            gram: Результат gram(fixed)
+
+        Returns:
+            Векторы строк. Строка без оценок получает нулевой вектор
+        """
+        rows: int = confidence.shape[0]
+        factors: int = fixed.shape[1]
+        result = np.zeros((rows, factors))
+
+        lengths = np.diff(confidence.indptr)
+        # Строки близкой длины попадают в один блок и почти не дополняются
+        order = np.argsort(lengths, kind="stable")
+        sorted_lengths = lengths[order]
+        max_block: int = max(1, self._BLOCK_BUDGET // (factors * factors))
+
+        start: int = int(np.searchsorted(sorted_lengths, 1))
+        while start < rows:
+            window = sorted_lengths[start : start + max_block]
+            padded = np.arange(1, len(window) + 1) * window * factors
+            size: int = max(
+                1, int(np.searchsorted(padded, self._BLOCK_BUDGET, "right"))
+            )
+
+            block = order[start : start + size]
+            result[block] = self._solve_block(
+                confidence, fixed, gram, block, int(window[size - 1])
+            )
+            start += size
+
+        return result
+
+    def _conjugate_gradient(
+        self, confidence: sparse.csr_matrix, fixed: np.ndarray, current: np.ndarray
+    ) -> np.ndarray:
+        """
+        Приближённо решает системы ALS всех строк методом сопряжённых градиентов
+
+        Системы не собираются: произведение A·p для всех строк сразу считается
+        как p·(YᵀY + λI) + W·Y, где W — разреженная матрица со значениями
+        (c − 1)·⟨p, y⟩ на месте оценок. Шаг стоит O(nnz · factors) вместо
+        O(nnz · factors²) у точного решения, а старт с векторов предыдущей
+        итерации позволяет обойтись несколькими шагами.
+
+        Args:
+            confidence: Матрица alpha · rating вида строка × столбец
+            fixed: Фиксированные векторы столбцов
+            current: Векторы строк с предыдущей итерации
+
+        Returns:
+            Новые векторы строк
+        """
+        gram: np.ndarray = self.gram(fixed)
+
+        def apply(vectors: np.ndarray) -> np.ndarray:
+            dots = self._pair_dots(vectors, fixed, confidence)
+            weighted = sparse.csr_matrix(
+                (confidence.data * dots, confidence.indices, confidence.indptr),
+                shape=confidence.shape,
+            )
+            return vectors @ gram + weighted @ fixed
+
+        rhs: np.ndarray = (
+            sparse.csr_matrix(
+                (confidence.data + 1.0, confidence.indices, confidence.indptr),
+                shape=confidence.shape,
+            )
+            @ fixed
+        )
+
+        solution: np.ndarray = current.copy()
+        residual: np.ndarray = rhs - apply(solution)
+        direction: np.ndarray = residual.copy()
+        norms = np.einsum("ij,ij->i", residual, residual)
+
+        for _ in range(self.params.cg_steps):
+            product = apply(direction)
+            curvature = np.einsum("ij,ij->i", direction, product)
+            step = np.divide(
+                norms, curvature, out=np.zeros_like(norms), where=curvature > 0
+            )
+
+            solution += step[:, None] * direction
+            residual -= step[:, None] * product
+
+            updated = np.einsum("ij,ij->i", residual, residual)
+            ratio = np.divide(updated, norms, out=np.zeros_like(norms), where=norms > 0)
+            direction = residual + ratio[:, None] * direction
+            norms = updated
+
+        return solution
+
+    def _pair_dots(
+        self, left: np.ndarray, right: np.ndarray, pattern: sparse.csr_matrix
+    ) -> np.ndarray:
+        """
+        Считает ⟨left[row], right[column]⟩ для всех ненулевых элементов pattern
+
+        Выборка векторов по индексам упирается в память, поэтому при плотной
+        матрице оценок (не ниже _DENSE_DENSITY) выгоднее перемножить блок
+        строк на все столбцы целиком и взять нужные элементы.
+
+        Returns:
+            Скалярные произведения в порядке элементов pattern
+        """
+        dots = np.empty(pattern.nnz)
+        # Без оценок width может быть нулевым, а считать нечего
+        if not pattern.nnz:
+            return dots
+
+        indptr, columns = pattern.indptr, pattern.indices
+        height, width = pattern.shape
+
+        if pattern.nnz >= self._DENSE_DENSITY * height * width:
+            block: int = max(1, self._BLOCK_BUDGET // width)
+            for start in range(0, height, block):
+                end: int = min(start + block, height)
+                low, high = indptr[start], indptr[end]
+                rows = np.repeat(
+                    np.arange(end - start), np.diff(indptr[start : end + 1])
+                )
+                dots[low:high] = (left[start:end] @ right.T)[rows, columns[low:high]]
+            return dots
+
+        rows = np.repeat(np.arange(height), np.diff(indptr))
+        chunk: int = max(1, self._BLOCK_BUDGET // left.shape[1])
+        for start in range(0, pattern.nnz, chunk):
+            end: int = start + chunk
+            dots[start:end] = np.einsum(
+                "ij,ij->i", left[rows[start:end]], right[columns[start:end]]
+            )
+        return dots
+
+    @staticmethod
+    def _solve_block(
+        confidence: sparse.csr_matrix,
+        fixed: np.ndarray,
+        gram: np.ndarray,
+        block: np.ndarray,
+        width: int,
+    ) -> np.ndarray:
+        """Собирает и решает системы для строк block, дополненных до width."""
+        lengths = np.diff(confidence.indptr)[block]
+        offsets = np.arange(width)
+        present = offsets[None, :] < lengths[:, None]
+        positions = np.where(present, confidence.indptr[block][:, None] + offsets, 0)
+
+        weights = np.where(present, confidence.data[positions], 0.0)
+        vectors = fixed[confidence.indices[positions]]
+        vectors[~present] = 0.0
+
+        # Σ (c − 1)·y·yᵀ по оценкам строки и правая часть Σ c·y
+        matrices = gram + np.matmul(
+            vectors.transpose(0, 2, 1) * weights[:, None, :], vectors
+        )
+        rhs = np.einsum("blk,bl->bk", vectors, weights + present)
+        return np.linalg.solve(matrices, rhs[..., None])[..., 0]
+
+    @staticmethod
+    def _ratings_matrix(
+        user_ratings: Mapping[int, dict[int, int]],
+    ) -> tuple[np.ndarray, np.ndarray, sparse.csr_matrix]:
+        """Собирает матрицу user × movie по пользователям с оценками."""
+        user_ids: list[int] = []
+        movies: list[int] = []
+        values: list[int] = []
+        indptr: list[int] = [0]
+
+        for user_id, user_movies in user_ratings.items():
+            if not user_movies:
+                continue
+            user_ids.append(user_id)
+            movies.extend(user_movies)
+            values.extend(user_movies.values())
+            indptr.append(len(movies))
+
+        movie_ids, columns = np.unique(
+            np.asarray(movies, dtype=np.int64), return_inverse=True
+        )
+        matrix = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float64), columns.ravel(), indptr),
+            shape=(len(user_ids), len(movie_ids)),
+        )
+        matrix.sort_indices()
+        return np.asarray(user_ids, dtype=np.int64), movie_ids, matrix
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from src.domain.interfaces.recommender import IRecommender
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RebuildStatus:
+    """Состояние фоновой пересборки рекомендателя."""
+
+    running: bool
+    rebuilds: int
+    failures: int
+    last_started_at: float | None
+    last_finished_at: float | None
+    last_duration: float | None
+    last_error: str | None
+    interval: float | None
+
+
+class RecommenderRebuildManager:
+    """Фоновая пересборка рекомендателя с атомарной подменой.
+
+    Новая модель собирается параллельно с работающей: пока идёт сборка,
+    запросы обслуживает старая. Одновременно выполняется не больше одной
+    сборки. Готовая модель догоняет журнал рейтингов и подменяет старую
+    в swap без единого await между ними, поэтому ни одно событие,
+    принятое старой моделью, не теряется. Запросы, уже получившие старую
+    модель, дорабатывают на ней.
+
+    До вызова start (конца прогрева, который собирает первую модель)
+    пересборка не запускается, чтобы не идти параллельно со сборкой
+    прогрева. Если задан interval, пересборка запускается по расписанию.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], Awaitable[IRecommender]],
+        swap: Callable[[IRecommender], None],
+        interval: float | None = None,
+    ) -> None:
+        """
+        Args:
+            build: Асинхронная функция, собирающая новую модель
+            swap: Функция, делающая новую модель рабочей
+            interval: Период пересборки по расписанию в секундах
+                (None — только по запросу)
+        """
+        self.build = build
+        self.swap = swap
+        self.interval: float | None = interval
+
+        self._task: asyncio.Task | None = None
+        self._scheduler: asyncio.Task | None = None
+        self._started: bool = False
+
+        self.rebuilds: int = 0
+        self.failures: int = 0
+        self.last_started_at: float | None = None
+        self.last_finished_at: float | None = None
+        self.last_duration: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def start(self) -> None:
+        """Разрешает пересборку и запускает расписание, если задан interval."""
+        self._started = True
+        if self.interval is not None and self._scheduler is None:
+            self._scheduler = asyncio.create_task(self._schedule())
+
+    async def stop(self) -> None:
+        """Останавливает расписание и прерывает идущую сборку."""
+        for task in (self._scheduler, self._task):
+            if task is None:
+                continue
+
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        self._scheduler = None
+        self._task = None
+
+    def trigger(self) -> bool:
+        """
+        Запускает пересборку в фоне
+
+        Returns:
+            True, если сборка запущена, и False, если она уже идёт
+            или менеджер ещё не запущен
+        """
+        if not self._started or self.running:
+            return False
+
+        self._task = asyncio.create_task(self._rebuild())
+        return True
+
+    def status(self) -> RebuildStatus:
+        return RebuildStatus(
+            running=self.running,
+            rebuilds=self.rebuilds,
+            failures=self.failures,
+            last_started_at=self.last_started_at,
+            last_finished_at=self.last_finished_at,
+            last_duration=self.last_duration,
+            last_error=self.last_error,
+            interval=self.interval,
+        )
+
+    async def _schedule(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.trigger():
+                await asyncio.shield(self._task)
+
+    async def _rebuild(self) -> None:
+        self.last_started_at = time.time()
+        started: float = time.perf_counter()
+
+        try:
+            recommender: IRecommender = await self.build()
+            self.swap(recommender)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failures += 1
+            self.last_error = repr(e)
+            logger.exception("Пересборка рекомендателя не удалась")
+        else:
+            self.rebuilds += 1
+            self.last_error = None
+            logger.info(
+                "Рекомендатель пересобран за %.2f с", time.perf_counter() - started
+            )
+        finally:
+            self.last_finished_at = time.time()
+            self.last_duration = time.perf_counter() - started
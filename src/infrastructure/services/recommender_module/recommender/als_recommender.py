@@ -0,0 +1,440 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from src.domain.entities.movie_lens.raitings import Rating, RatingRecord
+from src.domain.interfaces.rating_event_log import IRatingEventLog
+from src.domain.interfaces.recommender import IRecommender
+from src.infrastructure.services.recommender_module.factorization.als import (
+    ALSParams,
+    ALSTrainer,
+    LatentFactors,
+)
+from src.infrastructure.services.recommender_module.recommender.batch_scorer import (
+    SCORE_DECIMALS,
+    top_movies,
+)
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    online_update_seconds,
+    recommendations_total,
+    replayed_events_total,
+    scoring_seconds,
+)
+from src.infrastructure.services.recommender_module.recommender.materialized import (
+    MaterializedRecommendations,
+)
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
+from src.infrastructure.services.recommender_module.recommender.scoring_executor import (
+    ScoringExecutor,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+
+_FROM_CACHE = recommendations_total.labels("cache")
+_FROM_MATERIALIZED = recommendations_total.labels("materialized")
+_FROM_POPULARITY = recommendations_total.labels("popular")
+_FROM_SCORING = recommendations_total.labels("scored")
+_FROM_BATCH = recommendations_total.labels("batch")
+
+
+class ALSRecommender(IRecommender):
+    """Рекомендатель на скрытых векторах пользователей и фильмов (ALS).
+
+    Оценка фильма для пользователя — скалярное произведение их векторов,
+    поэтому рекомендации считаются одним произведением матрицы фильмов
+    на вектор пользователя и выбором top-N через argpartition: стоимость
+    не зависит от количества оценок пользователя.
+
+    Новый рейтинг пересчитывает только вектор его автора — решением одной
+    системы ALS при фиксированных векторах фильмов. Векторы фильмов
+    и фильмы, которых не было при обучении, обновляются полной пересборкой.
+
+    References:
+       - Hu, Koren, Volinsky. Collaborative Filtering for Implicit Feedback
+         Datasets, 2008
+    """
+
+    def __init__(
+        self,
+        factors: LatentFactors,
+        ratings_storage: RatingsStorage,
+        params: ALSParams = ALSParams(),
+        event_log: IRatingEventLog | None = None,
+        sequence: int = 0,
+        result_cache: RecommendationCache | None = None,
+        scoring_executor: ScoringExecutor | None = None,
+        max_cells: int = 1 << 22,
+    ) -> None:
+        """
+        Args:
+            factors: Обученные векторы пользователей и фильмов
+            ratings_storage: Хранилище пользовательских рейтингов
+            params: Параметры, с которыми обучены векторы
+            event_log: Журнал, в который пишутся онлайн-обновления
+            sequence: Номер последнего события журнала, учтённого в модели
+            result_cache: Кеш готовых рекомендаций recommend_for_user.
+                Онлайн-обновление удаляет из него только автора рейтинга
+                и пользователей без векторов
+            scoring_executor: Пул потоков, в котором считается
+                recommend_for_user. Если не задан, расчёт идёт в цикле событий
+            max_cells: Ограничение на размер плотного блока оценок
+                при пакетном расчёте
+        """
+        self.factors: LatentFactors = factors
+        self.storage: RatingsStorage = ratings_storage
+        self.params: ALSParams = params
+        self.event_log: IRatingEventLog | None = event_log
+        self.sequence: int = sequence
+        self.result_cache: RecommendationCache | None = result_cache
+        self.materialized: MaterializedRecommendations | None = None
+        self.scoring_executor: ScoringExecutor | None = scoring_executor
+
+        self.block_size: int = max(1, max_cells // max(1, len(factors.movie_ids)))
+
+        self._trainer: ALSTrainer = ALSTrainer(params)
+        self._movie_positions: dict[int, int] = {
+            movie_id: position
+            for position, movie_id in enumerate(factors.movie_ids.tolist())
+        }
+        self._user_positions: dict[int, int] = {
+            user_id: position
+            for position, user_id in enumerate(factors.user_ids.tolist())
+        }
+        # Векторы пользователей с запасом под новых: строки после
+        # len(_user_positions) не заняты
+        self._user_factors: np.ndarray = factors.user_factors
+        # Пользователи, изменившиеся во время идущей материализации
+        self._materializing: set[int] | None = None
+        # Номер версии модели: результат, посчитанный до онлайн-обновления,
+        # не должен попасть в кеш после него
+        self._version: int = 0
+        # Порядок применения обновлений совпадает с порядком записи в журнал
+        self._write_order: asyncio.Lock = asyncio.Lock()
+
+    async def recommend_for_user(self, user_id: int, top_n: int = 10) -> list[int]:
+        if self.result_cache is None:
+            return await self._score(user_id, top_n)
+
+        cached: list[int] | None = self.result_cache.get(user_id, top_n)
+        if cached is not None:
+            _FROM_CACHE.inc()
+            return cached
+
+        version: int = self._version
+        movie_ids: list[int] = await self._score(user_id, top_n)
+        if version != self._version:
+            return movie_ids
+
+        self.result_cache.put(
+            user_id,
+            top_n,
+            movie_ids,
+            cold=user_id not in self._user_positions,
+        )
+        return movie_ids
+
+    async def _score(self, user_id: int, top_n: int) -> list[int]:
+        if self.scoring_executor is None:
+            return self._recommend(user_id, top_n)
+
+        return await self.scoring_executor.run(self._recommend, user_id, top_n)
+
+    def _recommend(self, user_id: int, top_n: int) -> list[int]:
+        if self.materialized is not None:
+            materialized: list[int] | None = self.materialized.get(user_id, top_n)
+            if materialized is not None:
+                _FROM_MATERIALIZED.inc()
+                return materialized
+
+        position: int | None = self._user_positions.get(user_id)
+        if position is None:
+            _FROM_POPULARITY.inc()
+            return self.storage.popular(top_n)
+
+        started: float = time.perf_counter()
+        scores = self.factors.movie_factors @ self._user_factors[position]
+        np.round(scores, SCORE_DECIMALS, out=scores)
+        scores[self._rated_positions(self.storage.get_user_movies(user_id))] = -np.inf
+        movie_ids: list[int] = top_movies(scores, self.factors.movie_ids, top_n)
+
+        _FROM_SCORING.inc()
+        scoring_seconds.observe(time.perf_counter() - started)
+        return movie_ids
+
+    async def recommend_for_users(
+        self, requests: Sequence[tuple[int, int]]
+    ) -> AsyncIterator[tuple[int, list[int]]]:
+        for start in range(0, len(requests), self.block_size):
+            block: Sequence[tuple[int, int]] = requests[start : start + self.block_size]
+
+            warm: list[int] = [
+                idx
+                for idx, (user_id, _) in enumerate(block)
+                if user_id in self._user_positions
+            ]
+            scored: list[list[int]] = self._score_block(
+                self._user_factors[
+                    [self._user_positions[block[idx][0]] for idx in warm]
+                ],
+                [self.storage.get_user_movies(block[idx][0]) for idx in warm],
+                [block[idx][1] for idx in warm],
+            )
+            recommendations: dict[int, list[int]] = dict(zip(warm, scored))
+            _FROM_BATCH.inc(len(block))
+
+            for idx, (user_id, top_n) in enumerate(block):
+                movies: list[int] | None = recommendations.get(idx)
+                yield user_id, (
+                    movies if movies is not None else self.storage.popular(top_n)
+                )
+
+            # Отдаём управление циклу событий между блоками
+            await asyncio.sleep(0)
+
+    async def materialize(self, top_n: int, workers: int = 1) -> None:
+        """
+        Заранее считает рекомендации всех пользователей с векторами
+
+        Блоки пользователей считаются в пуле из workers потоков. Векторы
+        и оценки пользователей копируются перед отправкой блока, а
+        пользователи, изменившиеся во время расчёта, сразу попадают
+        в таблицу устаревшими. Готовая таблица заменяет предыдущую
+        в self.materialized.
+
+        Args:
+            top_n: Количество фильмов на пользователя
+            workers: Количество потоков для расчёта блоков
+        """
+        built_at: float = time.time()
+        started: float = time.perf_counter()
+
+        changed: set[int] = set()
+        self._materializing = changed
+        try:
+            user_ids: list[int] = list(self._user_positions)
+            loop = asyncio.get_running_loop()
+            recommendations: list[tuple[int, list[int]]] = []
+            pending: deque[tuple[list[int], asyncio.Future[list[list[int]]]]] = deque()
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for start in range(0, len(user_ids), self.block_size):
+                    block: list[int] = user_ids[start : start + self.block_size]
+                    vectors = self._user_factors[
+                        [self._user_positions[user_id] for user_id in block]
+                    ]
+                    rated: list[dict[int, int]] = [
+                        dict(self.storage.get_user_movies(user_id)) for user_id in block
+                    ]
+                    pending.append(
+                        (
+                            block,
+                            loop.run_in_executor(
+                                executor,
+                                self._score_block,
+                                vectors,
+                                rated,
+                                [top_n] * len(block),
+                            ),
+                        )
+                    )
+
+                    # Держим в работе не больше двух блоков на поток,
+                    # чтобы не копировать оценки всех пользователей разом
+                    if len(pending) >= 2 * workers:
+                        done_block, future = pending.popleft()
+                        recommendations.extend(zip(done_block, await future))
+
+                while pending:
+                    done_block, future = pending.popleft()
+                    recommendations.extend(zip(done_block, await future))
+        finally:
+            self._materializing = None
+
+        self.materialized = MaterializedRecommendations.from_lists(
+            top_n,
+            recommendations,
+            built_at=built_at,
+            duration=time.perf_counter() - started,
+            stale=changed,
+        )
+
+    def _score_block(
+        self,
+        vectors: np.ndarray,
+        rated: Sequence[dict[int, int]],
+        top_ns: Sequence[int],
+    ) -> list[list[int]]:
+        """
+        Формирует рекомендации для блока пользователей одним произведением
+
+        Args:
+            vectors: Векторы пользователей блока
+            rated: Оценки пользователей блока вида {movie_id: rating}
+            top_ns: Количество рекомендаций для каждого пользователя
+
+        Returns:
+            Списки рекомендованных фильмов в порядке пользователей
+        """
+        scores = vectors @ self.factors.movie_factors.T
+        np.round(scores, SCORE_DECIMALS, out=scores)
+        for row, user_movies in zip(scores, rated):
+            row[self._rated_positions(user_movies)] = -np.inf
+
+        return [
+            top_movies(row, self.factors.movie_ids, top_n)
+            for row, top_n in zip(scores, top_ns)
+        ]
+
+    def _rated_positions(self, user_movies: dict[int, int]) -> list[int]:
+        """Позиции оценённых пользователем фильмов в матрице фильмов."""
+        positions: dict[int, int] = self._movie_positions
+        return [
+            positions[movie_id] for movie_id in user_movies if movie_id in positions
+        ]
+
+    async def update_for_rating(self, rating: Rating) -> None:
+        await self.update_for_record(
+            RatingRecord(
+                user_id=rating.user.id,
+                movie_id=rating.movie.id,
+                rating=rating.rating,
+                timestamp=rating.timestamp,
+            )
+        )
+
+    async def update_for_record(self, record: RatingRecord) -> None:
+        started: float = time.perf_counter()
+        try:
+            await self._update(record)
+        finally:
+            online_update_seconds.observe(time.perf_counter() - started)
+
+    async def _update(self, record: RatingRecord) -> None:
+        if self.scoring_executor is None:
+            if self.event_log is not None:
+                self.sequence = self.event_log.append(record)
+
+            self._apply(record)
+            self._invalidate(record)
+            return
+
+        # Вектор меняется в цикле событий, но только после того, как
+        # расчёты в пуле потоков отпустят блокировку чтения
+        async with self._write_order:
+            if self.event_log is not None:
+                self.sequence = self.event_log.append(record)
+
+            self._version += 1
+            await self.scoring_executor.acquire_write()
+            try:
+                self._apply(record)
+            finally:
+                self.scoring_executor.release_write()
+
+            self._invalidate(record)
+
+    def replay(self, events: Iterable[tuple[int, RatingRecord]]) -> int:
+        """
+        Применяет события журнала, не записывая их повторно
+
+        Args:
+            events: Пары (номер события, рейтинг) в порядке записи
+
+        Returns:
+            Количество применённых событий
+        """
+        applied: int = 0
+        for sequence, record in events:
+            self._apply(record)
+            self._invalidate(record)
+            self.sequence = sequence
+            applied += 1
+
+        replayed_events_total.inc(applied)
+        return applied
+
+    def catch_up(self) -> int:
+        if self.event_log is None:
+            return 0
+
+        return self.replay(self.event_log.read_since(self.sequence))
+
+    def _apply(self, record: RatingRecord) -> None:
+        """
+        Сохраняет рейтинг и пересчитывает вектор его автора
+
+        Вектор — решение системы ALS по всем оценкам пользователя при
+        фиксированных векторах фильмов. Если пользователь оценил только
+        фильмы без векторов, вектор не появляется и ему по-прежнему
+        рекомендуются популярные фильмы.
+        """
+        self.storage.update(record)
+
+        user_movies: dict[int, int] = self.storage.get_user_movies(record.user_id)
+        columns: list[int] = self._rated_positions(user_movies)
+        if not columns:
+            return
+
+        ratings: list[int] = [
+            rating
+            for movie_id, rating in user_movies.items()
+            if movie_id in self._movie_positions
+        ]
+        confidence = sparse.csr_matrix(
+            (
+                np.asarray(ratings, dtype=np.float64) * self.params.alpha,
+                columns,
+                [0, len(columns)],
+            ),
+            shape=(1, len(self.factors.movie_ids)),
+        )
+        confidence.sort_indices()
+        vector: np.ndarray = self._trainer.solve(
+            confidence, self.factors.movie_factors, self.factors.movie_gram
+        )[0]
+
+        position: int | None = self._user_positions.get(record.user_id)
+        if position is None:
+            position = self._add_user(record.user_id)
+        self._user_factors[position] = vector
+
+    def _add_user(self, user_id: int) -> int:
+        """Выделяет строку под вектор нового пользователя."""
+        position: int = len(self._user_positions)
+        if position == len(self._user_factors):
+            # Массив заменяется целиком: расчёты, уже взявшие старый массив,
+            # дочитывают его без изменений
+            grown = np.zeros((max(1, 2 * position), self._user_factors.shape[1]))
+            grown[:position] = self._user_factors[:position]
+            self._user_factors = grown
+
+        self._user_positions[user_id] = position
+        return position
+
+    def _invalidate(self, record: RatingRecord) -> None:
+        """
+        Удаляет из кеша рекомендации, которые могли измениться после рейтинга.
+
+        Векторы фильмов не меняются, поэтому устаревают только рекомендации
+        автора рейтинга и пользователей без векторов, которым отдаются
+        популярные фильмы. Автор помечается устаревшим и в материализованной
+        таблице.
+        """
+        self._version += 1
+        affected: set[int] = {record.user_id}
+
+        if self.result_cache is not None and len(self.result_cache) > 0:
+            self.result_cache.invalidate_users(affected)
+            self.result_cache.invalidate_cold()
+        if self.materialized is not None:
+            self.materialized.mark_stale(affected)
+        if self._materializing is not None:
+            self._materializing.update(affected)
@@ -0,0 +1,144 @@
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from src.infrastructure.services.recommender_module.storage.csr import CSRMapping
+
+# Оценки округляются перед ранжированием: суммы в разном порядке отличаются
+# в последних битах, и без округления равные оценки упорядочивались бы
+# по-разному в поштучном и пакетном расчёте
+SCORE_DECIMALS: int = 10
+
+
+class BatchScorer:
+    """Векторизованный подсчёт рекомендаций для группы пользователей.
+
+    Считает те же оценки, что и ItemBasedCFRecommender.recommend_for_user:
+    score(u, y) = Σ r(u, x) · sim(x, y) / Σ |sim(x, y)| по фильмам x
+    пользователя, — но сразу для блока пользователей двумя разреженными
+    произведениями R·S и B·|S|, где R — оценки блока, B — индикатор оценок,
+    S — матрица сходства. Матрица сходства переводится в CSR один раз
+    при создании объекта.
+
+    Блок пользователей подбирается так, чтобы плотная матрица оценок блока
+    занимала не больше max_cells ячеек.
+    """
+
+    def __init__(
+        self,
+        similarity: Mapping[int, dict[int, float]],
+        max_cells: int = 1 << 22,
+    ) -> None:
+        """
+        Args:
+            similarity: Матрица сходства фильмов вида
+                {movie_id: {other_movie_id: similarity}}
+            max_cells: Ограничение на размер плотного блока оценок
+        """
+        matrix: CSRMapping = CSRMapping.from_dict(similarity, np.float64, np.int64)
+        keys, indptr, neighbors, values = matrix.arrays()
+
+        self.movie_ids: np.ndarray = np.union1d(keys, neighbors)
+        rows = np.repeat(np.searchsorted(self.movie_ids, keys), np.diff(indptr))
+        cols = np.searchsorted(self.movie_ids, neighbors)
+
+        shape: tuple[int, int] = (len(self.movie_ids), len(self.movie_ids))
+        self.weights: sparse.csr_matrix = sparse.csr_matrix(
+            (values.astype(np.float64), (rows, cols)), shape=shape
+        )
+        self.magnitudes: sparse.csr_matrix = abs(self.weights)
+
+        self.block_size: int = max(1, max_cells // max(1, len(self.movie_ids)))
+
+    def score(
+        self, users: Sequence[dict[int, int]], top_ns: Sequence[int]
+    ) -> list[list[int]]:
+        """
+        Формирует рекомендации для блока пользователей
+
+        Args:
+            users: Оценки пользователей вида {movie_id: rating}
+            top_ns: Количество рекомендаций для каждого пользователя
+
+        Returns:
+            Списки рекомендованных фильмов в порядке пользователей. При равных
+            оценках фильмы упорядочены по возрастанию id
+        """
+        results: list[list[int]] = []
+        for start in range(0, len(users), self.block_size):
+            end: int = start + self.block_size
+            results.extend(self._score_block(users[start:end], top_ns[start:end]))
+
+        return results
+
+    def _score_block(
+        self, users: Sequence[dict[int, int]], top_ns: Sequence[int]
+    ) -> list[list[int]]:
+        ratings: sparse.csr_matrix = self._ratings_matrix(users)
+        rated: sparse.csr_matrix = ratings.copy()
+        rated.data[:] = 1.0
+
+        numerator: np.ndarray = (ratings @ self.weights).toarray()
+        denominator: np.ndarray = (rated @ self.magnitudes).toarray()
+
+        scores = np.full(numerator.shape, -np.inf)
+        np.divide(numerator, denominator, out=scores, where=denominator > 0)
+        np.round(scores, SCORE_DECIMALS, out=scores)
+        scores[rated.toarray() > 0] = -np.inf
+
+        return [
+            top_movies(row, self.movie_ids, top_n) for row, top_n in zip(scores, top_ns)
+        ]
+
+    def _ratings_matrix(self, users: Sequence[dict[int, int]]) -> sparse.csr_matrix:
+        """Собирает оценки блока пользователей по столбцам матрицы сходства.
+
+        Фильмы без сходств с другими фильмами не влияют на оценки
+        и пропускаются.
+        """
+        indptr: list[int] = [0]
+        movies: list[int] = []
+        ratings: list[int] = []
+        for user_movies in users:
+            movies.extend(user_movies)
+            ratings.extend(user_movies.values())
+            indptr.append(len(movies))
+
+        ids = np.asarray(movies, dtype=np.int64)
+        values = np.asarray(ratings, dtype=np.float64)
+        positions = np.searchsorted(self.movie_ids, ids)
+
+        known = positions < len(self.movie_ids)
+        known[known] = self.movie_ids[positions[known]] == ids[known]
+
+        row_ids = np.repeat(np.arange(len(users)), np.diff(indptr))
+        return sparse.csr_matrix(
+            (values[known], (row_ids[known], positions[known])),
+            shape=(len(users), len(self.movie_ids)),
+        )
+
+
+def top_movies(scores: np.ndarray, movie_ids: np.ndarray, top_n: int) -> list[int]:
+    """
+    Выбирает top_n фильмов с наибольшими оценками
+
+    Args:
+        scores: Оценки фильмов; -inf — фильм не рекомендуется
+        movie_ids: Идентификаторы фильмов в порядке оценок
+        top_n: Количество фильмов
+
+    Returns:
+        Фильмы по убыванию оценки, при равных оценках — по возрастанию id
+    """
+    candidates: int = int(np.isfinite(scores).sum())
+    k: int = min(top_n, candidates)
+    if k <= 0:
+        return []
+
+    # Берём все фильмы с оценкой не ниже k-й, чтобы равные оценки
+    # на границе отбора упорядочились по id, а не произвольно
+    threshold: float = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    top = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((movie_ids[top], -scores[top]))[:k]
+    return movie_ids[top[order]].tolist()
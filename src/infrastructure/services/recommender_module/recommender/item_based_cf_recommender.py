@@ -1,14 +1,92 @@
-from collections import defaultdict
+import asyncio
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
 
-from src.domain.entities.movie_lens.raitings import Rating
+from src.domain.entities.movie_lens.raitings import Rating, RatingRecord
+from src.domain.interfaces.rating_event_log import IRatingEventLog
 from src.domain.interfaces.recommender import IRecommender
+from src.infrastructure.services.metrics import registry
+from src.infrastructure.services.recommender_module.recommender.batch_scorer import (
+    BatchScorer,
+    SCORE_DECIMALS,
+)
+from src.infrastructure.services.recommender_module.recommender.materialized import (
+    MaterializedRecommendations,
+)
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
+from src.infrastructure.services.recommender_module.recommender.scoring_executor import (
+    ScoringExecutor,
+)
 from src.infrastructure.services.recommender_module.similarity.cosine import (
     CosineSimilarity,
 )
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.statistics import (
+    CosineStatistics,
+)
 from src.infrastructure.services.recommender_module.storage.ratings_storage import (
     RatingsStorage,
 )
 
+T = TypeVar("T")
+
+# Сколько устаревших пользователей пересчитывается за один захват модели
+_REFRESH_BLOCK = 64
+
+
+@dataclass(frozen=True, slots=True)
+class SimilarityChange:
+    """Изменения матрицы сходства после одного рейтинга.
+
+    Attributes:
+        movie_id: Фильм рейтинга
+        rows: Строки, изменившиеся не только в столбце movie_id: строка
+            самого фильма и строки, из которых обрезка выбросила соседей
+        column_rows: Строки, в которых изменилось только сходство с movie_id
+    """
+
+    movie_id: int
+    rows: set[int]
+    column_rows: set[int]
+
+
+recommendations_total = registry.counter(
+    "recommender_recommendations",
+    "Выданные рекомендации по источнику ответа",
+    ("source",),
+)
+_FROM_CACHE = recommendations_total.labels("cache")
+_FROM_MATERIALIZED = recommendations_total.labels("materialized")
+_FROM_POPULARITY = recommendations_total.labels("popular")
+_FROM_SCORING = recommendations_total.labels("scored")
+_FROM_BATCH = recommendations_total.labels("batch")
+
+scoring_seconds = registry.histogram(
+    "recommender_scoring_seconds",
+    "Время расчёта рекомендаций пользователя по матрице сходства",
+)
+neighbors_visited = registry.histogram(
+    "recommender_neighbors_visited",
+    "Количество соседей, просмотренных при расчёте рекомендаций пользователя",
+    buckets=(10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+online_update_seconds = registry.histogram(
+    "recommender_online_update_seconds",
+    "Длительность онлайн-обновления модели по одному рейтингу",
+)
+replayed_events_total = registry.counter(
+    "recommender_replayed_events",
+    "События журнала, применённые к модели при старте и подмене",
+)
+
 
 class ItemBasedCFRecommender(IRecommender):
     """
@@ -21,26 +99,123 @@ class ItemBasedCFRecommender(IRecommender):
         self,
         similarity_matrix: dict[int, dict[int, float]],
         ratings_storage: RatingsStorage,
+        neighbor_policy: NeighborPolicy = NeighborPolicy(),
+        statistics: CosineStatistics | None = None,
+        event_log: IRatingEventLog | None = None,
+        sequence: int = 0,
+        result_cache: RecommendationCache | None = None,
+        scoring_executor: ScoringExecutor | None = None,
+        refresh_delay: float | None = None,
     ) -> None:
         """
         Args:
             similarity_matrix: Матрица сходства фильмов вида
                 {movie_id: {other_movie_id: similarity}}
             ratings_storage: Хранилище пользовательских рейтингов
+            neighbor_policy: Правило отбора соседей при онлайн-обновлении
+            statistics: Нормы и скалярные произведения векторов фильмов.
+                Если переданы, онлайн-обновление пересчитывает сходство
+                по ним, не обходя векторы оценок
+            event_log: Журнал, в который пишутся онлайн-обновления
+            sequence: Номер последнего события журнала, учтённого в модели
+            result_cache: Кеш готовых рекомендаций recommend_for_user.
+                Онлайн-обновление удаляет из него пользователей, оценивших
+                фильмы с изменившимися строками матрицы сходства
+            scoring_executor: Пул потоков, в котором считается
+                recommend_for_user. Онлайн-обновления тогда применяются
+                в отдельном потоке под блокировкой записи модели. Если
+                не задан, расчёт и обновления идут в цикле событий
+            refresh_delay: Через сколько секунд после онлайн-обновления
+                пересчитывать в фоне устаревших пользователей
+                материализованной таблицы (None — не пересчитывать)
         """
         self.similarity: dict[int, dict[int, float]] = similarity_matrix
         self.storage: RatingsStorage = ratings_storage
+        self.neighbor_policy: NeighborPolicy = neighbor_policy
+        self.statistics: CosineStatistics | None = statistics
+        self.event_log: IRatingEventLog | None = event_log
+        self.sequence: int = sequence
+        self.result_cache: RecommendationCache | None = result_cache
+        self.materialized: MaterializedRecommendations | None = None
+        self.scoring_executor: ScoringExecutor | None = scoring_executor
+        self.refresh_delay: float | None = refresh_delay
+
+        # CSR-копия матрицы сходства для пакетных рекомендаций,
+        # сбрасывается при онлайн-обновлении
+        self._batch_scorer: BatchScorer | None = None
+        self._batch_scorer_build: asyncio.Lock = asyncio.Lock()
+        # Пользователи, изменившиеся во время идущей материализации
+        self._materializing: set[int] | None = None
+        # Номер версии модели: результат, посчитанный до онлайн-обновления,
+        # не должен попасть в кеш после него
+        self._version: int = 0
+        # Порядок применения обновлений совпадает с порядком записи в журнал
+        self._write_order: asyncio.Lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
 
     async def recommend_for_user(self, user_id: int, top_n: int = 10) -> list[int]:
+        if self.result_cache is None:
+            return await self._score(user_id, top_n)
+
+        cached: list[int] | None = self.result_cache.get(user_id, top_n)
+        if cached is not None:
+            _FROM_CACHE.inc()
+            return cached
+
+        version: int = self._version
+        movie_ids: list[int] = await self._score(user_id, top_n)
+        if version != self._version:
+            return movie_ids
+
+        self.result_cache.put(
+            user_id,
+            top_n,
+            movie_ids,
+            cold=not self.storage.get_user_movies(user_id),
+        )
+        return movie_ids
+
+    async def _score(self, user_id: int, top_n: int) -> list[int]:
+        if self.scoring_executor is None:
+            return self._recommend(user_id, top_n)
+
+        return await self.scoring_executor.run(self._recommend, user_id, top_n)
+
+    def _recommend(self, user_id: int, top_n: int) -> list[int]:
+        if self.materialized is not None:
+            materialized: list[int] | None = self.materialized.get(user_id, top_n)
+            if materialized is not None:
+                _FROM_MATERIALIZED.inc()
+                return materialized
+
         user_movies: dict[int, int] = self.storage.get_user_movies(user_id)
         if not user_movies:
+            _FROM_POPULARITY.inc()
             return self.storage.popular(top_n)
 
+        started: float = time.perf_counter()
+        movie_ids, visited = self._rank(user_movies, top_n)
+
+        _FROM_SCORING.inc()
+        scoring_seconds.observe(time.perf_counter() - started)
+        neighbors_visited.observe(visited)
+        return movie_ids
+
+    def _rank(self, user_movies: dict[int, int], top_n: int) -> tuple[list[int], int]:
+        """
+        Считает рекомендации по оценкам пользователя
+
+        Returns:
+            top_n фильмов и количество просмотренных элементов матрицы сходства
+        """
         scores: dict[int, float] = defaultdict(float)
         weights: dict[int, float] = defaultdict(float)
+        visited: int = 0
 
         for movie_id, rating in user_movies.items():
-            for other_movie, similarity in self.similarity.get(movie_id, {}).items():
+            row: dict[int, float] = self.similarity.get(movie_id, {})
+            visited += len(row)
+            for other_movie, similarity in row.items():
                 if other_movie in user_movies:
                     continue
 
@@ -49,31 +224,488 @@ class ItemBasedCFRecommender(IRecommender):
                 weights[other_movie] += abs(similarity)
 
         ranked: list[tuple[int, float]] = [
-            (mid, scores[mid] / weights[mid]) for mid in scores if weights[mid] > 0
+            (mid, round(scores[mid] / weights[mid], SCORE_DECIMALS))
+            for mid in scores
+            if weights[mid] > 0
+        ]
+
+        ranked.sort(key=lambda x: (-x[1], x[0]))
+        return [mid for mid, _ in ranked[:top_n]], visited
+
+    async def recommend_for_users(
+        self, requests: Sequence[tuple[int, int]]
+    ) -> AsyncIterator[tuple[int, list[int]]]:
+        scorer: BatchScorer = await self._get_batch_scorer()
+        for start in range(0, len(requests), scorer.block_size):
+            block: Sequence[tuple[int, int]] = requests[
+                start : start + scorer.block_size
+            ]
+
+            recommendations: list[list[int]] = await self._read_model(
+                self._score_block, scorer, block
+            )
+            _FROM_BATCH.inc(len(block))
+
+            for (user_id, _), movies in zip(block, recommendations):
+                yield user_id, movies
+
+            # Отдаём управление циклу событий между блоками
+            await asyncio.sleep(0)
+
+    async def materialize(self, top_n: int, workers: int = 1) -> None:
+        """
+        Заранее считает рекомендации всех пользователей с оценками
+
+        Блоки пользователей считаются BatchScorer в пуле из workers потоков
+        по CSR-копии матрицы сходства, снятой в начале. Оценки пользователей
+        копируются перед отправкой блока, а пользователи, затронутые
+        онлайн-обновлениями во время расчёта, сразу попадают в таблицу
+        устаревшими. Готовая таблица заменяет предыдущую в self.materialized.
+
+        Args:
+            top_n: Количество фильмов на пользователя
+            workers: Количество потоков для расчёта блоков
+        """
+        built_at: float = time.time()
+        started: float = time.perf_counter()
+
+        scorer: BatchScorer = await self._get_batch_scorer()
+
+        changed: set[int] = set()
+        self._materializing = changed
+        try:
+            user_ids: list[int] = await self._read_model(self._rated_user_ids)
+            loop = asyncio.get_running_loop()
+            recommendations: list[tuple[int, list[int]]] = []
+            pending: deque[tuple[list[int], asyncio.Future[list[list[int]]]]] = deque()
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for start in range(0, len(user_ids), scorer.block_size):
+                    block: list[int] = user_ids[start : start + scorer.block_size]
+                    users: list[dict[int, int]] = await self._read_model(
+                        self._copy_user_movies, block
+                    )
+                    pending.append(
+                        (
+                            block,
+                            loop.run_in_executor(
+                                executor, scorer.score, users, [top_n] * len(block)
+                            ),
+                        )
+                    )
+
+                    # Держим в работе не больше двух блоков на поток,
+                    # чтобы не копировать оценки всех пользователей разом
+                    if len(pending) >= 2 * workers:
+                        done_block, future = pending.popleft()
+                        recommendations.extend(zip(done_block, await future))
+
+                while pending:
+                    done_block, future = pending.popleft()
+                    recommendations.extend(zip(done_block, await future))
+        finally:
+            self._materializing = None
+
+        self.materialized = MaterializedRecommendations.from_lists(
+            top_n,
+            recommendations,
+            built_at=built_at,
+            duration=time.perf_counter() - started,
+            stale=changed,
+        )
+        self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        """Запускает фоновый пересчёт устаревших пользователей таблицы."""
+        if self.refresh_delay is None or self.materialized is None:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        self._refresh_task = asyncio.create_task(self._refresh_stale(self.materialized))
+
+    async def _refresh_stale(self, table: MaterializedRecommendations) -> None:
+        """
+        Пересчитывает устаревших пользователей материализованной таблицы
+
+        Ждёт refresh_delay, чтобы собрать обновления подряд в один проход,
+        и пересчитывает пользователей блоками под блокировкой порядка
+        обновлений: рейтинг, пришедший между расчётом и записью в таблицу,
+        не потеряется. Останавливается, когда устаревших не осталось или
+        таблицу заменила новая материализация.
+        """
+        await asyncio.sleep(self.refresh_delay)
+        while self.materialized is table:
+            async with self._write_order:
+                if self.materialized is not table:
+                    return
+
+                user_ids: list[int] = table.stale_users(_REFRESH_BLOCK)
+                if not user_ids:
+                    return
+
+                recommendations: list[list[int]] = await self._read_model(
+                    self._rank_users, user_ids, table.top_n
+                )
+                table.refresh(zip(user_ids, recommendations))
+
+            # Отдаём управление циклу событий между блоками
+            await asyncio.sleep(0)
+
+    def _rank_users(self, user_ids: list[int], top_n: int) -> list[list[int]]:
+        return [
+            self._rank(self.storage.get_user_movies(user_id), top_n)[0]
+            for user_id in user_ids
+        ]
+
+    async def stop(self) -> None:
+        """Останавливает фоновый пересчёт материализованной таблицы."""
+        if self._refresh_task is None:
+            return
+
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    def _score_block(
+        self, scorer: BatchScorer, block: Sequence[tuple[int, int]]
+    ) -> list[list[int]]:
+        """Считает рекомендации блока; пользователям без оценок — популярные."""
+        users: list[dict[int, int]] = [
+            self.storage.get_user_movies(user_id) for user_id, _ in block
+        ]
+        warm: list[int] = [idx for idx, movies in enumerate(users) if movies]
+        scored: dict[int, list[int]] = dict(
+            zip(
+                warm,
+                scorer.score(
+                    [users[idx] for idx in warm], [block[idx][1] for idx in warm]
+                ),
+            )
+        )
+        return [
+            scored[idx] if idx in scored else self.storage.popular(top_n)
+            for idx, (_, top_n) in enumerate(block)
+        ]
+
+    def _rated_user_ids(self) -> list[int]:
+        # get_user_movies не сохраняет строки снимка в оверлей CSRMapping,
+        # в отличие от обхода users.items()
+        return [
+            user_id
+            for user_id in self.storage.users
+            if self.storage.get_user_movies(user_id)
         ]
 
-        ranked.sort(key=lambda x: x[1], reverse=True)
-        return [mid for mid, _ in ranked[:top_n]]
+    def _copy_user_movies(self, user_ids: list[int]) -> list[dict[int, int]]:
+        return [dict(self.storage.get_user_movies(user_id)) for user_id in user_ids]
+
+    async def _read_model(self, function: Callable[..., T], *args) -> T:
+        """
+        Читает модель из цикла событий
+
+        С пулом расчёта онлайн-обновления меняют модель в отдельном потоке,
+        поэтому чтение тоже уходит в поток под блокировкой чтения
+        """
+        if self.scoring_executor is None:
+            return function(*args)
+
+        return await self.scoring_executor.read(function, *args)
+
+    async def _get_batch_scorer(self) -> BatchScorer:
+        """
+        Отдаёт CSR-копию матрицы сходства, собирая её в отдельном потоке
+
+        Пока копия собирается, матрица не меняется: с пулом расчёта сборка
+        держит блокировку чтения модели, без него — очередь обновлений.
+        Если модель изменилась, пока копия ждала цикла событий, копия
+        используется только текущим вызовом.
+        """
+        async with self._batch_scorer_build:
+            if self._batch_scorer is not None:
+                return self._batch_scorer
+
+            if self.scoring_executor is not None:
+                version: int = self._version
+                scorer: BatchScorer = await self.scoring_executor.read(
+                    BatchScorer, self.similarity
+                )
+            else:
+                async with self._write_order:
+                    version = self._version
+                    scorer = await asyncio.to_thread(BatchScorer, self.similarity)
+
+            if version == self._version:
+                self._batch_scorer = scorer
+            return scorer
 
     async def update_for_rating(self, rating: Rating) -> None:
-        user_id: int = rating.user.id
-        movie_id: int = rating.movie.id
+        await self.update_for_record(
+            RatingRecord(
+                user_id=rating.user.id,
+                movie_id=rating.movie.id,
+                rating=rating.rating,
+                timestamp=rating.timestamp,
+            )
+        )
+
+    async def update_for_record(self, record: RatingRecord) -> None:
+        started: float = time.perf_counter()
+        try:
+            await self._update(record)
+        finally:
+            online_update_seconds.observe(time.perf_counter() - started)
+
+    async def _update(self, record: RatingRecord) -> None:
+        if self.scoring_executor is None:
+            # Ждёт, пока CSR-копия матрицы соберётся в отдельном потоке
+            async with self._write_order:
+                if self.event_log is not None:
+                    self.sequence = self.event_log.append(record)
+
+                self._invalidate(record, self._apply(record))
+            self._schedule_refresh()
+            return
+
+        # Модель меняется в отдельном потоке, когда расчёты в пуле
+        # отпустят блокировку чтения: цикл событий не ждёт пересчёта строк
+        async with self._write_order:
+            if self.event_log is not None:
+                self.sequence = self.event_log.append(record)
+
+            self._version += 1
+            change: SimilarityChange = await self.scoring_executor.write(
+                self._apply, record
+            )
+
+            self._invalidate(record, change)
+        self._schedule_refresh()
+
+    def replay(self, events: Iterable[tuple[int, RatingRecord]]) -> int:
+        """
+        Применяет события журнала, не записывая их повторно
+
+        Args:
+            events: Пары (номер события, рейтинг) в порядке записи
+
+        Returns:
+            Количество применённых событий
+        """
+        applied: int = 0
+        for sequence, record in events:
+            self._invalidate(record, self._apply(record))
+            self.sequence = sequence
+            applied += 1
+
+        replayed_events_total.inc(applied)
+        return applied
+
+    def catch_up(self) -> int:
+        if self.event_log is None:
+            return 0
+
+        return self.replay(self.event_log.read_since(self.sequence))
+
+    def _invalidate(self, record: RatingRecord, change: SimilarityChange) -> None:
+        """
+        Удаляет из кеша рекомендации, которые изменились после рейтинга.
+
+        Оценки пользователя зависят только от строк матрицы по его фильмам.
+        Если строка изменилась не только в столбце фильма рейтинга, меняются
+        оценки многих кандидатов, и рекомендации всех, кто оценил этот фильм
+        (в их числе автора рейтинга), устаревают. Если же в строке изменилось
+        только сходство с фильмом рейтинга, у оценивших её фильм меняется
+        оценка одного кандидата — фильма рейтинга, — и их рекомендации
+        устаревают, только если этот фильм был в списке или теперь в него
+        попадает. Рейтинг популярности тоже мог сдвинуться, поэтому удаляются
+        и все записи пользователей без оценок. Те же пользователи
+        помечаются устаревшими в материализованной таблице.
+        """
+        self._version += 1
+        cached: bool = self.result_cache is not None and len(self.result_cache) > 0
+        if not cached and self.materialized is None and self._materializing is None:
+            return
+
+        affected: set[int] = {record.user_id}
+        for movie_id in change.rows:
+            affected.update(self.storage.get_movie_vector(movie_id))
+
+        candidates: set[int] = set()
+        for movie_id in change.column_rows:
+            candidates.update(self.storage.get_movie_vector(movie_id))
+        candidates -= affected
+
+        # Списки идущей материализации ещё не видны: устаревшими считаются все
+        if self._materializing is not None:
+            self._materializing.update(affected, candidates)
 
-        self.storage.update(rating)
+        affected.update(
+            user_id
+            for user_id in candidates
+            if self._candidate_moved(user_id, change.movie_id)
+        )
+
+        if cached:
+            self.result_cache.invalidate_users(affected)
+            self.result_cache.invalidate_cold()
+        if self.materialized is not None:
+            self.materialized.mark_stale(affected)
+
+    def _candidate_moved(self, user_id: int, movie_id: int) -> bool:
+        """
+        Проверяет, изменилось ли место фильма в готовых списках пользователя
+
+        Вызывается, когда у пользователя изменилась только оценка кандидата
+        movie_id: список меняется, если фильм в нём был или теперь
+        оказывается выше последнего фильма (или список был неполным)
+        """
+        lists: list[tuple[int, list[int]]] = []
+        if self.result_cache is not None:
+            lists.extend(self.result_cache.peek(user_id))
+        if self.materialized is not None:
+            materialized: list[int] | None = self.materialized.peek(user_id)
+            if materialized is not None:
+                lists.append((self.materialized.top_n, materialized))
+        if not lists:
+            return False
+
+        user_movies: dict[int, int] = self.storage.get_user_movies(user_id)
+        score: float | None = self._candidate_score(user_movies, movie_id)
+        for top_n, movies in lists:
+            if movie_id in movies:
+                return True
+            if score is None:
+                continue
+            if len(movies) < top_n:
+                return True
+
+            last: int = movies[-1]
+            last_score: float | None = self._candidate_score(user_movies, last)
+            if last_score is None or (-score, movie_id) < (-last_score, last):
+                return True
+
+        return False
+
+    def _candidate_score(
+        self, user_movies: dict[int, int], movie_id: int
+    ) -> float | None:
+        """Оценка фильма для пользователя, как в _recommend, или None."""
+        if movie_id in user_movies:
+            return None
+
+        score: float = 0.0
+        weight: float = 0.0
+        for rated_id, rating in user_movies.items():
+            similarity: float | None = self.similarity.get(rated_id, {}).get(movie_id)
+            if similarity is not None:
+                score += similarity * rating
+                weight += abs(similarity)
+
+        if weight <= 0:
+            return None
+        return round(score / weight, SCORE_DECIMALS)
+
+    def _apply(self, record: RatingRecord) -> SimilarityChange:
+        """
+        Обновляет матрицу сходства после нового рейтинга.
+
+        Если есть статистики косинуса, строка фильма пересчитывается целиком
+        по ним: это совпадает с полной пересборкой, так как норма фильма
+        меняется для всех его пар. Иначе пересчитываются только пары фильма
+        с остальными фильмами пользователя.
+
+        Если задан max_neighbors, затронутые строки снова обрезаются до K
+        самых похожих соседей. Соседи, ранее отброшенные обрезкой в строках
+        других фильмов, при этом не восстанавливаются — это делает только
+        полная пересборка.
+
+        Returns:
+            Строки матрицы сходства, которые могли измениться
+        """
+        user_id: int = record.user_id
+        movie_id: int = record.movie_id
+        self._batch_scorer = None
+
+        if self.statistics is not None:
+            old_rating: int | None = self.storage.get_user_movies(user_id).get(movie_id)
+            self.storage.update(record)
+            self.statistics.update(
+                self.storage.get_user_movies(user_id),
+                movie_id,
+                old_rating,
+                record.rating,
+            )
+            return self._update_from_statistics(movie_id)
+
+        self.storage.update(record)
 
         user_movies: dict[int, int] = self.storage.get_user_movies(user_id)
+        vector1: dict[int, int] = self.storage.get_movie_vector(movie_id)
+        change = SimilarityChange(movie_id, {movie_id}, set())
         for other_id in user_movies:
             if other_id == movie_id:
                 continue
 
-            vector1: dict[int, int] = self.storage.get_movie_vector(movie_id)
             vector2: dict[int, int] = self.storage.get_movie_vector(other_id)
 
             similarity: float = CosineSimilarity.calculate(vector1, vector2)
 
-            if similarity > 0:
+            if self.neighbor_policy.accepts(similarity):
                 self.similarity[movie_id][other_id] = similarity
                 self.similarity[other_id][movie_id] = similarity
+                self._track(change, other_id, self._prune(other_id))
             else:
                 self.similarity[movie_id].pop(other_id, None)
                 self.similarity[other_id].pop(movie_id, None)
+                change.column_rows.add(other_id)
+
+        self._prune(movie_id)
+        return change
+
+    def _update_from_statistics(self, movie_id: int) -> SimilarityChange:
+        """Пересчитывает строку фильма и симметричные ей элементы по статистикам."""
+        row: dict[int, float] = self.statistics.row(movie_id)
+        change = SimilarityChange(movie_id, {movie_id}, set())
+
+        for other_id, similarity in row.items():
+            if self.neighbor_policy.accepts(similarity):
+                self.similarity[other_id][movie_id] = similarity
+                self._track(change, other_id, self._prune(other_id))
+            else:
+                self.similarity[other_id].pop(movie_id, None)
+                change.column_rows.add(other_id)
+
+        self.similarity[movie_id] = self.neighbor_policy.prune(
+            {
+                other_id: similarity
+                for other_id, similarity in row.items()
+                if self.neighbor_policy.accepts(similarity)
+            }
+        )
+        return change
+
+    @staticmethod
+    def _track(change: SimilarityChange, row_id: int, dropped: set[int]) -> None:
+        """Относит строку к изменённым целиком, если обрезка выбросила соседей."""
+        if dropped - {change.movie_id}:
+            change.rows.add(row_id)
+        else:
+            change.column_rows.add(row_id)
+
+    def _prune(self, movie_id: int) -> set[int]:
+        """
+        Обрезает строку матрицы до max_neighbors соседей, если лимит задан.
+
+        Returns:
+            Соседи, выброшенные обрезкой
+        """
+        if self.neighbor_policy.max_neighbors is None:
+            return set()
+
+        row: dict[int, float] = self.similarity[movie_id]
+        pruned: dict[int, float] = self.neighbor_policy.prune(row)
+        self.similarity[movie_id] = pruned
+        return set(row) - set(pruned)
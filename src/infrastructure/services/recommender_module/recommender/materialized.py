@@ -0,0 +1,170 @@
+import time
+from collections.abc import Iterable, Sequence
+from itertools import islice
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class MaterializationStats:
+    """Сведения о последней материализации рекомендаций."""
+
+    users: int
+    top_n: int
+    stale_users: int
+    built_at: float
+    duration: float
+    age: float
+
+
+class MaterializedRecommendations:
+    """Заранее посчитанные top-N рекомендации всех пользователей.
+
+    Списки хранятся в CSR-виде: отсортированные id пользователей, смещения
+    indptr и общий массив id фильмов, — а словарь позиций даёт поиск
+    пользователя за O(1). Так как порядок рекомендаций полный (оценка, затем
+    id фильма), первые k фильмов списка совпадают с top-k, поэтому таблица
+    отвечает на любой запрос с top_n не больше материализованного.
+
+    Пользователи, чьи рекомендации могли измениться после материализации,
+    помечаются устаревшими и для них таблица не отвечает, пока их списки
+    не пересчитают и не передадут в refresh.
+    """
+
+    def __init__(
+        self,
+        top_n: int,
+        user_ids: np.ndarray,
+        indptr: np.ndarray,
+        movie_ids: np.ndarray,
+        built_at: float,
+        duration: float,
+        stale: Iterable[int] = (),
+    ) -> None:
+        """
+        Args:
+            top_n: Количество материализованных фильмов на пользователя
+            user_ids: Отсортированные id пользователей
+            indptr: Смещения списков пользователей в movie_ids
+            movie_ids: Рекомендованные фильмы всех пользователей подряд
+            built_at: Время начала материализации (unix time)
+            duration: Длительность материализации в секундах
+            stale: Пользователи, изменившиеся во время материализации
+        """
+        self.top_n: int = top_n
+        self.user_ids: np.ndarray = user_ids
+        self.indptr: np.ndarray = indptr
+        self.movie_ids: np.ndarray = movie_ids
+        self.built_at: float = built_at
+        self.duration: float = duration
+
+        self._positions: dict[int, int] = {
+            user_id: position for position, user_id in enumerate(user_ids.tolist())
+        }
+        self._stale: set[int] = set()
+        # Пересчитанные после материализации списки устаревших пользователей
+        self._refreshed: dict[int, list[int]] = {}
+        self.mark_stale(stale)
+
+    @classmethod
+    def from_lists(
+        cls,
+        top_n: int,
+        recommendations: Sequence[tuple[int, list[int]]],
+        built_at: float,
+        duration: float,
+        stale: Iterable[int] = (),
+    ) -> "MaterializedRecommendations":
+        """
+        Упаковывает рекомендации в CSR-массивы
+
+        Args:
+            top_n: Количество материализованных фильмов на пользователя
+            recommendations: Пары (id пользователя, рекомендованные фильмы)
+            built_at: Время начала материализации (unix time)
+            duration: Длительность материализации в секундах
+            stale: Пользователи, изменившиеся во время материализации
+        """
+        ordered: list[tuple[int, list[int]]] = sorted(recommendations)
+        lengths = np.fromiter(
+            (len(movies) for _, movies in ordered), dtype=np.int64, count=len(ordered)
+        )
+
+        indptr = np.zeros(len(ordered) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        movie_ids = np.fromiter(
+            (movie_id for _, movies in ordered for movie_id in movies),
+            dtype=np.int32,
+            count=int(indptr[-1]),
+        )
+        user_ids = np.fromiter(
+            (user_id for user_id, _ in ordered), dtype=np.int64, count=len(ordered)
+        )
+
+        return cls(top_n, user_ids, indptr, movie_ids, built_at, duration, stale)
+
+    def get(self, user_id: int, top_n: int) -> list[int] | None:
+        """
+        Возвращает материализованные рекомендации
+
+        Returns:
+            Первые top_n фильмов или None, если пользователя нет в таблице,
+            он устарел или top_n больше материализованного
+        """
+        if top_n > self.top_n or user_id in self._stale:
+            return None
+
+        refreshed: list[int] | None = self._refreshed.get(user_id)
+        if refreshed is not None:
+            return refreshed[:top_n]
+
+        position: int | None = self._positions.get(user_id)
+        if position is None:
+            return None
+
+        start: int = int(self.indptr[position])
+        end: int = min(int(self.indptr[position + 1]), start + top_n)
+        return self.movie_ids[start:end].tolist()
+
+    def peek(self, user_id: int) -> list[int] | None:
+        """Полный материализованный список пользователя, если он ещё отдаётся."""
+        return self.get(user_id, self.top_n)
+
+    def mark_stale(self, user_ids: Iterable[int]) -> None:
+        """Исключает пользователей из выдачи, пока их списки не пересчитают."""
+        positions: dict[int, int] = self._positions
+        for user_id in user_ids:
+            if user_id in positions:
+                self._stale.add(user_id)
+                self._refreshed.pop(user_id, None)
+
+    def stale_users(self, limit: int) -> list[int]:
+        """Возвращает до limit устаревших пользователей."""
+        return list(islice(self._stale, limit))
+
+    def refresh(self, recommendations: Iterable[tuple[int, list[int]]]) -> None:
+        """
+        Возвращает в выдачу пересчитанные списки устаревших пользователей
+
+        Args:
+            recommendations: Пары (id пользователя, top_n рекомендованных фильмов)
+        """
+        for user_id, movie_ids in recommendations:
+            if user_id in self._stale:
+                self._stale.discard(user_id)
+                self._refreshed[user_id] = movie_ids
+
+    def stats(self) -> MaterializationStats:
+        return MaterializationStats(
+            users=len(self._positions),
+            top_n=self.top_n,
+            stale_users=len(self._stale),
+            built_at=self.built_at,
+            duration=self.duration,
+            age=time.time() - self.built_at,
+        )
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -0,0 +1,63 @@
+from collections.abc import AsyncIterator, Sequence
+
+from src.domain.entities.movie_lens.raitings import Rating, RatingRecord
+from src.domain.interfaces.rating_event_log import IRatingEventLog
+from src.domain.interfaces.recommender import IRecommender
+
+
+class PopularityRecommender(IRecommender):
+    """Рекомендатель самых популярных фильмов на время прогрева модели.
+
+    Всем пользователям отдаётся один и тот же список фильмов по убыванию
+    количества оценок. Список считается одним запросом к БД, поэтому
+    рекомендатель готов почти сразу после старта, пока основная модель
+    собирается в фоне.
+
+    Новые рейтинги только дописываются в журнал событий: список
+    популярности не меняется, а основная модель применит их при подмене.
+    """
+
+    def __init__(
+        self,
+        movie_ids: Sequence[int] | None = None,
+        event_log: IRatingEventLog | None = None,
+    ) -> None:
+        """
+        Args:
+            movie_ids: Фильмы по убыванию популярности. None — список ещё
+                не посчитан: рекомендатель только пишет рейтинги в журнал,
+                а ready остаётся False
+            event_log: Журнал, в который пишутся онлайн-обновления
+        """
+        self.movie_ids: list[int] = list(movie_ids or ())
+        self.ready: bool = movie_ids is not None
+        self.event_log: IRatingEventLog | None = event_log
+
+    async def recommend_for_user(self, user_id: int, top_n: int = 10) -> list[int]:
+        return self.movie_ids[:top_n]
+
+    async def recommend_for_users(
+        self, requests: Sequence[tuple[int, int]]
+    ) -> AsyncIterator[tuple[int, list[int]]]:
+        for user_id, top_n in requests:
+            yield user_id, self.movie_ids[:top_n]
+
+    async def materialize(self, top_n: int, workers: int = 1) -> None:
+        return None
+
+    def catch_up(self) -> int:
+        return 0
+
+    async def update_for_rating(self, rating: Rating) -> None:
+        await self.update_for_record(
+            RatingRecord(
+                user_id=rating.user.id,
+                movie_id=rating.movie.id,
+                rating=rating.rating,
+                timestamp=rating.timestamp,
+            )
+        )
+
+    async def update_for_record(self, record: RatingRecord) -> None:
+        if self.event_log is not None:
+            self.event_log.append(record)
@@ -0,0 +1,168 @@
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Счётчики кеша рекомендаций."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+
+
+class RecommendationCache:
+    """Ограниченный LRU/TTL-кеш готовых рекомендаций.
+
+    Ключ — пара (user_id, top_n). Записи вытесняются по давности
+    использования, когда их больше max_entries, и считаются устаревшими
+    через ttl секунд после записи. Для точечной инвалидации хранится
+    индекс user_id → {top_n}, а отдельно — пользователи, получившие
+    рекомендации по популярности: их ответ зависит не от матрицы сходства,
+    а от рейтинга популярности.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_entries: Максимальное количество хранимых записей
+            ttl: Время жизни записи в секундах
+            clock: Источник монотонного времени
+        """
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self._clock: Callable[[], float] = clock
+
+        self._entries: OrderedDict[tuple[int, int], tuple[float, list[int]]] = (
+            OrderedDict()
+        )
+        self._keys_by_user: dict[int, set[int]] = defaultdict(set)
+        self._cold_users: set[int] = set()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, user_id: int, top_n: int) -> list[int] | None:
+        """
+        Возвращает рекомендации из кеша
+
+        Returns:
+            Копия сохранённого списка или None, если записи нет или она устарела
+        """
+        key: tuple[int, int] = (user_id, top_n)
+        entry: tuple[float, list[int]] | None = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry[1])
+
+    def peek(self, user_id: int) -> list[tuple[int, list[int]]]:
+        """
+        Возвращает действующие записи пользователя, не считая их обращением
+
+        Returns:
+            Пары (top_n, рекомендованные фильмы)
+        """
+        now: float = self._clock()
+        entries: list[tuple[int, list[int]]] = []
+        for top_n in self._keys_by_user.get(user_id, ()):
+            expiry, movie_ids = self._entries[(user_id, top_n)]
+            if expiry > now:
+                entries.append((top_n, movie_ids))
+
+        return entries
+
+    def put(
+        self, user_id: int, top_n: int, movie_ids: list[int], cold: bool = False
+    ) -> None:
+        """
+        Сохраняет рекомендации пользователя
+
+        Args:
+            user_id: Идентификатор пользователя
+            top_n: Запрошенное количество фильмов
+            movie_ids: Рекомендованные фильмы
+            cold: Рекомендации построены по популярности (у пользователя нет оценок)
+        """
+        if self.max_entries <= 0:
+            return
+
+        key: tuple[int, int] = (user_id, top_n)
+        self._entries[key] = (self._clock() + self.ttl, list(movie_ids))
+        self._entries.move_to_end(key)
+        self._keys_by_user[user_id].add(top_n)
+        if cold:
+            self._cold_users.add(user_id)
+
+        while len(self._entries) > self.max_entries:
+            oldest: tuple[int, int] = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> int:
+        """
+        Удаляет все записи указанных пользователей
+
+        Returns:
+            Количество удалённых записей
+        """
+        removed: int = 0
+        for user_id in user_ids:
+            for top_n in self._keys_by_user.pop(user_id, ()):
+                del self._entries[(user_id, top_n)]
+                removed += 1
+            self._cold_users.discard(user_id)
+
+        return removed
+
+    def invalidate_cold(self) -> int:
+        """
+        Удаляет записи пользователей, получивших рекомендации по популярности
+
+        Returns:
+            Количество удалённых записей
+        """
+        return self.invalidate_users(list(self._cold_users))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self._cold_users.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+            max_entries=self.max_entries,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: tuple[int, int]) -> None:
+        user_id, top_n = key
+        del self._entries[key]
+
+        top_ns: set[int] | None = self._keys_by_user.get(user_id)
+        if top_ns is not None:
+            top_ns.discard(top_n)
+            if not top_ns:
+                del self._keys_by_user[user_id]
+                self._cold_users.discard(user_id)
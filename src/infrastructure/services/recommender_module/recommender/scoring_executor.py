@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from src.infrastructure.exceptions.recommender import ScoringTimeoutError
+
+T = TypeVar("T")
+
+
+class ReadWriteLock:
+    """Блокировка с общим чтением и исключительной записью.
+
+    Пишущий получает приоритет: пока он ждёт, новые читатели не входят.
+    Владелец блокировки не отслеживается, поэтому запись можно захватить
+    в одном потоке, а отпустить в другом.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers: int = 0
+        self._writer: bool = False
+        self._waiting_writers: int = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class ScoringExecutor:
+    """Пул потоков для расчёта рекомендаций вне цикла событий.
+
+    Расчёт выполняется в потоке под общей блокировкой чтения модели.
+    Онлайн-обновления захватывают блокировку записи: write выполняет
+    изменение в отдельном потоке, а acquire_write только дожидается
+    блокировки в потоке, оставляя само изменение циклу событий. Расчёт
+    никогда не видит модель в середине изменения.
+
+    Одновременно принимается не больше max_concurrency расчётов, считая
+    ожидающие свободного потока. Если запрос не дождался места или результата
+    за timeout секунд, выбрасывается ScoringTimeoutError. Начатый расчёт
+    при этом доводится до конца в потоке и только потом освобождает место.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        max_concurrency: int = 32,
+        timeout: float | None = 2.0,
+    ) -> None:
+        """
+        Args:
+            workers: Количество потоков расчёта
+            max_concurrency: Максимальное количество принятых расчётов
+            timeout: Время ожидания результата в секундах (None — без ограничения)
+        """
+        self.workers: int = workers
+        self.max_concurrency: int = max_concurrency
+        self.timeout: float | None = timeout
+
+        self.lock: ReadWriteLock = ReadWriteLock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="scoring"
+        )
+        self._slots: asyncio.Semaphore | None = None
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """
+        Выполняет расчёт в пуле под блокировкой чтения модели
+
+        Raises:
+            ScoringTimeoutError: Расчёт не завершился за timeout
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        slots: asyncio.Semaphore = self._slots
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                await slots.acquire()
+                future: Future[T] = self._executor.submit(self._read, function, *args)
+                future.add_done_callback(
+                    lambda _: loop.call_soon_threadsafe(slots.release)
+                )
+                return await asyncio.wrap_future(future)
+        except TimeoutError as e:
+            raise ScoringTimeoutError(
+                f"Расчёт рекомендаций не уложился в {self.timeout} с"
+            ) from e
+
+    async def acquire_write(self) -> None:
+        """Дожидается в отдельном потоке, пока модель можно менять."""
+        waiting = asyncio.ensure_future(asyncio.to_thread(self.lock.acquire_write))
+        try:
+            await asyncio.shield(waiting)
+        except asyncio.CancelledError:
+            # Поток всё равно захватит блокировку — отпускаем её сразу,
+            # иначе модель останется закрытой для чтения навсегда
+            waiting.add_done_callback(lambda _: self.lock.release_write())
+            raise
+
+    def release_write(self) -> None:
+        self.lock.release_write()
+
+    async def read(self, function: Callable[..., T], *args) -> T:
+        """
+        Выполняет чтение модели в отдельном потоке под блокировкой чтения
+
+        В отличие от run, не занимает место в пуле расчёта и не ограничено
+        по времени: так читают модель долгие фоновые операции
+        """
+        return await asyncio.to_thread(self._read, function, *args)
+
+    async def write(self, function: Callable[..., T], *args) -> T:
+        """
+        Выполняет изменение модели в отдельном потоке под блокировкой записи
+
+        Начатое изменение доводится до конца, даже если ожидание отменено
+        """
+        return await asyncio.shield(asyncio.to_thread(self._write, function, *args))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read(self, function: Callable[..., T], *args) -> T:
+        self.lock.acquire_read()
+        try:
+            return function(*args)
+        finally:
+            self.lock.release_read()
+
+    def _write(self, function: Callable[..., T], *args) -> T:
+        self.lock.acquire_write()
+        try:
+            return function(*args)
+        finally:
+            self.lock.release_write()
@@ -1,18 +1,66 @@
+import asyncio
+import logging
+from dataclasses import asdict
+from collections.abc import AsyncIterable
 from typing import Callable, Awaitable
 
+from src.domain.entities.dataset_fingerprint import DatasetFingerprint
 from src.domain.entities.movie_lens.movie import Movie
-from src.domain.entities.movie_lens.raitings import Rating
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.domain.interfaces.rating_event_log import IRatingEventLog
 from src.domain.interfaces.recommender import IRecommenderBuilder, IRecommender
-from src.domain.interfaces.similarity_cache import ISimilarityCache
+from src.domain.interfaces.similarity_builder import ISimilarityMatrixBuilder
+from src.domain.interfaces.similarity_cache import ISimilarityCache, RecommenderState
+from src.infrastructure.services.metrics import registry
+from src.infrastructure.services.recommender_module.factorization.als import (
+    ALSParams,
+    ALSTrainer,
+    LatentFactors,
+)
+from src.infrastructure.services.recommender_module.recommender.als_recommender import (
+    ALSRecommender,
+)
 from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
     ItemBasedCFRecommender,
 )
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
+from src.infrastructure.services.recommender_module.recommender.scoring_executor import (
+    ScoringExecutor,
+)
 from src.infrastructure.services.recommender_module.similarity.builder import (
     SimilarityMatrixBuilder,
 )
+from src.infrastructure.services.recommender_module.similarity.lsh_builder import (
+    LSHParams,
+    LSHSimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.statistics import (
+    CosineStatistics,
+)
+from src.infrastructure.services.recommender_module.similarity.sparse_builder import (
+    SparseSimilarityMatrixBuilder,
+)
 from src.infrastructure.services.recommender_module.storage.ratings_storage import (
     RatingsStorage,
 )
+from src.shared.types.recommender import (
+    PopularityScore,
+    RecommenderModel,
+    SimilarityEngine,
+)
+
+logger = logging.getLogger(__name__)
+
+build_stage_seconds = registry.histogram(
+    "recommender_build_stage_seconds",
+    "Длительность этапов сборки рекомендателя",
+    ("stage",),
+)
 
 
 class RecommenderService(IRecommenderBuilder):
@@ -20,40 +68,385 @@ class RecommenderService(IRecommenderBuilder):
     Сервис, собирающий весь pipeline:
     - загрузка данных
     - кэширование
-    - построение матрицы
+    - построение матрицы сходства или обучение скрытых векторов (ALS)
     - создание рекомендателя
+    - применение журнала рейтингов поверх снимка
+    - материализация top-N рекомендаций всех пользователей
+
+    Снимок в кеше хранит номер последнего учтённого события журнала
+    и отпечаток рейтингов БД. При старте снимок с устаревшим отпечатком
+    отбрасывается. К актуальному применяются рейтинги БД с id больше
+    max_id снимка — журнал мог потерять их, если процесс упал между записью
+    в БД и в журнал, — а затем события журнала после номера, зафиксированного
+    до чтения этих рейтингов.
+    При полной пересборке БД считается источником истины: номер события
+    журнала фиксируется до отпечатка, рейтинги читаются только до max_id
+    отпечатка, а всё, что записано позже, применяется из журнала. Так сборка
+    видит согласованный срез, даже если рейтинги пишутся во время неё.
+
+    Модель ALS не сохраняется в кеш: векторы обучаются по БД при каждой
+    сборке, что быстрее построения матрицы сходства.
     """
 
-    def __init__(self, cache: ISimilarityCache | None = None):
+    def __init__(
+        self,
+        cache: ISimilarityCache | None = None,
+        model: RecommenderModel = RecommenderModel.ITEM_CF,
+        engine: SimilarityEngine = SimilarityEngine.SPARSE,
+        popularity_score: PopularityScore = PopularityScore.COUNT,
+        neighbor_policy: NeighborPolicy = NeighborPolicy(),
+        incremental_updates: bool = True,
+        build_workers: int = 1,
+        lsh_params: LSHParams = LSHParams(),
+        als_params: ALSParams = ALSParams(),
+        event_log: IRatingEventLog | None = None,
+        result_cache_factory: Callable[[], RecommendationCache] | None = None,
+        materialize_top_n: int = 0,
+        materialize_workers: int = 1,
+        materialize_refresh_delay: float | None = None,
+        scoring_executor: ScoringExecutor | None = None,
+    ):
+        """
+        Args:
+            cache: Кэш состояния рекомендателя (используется моделью ITEM_CF)
+            model: Модель рекомендаций
+            engine: Способ построения матрицы сходства фильмов
+            popularity_score: Способ ранжирования фильмов для пользователей без оценок
+            neighbor_policy: Правило отбора соседей в матрице сходства
+            incremental_updates: Поддерживать нормы и скалярные произведения
+                векторов фильмов для быстрого онлайн-обновления сходства.
+                С движком LSH не используется: статистики — это точное
+                произведение Rᵀ·R по всем парам, которого LSH избегает
+            build_workers: Количество процессов для построения матрицы сходства
+                (используется движком SPARSE)
+            lsh_params: Параметры LSH-индекса (используются движком LSH)
+            als_params: Параметры матричной факторизации (используются
+                моделью ALS)
+            event_log: Журнал онлайн-обновлений рейтингов
+            result_cache_factory: Функция, создающая кеш готовых рекомендаций
+                для отдельных пользователей. Каждая собранная модель получает
+                свой кеш: расчёт, начатый на старой модели, не может положить
+                результат в кеш новой
+            materialize_top_n: Сколько рекомендаций заранее посчитать для каждого
+                пользователя после построения (0 — не материализовать)
+            materialize_workers: Количество потоков для материализации
+            materialize_refresh_delay: Через сколько секунд после онлайн-обновления
+                пересчитывать устаревших пользователей материализованной
+                таблицы (None — не пересчитывать; используется моделью ITEM_CF)
+            scoring_executor: Пул потоков для расчёта рекомендаций вне цикла
+                событий (None — считать в цикле событий)
+        """
         self.cache = cache
+        self.model = model
+        self.engine = engine
+        self.popularity_score = popularity_score
+        self.neighbor_policy = neighbor_policy
+        self.incremental_updates = incremental_updates
+        if incremental_updates and engine == SimilarityEngine.LSH:
+            logger.warning(
+                "Статистики онлайн-обновлений отключены: движок LSH не считает "
+                "все пары фильмов"
+            )
+            self.incremental_updates = False
+        self.build_workers = build_workers
+        self.lsh_params = lsh_params
+        self.als_params = als_params
+        self.event_log = event_log
+        self.result_cache_factory = result_cache_factory
+        self.materialize_top_n = materialize_top_n
+        self.materialize_workers = materialize_workers
+        self.materialize_refresh_delay = materialize_refresh_delay
+        self.scoring_executor = scoring_executor
 
     async def build(
         self,
-        ratings_loader: Callable[[], Awaitable[list[Rating]]],
+        ratings_loader: Callable[
+            [int | None, int | None], AsyncIterable[list[RatingRecord]]
+        ],
         movies_loader: Callable[[], Awaitable[list[Movie]]],
+        fingerprint_loader: (
+            Callable[[int | None], Awaitable[DatasetFingerprint]] | None
+        ) = None,
+        rebuild: bool = False,
     ) -> IRecommender:
-        storage = RatingsStorage()
+        if self.model == RecommenderModel.ALS:
+            recommender: ItemBasedCFRecommender | ALSRecommender = (
+                await self._build_als(ratings_loader, fingerprint_loader)
+            )
+        else:
+            recommender = await self._build_item_cf(
+                ratings_loader, movies_loader, fingerprint_loader, rebuild
+            )
+
+        sequence: int = recommender.sequence
+        replayed: int = recommender.catch_up()
+        if replayed:
+            logger.info(
+                "Применено %s событий журнала рейтингов после №%s",
+                replayed,
+                sequence,
+            )
+
+        if self.materialize_top_n > 0:
+            with build_stage_seconds.labels("materialize").timer():
+                await recommender.materialize(
+                    self.materialize_top_n, self.materialize_workers
+                )
+            logger.info(
+                "Материализованы рекомендации %s пользователей (top-%s) за %.2f с",
+                len(recommender.materialized),
+                self.materialize_top_n,
+                recommender.materialized.duration,
+            )
+
+        return recommender
+
+    async def _build_item_cf(
+        self,
+        ratings_loader: Callable[
+            [int | None, int | None], AsyncIterable[list[RatingRecord]]
+        ],
+        movies_loader: Callable[[], Awaitable[list[Movie]]],
+        fingerprint_loader: (
+            Callable[[int | None], Awaitable[DatasetFingerprint]] | None
+        ),
+        rebuild: bool,
+    ) -> ItemBasedCFRecommender:
+        """Собирает item-based рекомендатель из снимка или по БД."""
+        storage = RatingsStorage(popularity_score=self.popularity_score)
         sim_matrix = None
+        statistics: CosineStatistics | None = None
+        sequence: int = 0
 
-        if self.cache:
-            state: dict[int, dict[int, float]] | None = await self.cache.load()
-            if state:
-                storage.set_users(state["user_ratings"])
+        tail: list[RatingRecord] = []
+
+        if self.cache and not rebuild:
+            with build_stage_seconds.labels("snapshot_load").timer():
+                state: RecommenderState | None = await self.cache.load()
+            if state and await self._is_fresh(state, fingerprint_loader):
+                storage.set_users(state["user_ratings"], state.get("movie_ratings"))
                 sim_matrix = state["similarity_matrix"]
+                sequence = state.get("sequence", 0)
+                if self.incremental_updates and "statistics_dots" in state:
+                    statistics = CosineStatistics(
+                        state["statistics_norms"], state["statistics_dots"]
+                    )
+                if fingerprint_loader is not None:
+                    sequence, tail = await self._load_tail(
+                        state, ratings_loader, fingerprint_loader
+                    )
 
         if sim_matrix is None:
-            ratings: list[Rating] = await ratings_loader()
+            sequence, fingerprint = await self._load_ratings(
+                storage, ratings_loader, fingerprint_loader
+            )
+
             movies: list[Movie] = await movies_loader()
+            builder: ISimilarityMatrixBuilder = self._create_builder()
+            with build_stage_seconds.labels("similarity_build").timer():
+                sim_matrix: dict[int, dict[int, float]] = await asyncio.to_thread(
+                    builder.build, storage.users, movies
+                )
 
-            storage.fill(ratings)
-            builder = SimilarityMatrixBuilder()
-            sim_matrix: dict[int, dict[int, float]] = builder.build(
-                storage.users, movies
-            )
+            statistics = await self._compute_statistics(storage)
 
             if self.cache:
-                await self.cache.save(
-                    {"user_ratings": storage.users, "similarity_matrix": sim_matrix}
-                )
+                snapshot: RecommenderState = {
+                    "user_ratings": storage.users,
+                    "movie_ratings": storage.movies,
+                    "similarity_matrix": sim_matrix,
+                    "sequence": sequence,
+                }
+                if fingerprint is not None:
+                    snapshot["fingerprint"] = asdict(fingerprint)
+                if statistics is not None:
+                    snapshot["statistics_norms"] = statistics.norms
+                    snapshot["statistics_dots"] = statistics.dots
+
+                with build_stage_seconds.labels("snapshot_save").timer():
+                    await self.cache.save(snapshot)
+
+                # События до номера снимка есть в БД и в самом снимке
+                if self.event_log is not None:
+                    await asyncio.to_thread(self.event_log.compact, sequence)
 
-        return ItemBasedCFRecommender(sim_matrix, storage)
+        # Снимок прежнего формата не содержит статистик
+        if statistics is None:
+            statistics = await self._compute_statistics(storage)
+
+        recommender = ItemBasedCFRecommender(
+            sim_matrix,
+            storage,
+            self.neighbor_policy,
+            statistics,
+            event_log=self.event_log,
+            sequence=sequence,
+            result_cache=self._create_result_cache(),
+            scoring_executor=self.scoring_executor,
+            refresh_delay=self.materialize_refresh_delay,
+        )
+
+        if tail:
+            recommender.replay((sequence, record) for record in tail)
+            logger.info(
+                "Применено %s рейтингов БД, добавленных после снимка", len(tail)
+            )
+
+        return recommender
+
+    async def _compute_statistics(
+        self, storage: RatingsStorage
+    ) -> CosineStatistics | None:
+        """Считает статистики косинуса, если включены онлайн-обновления."""
+        if not self.incremental_updates:
+            return None
+
+        with build_stage_seconds.labels("statistics").timer():
+            return await asyncio.to_thread(
+                CosineStatistics.from_ratings, storage.movies
+            )
+
+    async def _load_tail(
+        self,
+        state: RecommenderState,
+        ratings_loader: Callable[
+            [int | None, int | None], AsyncIterable[list[RatingRecord]]
+        ],
+        fingerprint_loader: Callable[[int | None], Awaitable[DatasetFingerprint]],
+    ) -> tuple[int, list[RatingRecord]]:
+        """
+        Читает рейтинги БД, добавленные после снимка
+
+        Номер события журнала фиксируется до чтения: рейтинг попадает
+        в журнал только после записи в БД, поэтому все события до этого
+        номера уже есть среди прочитанных рейтингов или в самом снимке
+
+        Returns:
+            Номер события журнала, с которого применять журнал,
+            и рейтинги с id больше max_id снимка
+        """
+        sequence: int = (
+            self.event_log.last_sequence if self.event_log else state.get("sequence", 0)
+        )
+        current: DatasetFingerprint = await fingerprint_loader(None)
+
+        tail: list[RatingRecord] = []
+        after_id: int = state["fingerprint"]["max_id"]
+        if current.max_id > after_id:
+            with build_stage_seconds.labels("ratings_load").timer():
+                async for records in ratings_loader(current.max_id, after_id):
+                    tail.extend(records)
+
+        return sequence, tail
+
+    async def _build_als(
+        self,
+        ratings_loader: Callable[
+            [int | None, int | None], AsyncIterable[list[RatingRecord]]
+        ],
+        fingerprint_loader: (
+            Callable[[int | None], Awaitable[DatasetFingerprint]] | None
+        ),
+    ) -> ALSRecommender:
+        """Обучает векторы ALS по рейтингам БД."""
+        storage = RatingsStorage(popularity_score=self.popularity_score)
+        sequence, _ = await self._load_ratings(
+            storage, ratings_loader, fingerprint_loader
+        )
+
+        trainer = ALSTrainer(self.als_params)
+        with build_stage_seconds.labels("als_fit").timer():
+            factors: LatentFactors = await asyncio.to_thread(
+                trainer.train, storage.users
+            )
+
+        return ALSRecommender(
+            factors,
+            storage,
+            self.als_params,
+            event_log=self.event_log,
+            sequence=sequence,
+            result_cache=self._create_result_cache(),
+            scoring_executor=self.scoring_executor,
+        )
+
+    async def _load_ratings(
+        self,
+        storage: RatingsStorage,
+        ratings_loader: Callable[
+            [int | None, int | None], AsyncIterable[list[RatingRecord]]
+        ],
+        fingerprint_loader: (
+            Callable[[int | None], Awaitable[DatasetFingerprint]] | None
+        ),
+    ) -> tuple[int, DatasetFingerprint | None]:
+        """
+        Загружает рейтинги БД в хранилище
+
+        Номер события журнала фиксируется до отпечатка, поэтому рейтинги,
+        записанные во время загрузки, применятся из журнала
+
+        Returns:
+            Номер последнего события журнала и отпечаток загруженных рейтингов
+        """
+        sequence: int = self.event_log.last_sequence if self.event_log else 0
+        fingerprint: DatasetFingerprint | None = (
+            await fingerprint_loader(None) if fingerprint_loader else None
+        )
+
+        with build_stage_seconds.labels("ratings_load").timer():
+            async for records in ratings_loader(
+                fingerprint.max_id if fingerprint else None, None
+            ):
+                await asyncio.to_thread(storage.extend, records)
+            await asyncio.to_thread(storage.rebuild_popularity)
+
+        return sequence, fingerprint
+
+    @staticmethod
+    async def _is_fresh(
+        state: RecommenderState,
+        fingerprint_loader: (
+            Callable[[int | None], Awaitable[DatasetFingerprint]] | None
+        ),
+    ) -> bool:
+        """Проверяет, что снимок построен по текущим рейтингам БД."""
+        if fingerprint_loader is None:
+            return True
+
+        expected: dict[str, int] | None = state.get("fingerprint")
+        if expected is None:
+            logger.warning("Снимок рекомендателя пропущен: в нём нет отпечатка БД")
+            return False
+
+        actual: DatasetFingerprint = await fingerprint_loader(expected["max_id"])
+        if asdict(actual) != expected:
+            logger.warning(
+                "Снимок рекомендателя пропущен: рейтинги в БД изменились (%s → %s)",
+                expected,
+                asdict(actual),
+            )
+            return False
+
+        return True
+
+    def _create_result_cache(self) -> RecommendationCache | None:
+        """Создаёт пустой кеш рекомендаций для новой модели."""
+        if self.result_cache_factory is None:
+            return None
+
+        return self.result_cache_factory()
+
+    def _create_builder(self) -> ISimilarityMatrixBuilder:
+        """Создаёт построитель матрицы сходства для выбранного движка."""
+        match self.engine:
+            case SimilarityEngine.PYTHON:
+                return SimilarityMatrixBuilder(neighbor_policy=self.neighbor_policy)
+            case SimilarityEngine.LSH:
+                return LSHSimilarityMatrixBuilder(
+                    neighbor_policy=self.neighbor_policy, params=self.lsh_params
+                )
+            case _:
+                return SparseSimilarityMatrixBuilder(
+                    neighbor_policy=self.neighbor_policy, workers=self.build_workers
+                )
@@ -2,10 +2,12 @@ from collections import defaultdict
 from typing import Callable
 
 from src.domain.entities.movie_lens.movie import Movie
+from src.domain.interfaces.similarity_builder import ISimilarityMatrixBuilder
 from .cosine import CosineSimilarity
+from .neighbors import NeighborPolicy
 
 
-class SimilarityMatrixBuilder:
+class SimilarityMatrixBuilder(ISimilarityMatrixBuilder):
     """Строит матрицу сходства фильмов на основе пользовательских рейтингов.
 
     Класс формирует векторы фильмов вида movie_id → {user_id → rating}
@@ -17,8 +19,10 @@ class SimilarityMatrixBuilder:
         similarity_function: Callable[
             [dict[int, int], dict[int, int]], float
         ] = CosineSimilarity.calculate,
+        neighbor_policy: NeighborPolicy = NeighborPolicy(),
     ) -> None:
         self.similarity_function = similarity_function
+        self.neighbor_policy = neighbor_policy
 
     def build(
         self,
@@ -29,7 +33,8 @@ class SimilarityMatrixBuilder:
 
         Создаёт структуру вида movie_id → {other_movie_id → similarity}.
         Сходство вычисляется только для тех фильмов, по которым есть рейтинги.
-        Пары с нулевым сходством не сохраняются.
+        Пары со сходством не выше порога neighbor_policy не сохраняются, а если
+        задан max_neighbors, для каждого фильма остаются только K самых похожих.
 
         Args:
             user_ratings: Словарь пользовательских оценок,
@@ -57,8 +62,12 @@ class SimilarityMatrixBuilder:
 
                 sim = self.similarity_function(v1, v2)
 
-                if sim > 0:
+                if self.neighbor_policy.accepts(sim):
                     matrix[m1][m2] = sim
                     matrix[m2][m1] = sim
 
+        if self.neighbor_policy.max_neighbors is not None:
+            for movie_id, row in matrix.items():
+                matrix[movie_id] = self.neighbor_policy.prune(row)
+
         return matrix
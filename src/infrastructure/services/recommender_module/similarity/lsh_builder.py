@@ -0,0 +1,334 @@
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.interfaces.similarity_builder import ISimilarityMatrixBuilder
+from .neighbors import NeighborPolicy
+from .sparse_builder import SparseSimilarityMatrixBuilder, select_neighbors
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class LSHParams:
+    """Параметры LSH-индекса фильмов для приближённого построения матрицы.
+
+    Сигнатура фильма — bands × rows бит SimHash: знаки проекций вектора
+    оценок на случайные гиперплоскости. Пара становится кандидатом, если
+    хотя бы в одной полосе совпали все rows бит. Больше bands — выше полнота
+    и больше пар для точного расчёта, больше rows — наоборот.
+
+    Attributes:
+        bands: Количество полос сигнатуры (независимых хеш-таблиц)
+        rows: Количество бит SimHash в ключе одной полосы
+        seed: Зерно генератора случайных гиперплоскостей
+        max_bucket_size: Корзины, в которые попало больше фильмов, не дают
+            кандидатов. None — не ограничивать
+        exact_density: Доля пар-кандидатов в блоке фильмов, начиная с которой
+            блок считается точно целиком. 1.0 — считать только кандидатов
+    """
+
+    bands: int = 32
+    rows: int = 8
+    seed: int = 0
+    max_bucket_size: int | None = None
+    exact_density: float = 0.05
+
+
+class LSHSimilarityMatrixBuilder(ISimilarityMatrixBuilder):
+    """Приближённо строит матрицу сходства фильмов через LSH (SimHash).
+
+    Вместо произведения всех пар фильмов векторы оценок раскладываются
+    по корзинам LSH, а косинусное сходство считается точно только для пар,
+    попавших в одну корзину хотя бы в одной полосе. Сходство найденных пар
+    совпадает с SparseSimilarityMatrixBuilder, но часть соседей может быть
+    пропущена: полнота задаётся LSHParams.
+
+    Точный расчёт отдельной пары дороже, чем пара в общем разреженном
+    произведении, поэтому блок фильмов, в котором доля кандидатов больше
+    exact_density, считается произведением целиком — так же точно,
+    как SparseSimilarityMatrixBuilder.
+
+    Результат имеет ту же структуру {movie_id: {other_movie_id: similarity}}
+    и так же отбирается по neighbor_policy.
+    """
+
+    # Сколько чисел float64 занимают проекции одной группы полос
+    _PROJECTION_BUDGET: int = 1 << 22
+    # Сколько значений оценок обрабатывается за одно сравнение группы пар
+    _PAIR_BUDGET: int = 1 << 20
+    # Сколько фильмов обрабатывается за один поиск кандидатов
+    _BLOCK_SIZE: int = 1024
+
+    def __init__(
+        self,
+        neighbor_policy: NeighborPolicy = NeighborPolicy(),
+        params: LSHParams = LSHParams(),
+    ) -> None:
+        """
+        Args:
+            neighbor_policy: Правило отбора соседей фильма
+            params: Параметры LSH-индекса
+        """
+        self.neighbor_policy = neighbor_policy
+        self.params = params
+
+    def build(
+        self,
+        user_ratings: dict[int, dict[int, int]],
+        movies: list[Movie],
+    ) -> dict[int, dict[int, float]]:
+        """Строит матрицу сходства фильмов по парам-кандидатам LSH.
+
+        Args:
+            user_ratings: Словарь пользовательских оценок,
+                структура user_id → {movie_id → rating}.
+            movies: Список всех фильмов.
+
+        Returns:
+            Матрица сходства фильмов вида:
+                {movie_id: {other_movie_id: similarity}}.
+        """
+        movie_ids: list[int] = [movie.id for movie in movies]
+        normalized: sparse.csc_matrix = (
+            SparseSimilarityMatrixBuilder._normalized_matrix(user_ratings, movie_ids)
+        )
+        vectors: sparse.csr_matrix = normalized.T.tocsr()
+
+        lefts: list[np.ndarray] = []
+        rights: list[np.ndarray] = []
+        values: list[np.ndarray] = []
+        computed: int = 0
+
+        for block, later, left, right in self.candidate_pairs(normalized):
+            # Пары фильма блока со всеми фильмами после него
+            possible: int = len(block) * len(later) - len(block) * (len(block) + 1) // 2
+            if len(left) > self.params.exact_density * possible:
+                left, right, similarity = self._block_similarities(
+                    normalized, block, later
+                )
+                computed += possible
+            else:
+                similarity = self._pair_similarities(vectors, left, right)
+                computed += len(left)
+
+            keep = similarity > self.neighbor_policy.min_similarity
+
+            lefts.append(left[keep])
+            rights.append(right[keep])
+            values.append(similarity[keep])
+
+        rated: int = int(np.count_nonzero(np.diff(normalized.indptr)))
+        logger.info(
+            "LSH: точное сходство посчитано для %s из %s пар фильмов",
+            computed,
+            rated * (rated - 1) // 2,
+        )
+
+        left = np.concatenate([np.empty(0, dtype=np.int64), *lefts])
+        right = np.concatenate([np.empty(0, dtype=np.int64), *rights])
+        data = np.concatenate([np.empty(0, dtype=np.float64), *values])
+
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate((data, data)),
+                (np.concatenate((left, right)), np.concatenate((right, left))),
+            ),
+            shape=(len(movie_ids), len(movie_ids)),
+        )
+        matrix.sort_indices()
+
+        return SparseSimilarityMatrixBuilder._to_dict(
+            [(0, select_neighbors(matrix, self.neighbor_policy))], movie_ids
+        )
+
+    def candidate_pairs(
+        self, normalized: sparse.csc_matrix
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Перечисляет пары фильмов, совпавшие хотя бы в одной полосе сигнатуры
+
+        Фильмы без оценок в кандидаты не попадают: их сходство всегда 0.
+
+        Args:
+            normalized: Матрица user × movie с нормированными по L2 столбцами
+
+        Returns:
+            Блоки вида (индексы фильмов блока, индексы фильмов с оценками
+            начиная с первого фильма блока, индексы левых фильмов пар,
+            индексы правых фильмов пар). Левый фильм пары входит в блок,
+            правый идёт после него, каждая пара встречается один раз
+        """
+        rated = np.flatnonzero(np.diff(normalized.indptr))
+        if len(rated) < 2:
+            return
+
+        buckets: sparse.csr_matrix = self._bucket_matrix(
+            self._band_keys(normalized[:, rated])
+        )
+
+        for start in range(0, len(rated), self._BLOCK_SIZE):
+            end: int = min(start + self._BLOCK_SIZE, len(rated))
+            # Столбцы произведения сдвинуты на start: пары с фильмами раньше
+            # блока уже перечислены при обработке предыдущих блоков
+            collisions = (buckets[start:end] @ buckets[start:].T.tocsr()).tocoo()
+            upper = collisions.col > collisions.row
+
+            yield (
+                rated[start:end],
+                rated[start:],
+                rated[collisions.row[upper] + start],
+                rated[collisions.col[upper] + start],
+            )
+
+    def _band_keys(self, normalized: sparse.csc_matrix) -> np.ndarray:
+        """
+        Считает ключи полос SimHash для всех фильмов
+
+        Векторы оценок неотрицательны и лежат в узком конусе, поэтому
+        гиперплоскости проводятся через центр векторов фильмов, а не через
+        начало координат: так биты делят каталог примерно пополам и лучше
+        отличают близкие фильмы от далёких.
+
+        Args:
+            normalized: Матрица user × movie с нормированными по L2 столбцами
+
+        Returns:
+            Матрица movie × bands, в которой каждый ключ — rows бит
+            знаков проекций, упакованных в целое число
+        """
+        users, size = normalized.shape
+        bands, rows = self.params.bands, self.params.rows
+
+        rng = np.random.default_rng(self.params.seed)
+        weights = np.left_shift(1, np.arange(rows, dtype=np.int64))
+        vectors: sparse.csr_matrix = normalized.T.tocsr()
+        centroid = np.asarray(normalized.mean(axis=1)).ravel()
+
+        keys = np.empty((size, bands), dtype=np.int64)
+        step: int = max(1, self._PROJECTION_BUDGET // (max(users, size) * rows))
+        for start in range(0, bands, step):
+            count: int = min(step, bands - start)
+            planes = rng.standard_normal((users, count * rows))
+            bits = np.asarray(vectors @ planes) > centroid @ planes
+            keys[:, start : start + count] = bits.reshape(size, count, rows) @ weights
+
+        return keys
+
+    def _bucket_matrix(self, keys: np.ndarray) -> sparse.csr_matrix:
+        """
+        Раскладывает фильмы по корзинам всех полос
+
+        Корзины из одного фильма и корзины больше max_bucket_size
+        отбрасываются: первые не дают пар, вторые дают слишком много.
+
+        Args:
+            keys: Ключи полос вида movie × bands
+
+        Returns:
+            Разреженная матрица принадлежности movie × корзина, у которой
+            произведение на собственную транспонированную считает
+            количество общих корзин каждой пары фильмов
+        """
+        size, bands = keys.shape
+        columns = np.empty_like(keys)
+        sizes: list[np.ndarray] = []
+        offset: int = 0
+
+        for band in range(bands):
+            _, inverse, counts = np.unique(
+                keys[:, band], return_inverse=True, return_counts=True
+            )
+            columns[:, band] = inverse.ravel() + offset
+            sizes.append(counts)
+            offset += len(counts)
+
+        bucket_sizes = np.concatenate(sizes)[columns.ravel()]
+        keep = bucket_sizes > 1
+        if self.params.max_bucket_size is not None:
+            keep &= bucket_sizes <= self.params.max_bucket_size
+
+        matrix = sparse.csr_matrix(
+            (
+                keep.astype(np.int32),
+                columns.ravel(),
+                np.arange(0, size * bands + 1, bands),
+            ),
+            shape=(size, offset),
+        )
+        matrix.eliminate_zeros()
+        return matrix
+
+    @staticmethod
+    def _block_similarities(
+        normalized: sparse.csc_matrix, block: np.ndarray, later: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Считает точное сходство фильмов блока со всеми следующими фильмами
+
+        Args:
+            normalized: Матрица user × movie с нормированными по L2 столбцами
+            block: Индексы фильмов блока
+            later: Индексы фильмов с оценками начиная с первого фильма блока
+
+        Returns:
+            Пары с ненулевым сходством вида (индексы левых фильмов,
+            индексы правых фильмов, сходство), левый индекс меньше правого
+        """
+        product = (normalized[:, block].T @ normalized[:, later]).tocoo()
+        left, right = block[product.row], later[product.col]
+        upper = right > left
+        return left[upper], right[upper], product.data[upper]
+
+    def _pair_similarities(
+        self, vectors: sparse.csr_matrix, left: np.ndarray, right: np.ndarray
+    ) -> np.ndarray:
+        """
+        Считает точное косинусное сходство пар фильмов
+
+        Пары обрабатываются группами: векторы левых фильмов группы
+        разворачиваются в плотные строки, и сходство пары — сумма
+        произведений оценок правого фильма на значения плотной строки.
+        Группа ограничена _PAIR_BUDGET значениями плотных строк
+        и ненулевых оценок правых фильмов.
+
+        Args:
+            vectors: Матрица movie × user с нормированными по L2 строками
+            left: Индексы первых фильмов пар
+            right: Индексы вторых фильмов пар, у всех есть оценки
+
+        Returns:
+            Сходство каждой пары
+        """
+        similarity = np.zeros(len(left), dtype=np.float64)
+        if not len(left):
+            return similarity
+
+        users: int = vectors.shape[1]
+        new_left = np.concatenate(([True], left[1:] != left[:-1]))
+        cost = np.cumsum(np.diff(vectors.indptr)[right] + users * new_left)
+        bounds: list[int] = np.searchsorted(
+            cost, np.arange(self._PAIR_BUDGET, cost[-1], self._PAIR_BUDGET)
+        ).tolist()
+
+        for start, end in zip([0, *bounds], [*bounds, len(left)]):
+            if end <= start:
+                continue
+
+            rows, position = np.unique(left[start:end], return_inverse=True)
+            dense = vectors[rows].toarray()
+            others: sparse.csr_matrix = vectors[right[start:end]]
+
+            products = (
+                others.data
+                * dense[
+                    np.repeat(position.ravel(), np.diff(others.indptr)), others.indices
+                ]
+            )
+            similarity[start:end] = np.add.reduceat(products, others.indptr[:-1])
+
+        return similarity
@@ -0,0 +1,43 @@
+import heapq
+from dataclasses import dataclass
+from operator import itemgetter
+
+
+@dataclass(frozen=True, slots=True)
+class NeighborPolicy:
+    """Правило отбора соседей фильма в матрице сходства.
+
+    Attributes:
+        max_neighbors: Сколько самых похожих фильмов хранить для каждого фильма.
+            None — хранить всех соседей
+        min_similarity: Пары со сходством не выше этого порога не сохраняются
+    """
+
+    max_neighbors: int | None = None
+    min_similarity: float = 0.0
+
+    def accepts(self, similarity: float) -> bool:
+        """Проверяет, проходит ли сходство порог min_similarity."""
+        return similarity > self.min_similarity
+
+    def prune(self, row: dict[int, float]) -> dict[int, float]:
+        """
+        Оставляет в строке матрицы только подходящих соседей
+
+        Если задан max_neighbors, строка обрезается до K самых похожих фильмов
+        и упорядочивается по убыванию сходства.
+
+        Args:
+            row: Строка матрицы сходства вида {other_movie_id: similarity}
+
+        Returns:
+            Отфильтрованная строка матрицы сходства
+        """
+        items = row.items()
+        if self.min_similarity > 0:
+            items = [(mid, sim) for mid, sim in items if sim > self.min_similarity]
+
+        if self.max_neighbors is None:
+            return dict(items)
+
+        return dict(heapq.nlargest(self.max_neighbors, items, key=itemgetter(1)))
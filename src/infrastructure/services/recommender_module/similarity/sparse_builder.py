@@ -0,0 +1,276 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from scipy import sparse
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.interfaces.similarity_builder import ISimilarityMatrixBuilder
+from .neighbors import NeighborPolicy
+
+# Матрица оценок, подключённая к разделяемой памяти в процессе-воркере
+_shared_matrix: sparse.csc_matrix | None = None
+_shared_memory: list[SharedMemory] = []
+
+
+class SparseSimilarityMatrixBuilder(ISimilarityMatrixBuilder):
+    """Строит матрицу сходства фильмов через разреженное матричное произведение.
+
+    Рейтинги раскладываются в разреженную матрицу user × movie, столбцы которой
+    нормируются по L2. Все косинусные сходства фильмов получаются одним
+    произведением Nᵀ·N, поэтому результат совпадает с SimilarityMatrixBuilder
+    с точностью до погрешности вычислений с плавающей точкой.
+
+    При workers > 1 фильмы делятся на блоки строк, которые считаются в пуле
+    процессов. Нормированная матрица оценок кладётся в разделяемую память
+    и подключается воркерами только для чтения, без копирования через pickle.
+    """
+
+    def __init__(
+        self,
+        neighbor_policy: NeighborPolicy = NeighborPolicy(),
+        workers: int = 1,
+    ) -> None:
+        """
+        Args:
+            neighbor_policy: Правило отбора соседей фильма
+            workers: Количество процессов для построения матрицы
+        """
+        self.neighbor_policy = neighbor_policy
+        self.workers = workers
+
+    def build(
+        self,
+        user_ratings: dict[int, dict[int, int]],
+        movies: list[Movie],
+    ) -> dict[int, dict[int, float]]:
+        """Строит матрицу сходства фильмов.
+
+        Диагональ и пары со сходством не выше порога neighbor_policy
+        не сохраняются. Если задан max_neighbors, в строке остаются только
+        K самых похожих фильмов по убыванию сходства.
+
+        Args:
+            user_ratings: Словарь пользовательских оценок,
+                структура user_id → {movie_id → rating}.
+            movies: Список всех фильмов.
+
+        Returns:
+            Матрица сходства фильмов вида:
+                {movie_id: {other_movie_id: similarity}}.
+        """
+        movie_ids: list[int] = [movie.id for movie in movies]
+
+        normalized: sparse.csc_matrix = self._normalized_matrix(user_ratings, movie_ids)
+        if self.workers > 1 and normalized.nnz:
+            blocks = self._parallel_blocks(normalized)
+        else:
+            blocks = [
+                (
+                    0,
+                    similarity_block(
+                        normalized, 0, len(movie_ids), self.neighbor_policy
+                    ),
+                )
+            ]
+
+        return self._to_dict(blocks, movie_ids)
+
+    @staticmethod
+    def _normalized_matrix(
+        user_ratings: dict[int, dict[int, int]],
+        movie_ids: list[int],
+    ) -> sparse.csc_matrix:
+        """Собирает матрицу user × movie с нормированными по L2 столбцами.
+
+        Оценки фильмов, которых нет в списке movie_ids, не учитываются.
+        """
+        columns: dict[int, int] = {
+            movie_id: idx for idx, movie_id in enumerate(movie_ids)
+        }
+
+        rows: list[int] = []
+        cols: list[int] = []
+        data: list[int] = []
+
+        for row, movie_data in enumerate(user_ratings.values()):
+            for movie_id, rating in movie_data.items():
+                col = columns.get(movie_id)
+                if col is None:
+                    continue
+
+                rows.append(row)
+                cols.append(col)
+                data.append(rating)
+
+        matrix = sparse.csc_matrix(
+            (np.asarray(data, dtype=np.float64), (rows, cols)),
+            shape=(len(user_ratings), len(movie_ids)),
+        )
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        inverted = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+
+        return (matrix @ sparse.diags(inverted)).tocsc()
+
+    def _parallel_blocks(
+        self, normalized: sparse.csc_matrix
+    ) -> list[tuple[int, sparse.csr_matrix]]:
+        """Считает блоки строк матрицы сходства в пуле процессов.
+
+        Блоков в несколько раз больше, чем процессов, чтобы плотные
+        и разреженные участки каталога распределялись равномерно.
+        """
+        movies_count: int = normalized.shape[1]
+        bounds = np.linspace(
+            0, movies_count, num=min(movies_count, self.workers * 4) + 1, dtype=int
+        )
+
+        shared: list[SharedMemory] = []
+        descriptors: list[tuple[str, str, int]] = []
+        try:
+            for array in (normalized.data, normalized.indices, normalized.indptr):
+                memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+                shared.append(memory)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+                descriptors.append((memory.name, array.dtype.str, len(array)))
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+                initializer=_attach_shared_matrix,
+                initargs=(descriptors, normalized.shape),
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _compute_shared_block,
+                        int(start),
+                        int(end),
+                        self.neighbor_policy,
+                    )
+                    for start, end in zip(bounds[:-1], bounds[1:])
+                    if end > start
+                ]
+                return [future.result() for future in futures]
+        finally:
+            for memory in shared:
+                memory.close()
+                memory.unlink()
+
+    @staticmethod
+    def _to_dict(
+        blocks: list[tuple[int, sparse.csr_matrix]],
+        movie_ids: list[int],
+    ) -> dict[int, dict[int, float]]:
+        """Собирает блоки строк матрицы сходства в словарь словарей."""
+        ids = np.asarray(movie_ids)
+        matrix: dict[int, dict[int, float]] = defaultdict(dict)
+
+        for offset, block in blocks:
+            indptr: list[int] = block.indptr.tolist()
+            neighbors: list[int] = ids[block.indices].tolist()
+            values: list[float] = block.data.tolist()
+
+            for row in range(block.shape[0]):
+                start, end = indptr[row], indptr[row + 1]
+                if start == end:
+                    continue
+
+                matrix[movie_ids[offset + row]] = dict(
+                    zip(neighbors[start:end], values[start:end])
+                )
+
+        return matrix
+
+
+def similarity_block(
+    normalized: sparse.csc_matrix,
+    start: int,
+    end: int,
+    neighbor_policy: NeighborPolicy,
+) -> sparse.csr_matrix:
+    """Считает строки [start, end) матрицы сходства и отбирает в них соседей.
+
+    Args:
+        normalized: Матрица user × movie с нормированными по L2 столбцами
+        start: Индекс первого фильма блока
+        end: Индекс фильма, следующего за последним фильмом блока
+        neighbor_policy: Правило отбора соседей фильма
+
+    Returns:
+        Блок матрицы сходства размера (end - start) × movies. Внутри строки
+        соседи упорядочены по индексу фильма, а при заданном max_neighbors —
+        по убыванию сходства
+    """
+    block: sparse.csr_matrix = (normalized[:, start:end].T @ normalized).tocsr()
+
+    rows = np.repeat(np.arange(end - start), np.diff(block.indptr))
+    diagonal = block.indices == rows + start
+    block.data[diagonal | (block.data <= neighbor_policy.min_similarity)] = 0
+    block.eliminate_zeros()
+    block.sort_indices()
+
+    return select_neighbors(block, neighbor_policy)
+
+
+def select_neighbors(
+    block: sparse.csr_matrix, neighbor_policy: NeighborPolicy
+) -> sparse.csr_matrix:
+    """Оставляет в каждой строке блока max_neighbors самых похожих фильмов.
+
+    Args:
+        block: Строки матрицы сходства без диагонали и пар ниже порога,
+            с упорядоченными индексами
+        neighbor_policy: Правило отбора соседей фильма
+
+    Returns:
+        Тот же блок, если max_neighbors не задан, иначе новый блок, в строках
+        которого соседи упорядочены по убыванию сходства
+    """
+    if neighbor_policy.max_neighbors is None:
+        return block
+    # Пустой каталог: np.concatenate не принимает пустой список
+    if block.shape[0] == 0:
+        return sparse.csr_matrix(block.shape, dtype=block.dtype)
+
+    indptr: list[int] = [0]
+    indices: list[np.ndarray] = []
+    data: list[np.ndarray] = []
+    for row in range(block.shape[0]):
+        row_start, row_end = block.indptr[row], block.indptr[row + 1]
+        values = block.data[row_start:row_end]
+        top = np.argsort(-values, kind="stable")[: neighbor_policy.max_neighbors]
+
+        indices.append(block.indices[row_start:row_end][top])
+        data.append(values[top])
+        indptr.append(indptr[-1] + len(top))
+
+    return sparse.csr_matrix(
+        (np.concatenate(data), np.concatenate(indices), np.asarray(indptr)),
+        shape=block.shape,
+    )
+
+
+def _attach_shared_matrix(
+    descriptors: list[tuple[str, str, int]], shape: tuple[int, int]
+) -> None:
+    """Инициализатор воркера: подключает матрицу оценок из разделяемой памяти."""
+    global _shared_matrix
+
+    arrays: list[np.ndarray] = []
+    for name, dtype, length in descriptors:
+        memory = SharedMemory(name=name)
+        _shared_memory.append(memory)
+        arrays.append(np.ndarray((length,), dtype=np.dtype(dtype), buffer=memory.buf))
+
+    data, indices, indptr = arrays
+    _shared_matrix = sparse.csc_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def _compute_shared_block(
+    start: int, end: int, neighbor_policy: NeighborPolicy
+) -> tuple[int, sparse.csr_matrix]:
+    """Задача воркера: считает блок строк по матрице из разделяемой памяти."""
+    return start, similarity_block(_shared_matrix, start, end, neighbor_policy)
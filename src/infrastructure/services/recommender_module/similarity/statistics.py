@@ -0,0 +1,158 @@
+from collections.abc import Mapping, MutableMapping
+from math import sqrt
+
+import numpy as np
+from scipy import sparse
+
+from src.infrastructure.services.recommender_module.storage.csr import CSRMapping
+
+
+class CosineStatistics:
+    """Достаточные статистики для инкрементального пересчёта косинусного сходства.
+
+    Хранит для каждого фильма квадрат нормы вектора оценок, а для каждой пары
+    фильмов с общими пользователями — скалярное произведение их векторов.
+    Новая оценка пользователя меняет норму одного фильма и скалярные
+    произведения только с фильмами этого пользователя, поэтому обновление
+    стоит O(|история пользователя|), а строка сходства фильма пересчитывается
+    без обхода векторов оценок.
+
+    Оценки целые, поэтому статистики хранятся в int и не накапливают
+    погрешность: сходство после любого числа обновлений совпадает с полной
+    пересборкой с точностью до округления при делении.
+
+    Скалярные произведения хранятся в CSRMapping: строки декодируются
+    в dict только для фильмов, которые получали новые оценки.
+    """
+
+    def __init__(
+        self,
+        norms: dict[int, int],
+        dots: MutableMapping[int, dict[int, int]],
+    ) -> None:
+        """
+        Args:
+            norms: Квадраты норм векторов фильмов вида {movie_id: Σ rating²}
+            dots: Скалярные произведения векторов фильмов вида
+                {movie_id: {other_movie_id: Σ rating · other_rating}}
+        """
+        self.norms: dict[int, int] = norms
+        self.dots: MutableMapping[int, dict[int, int]] = dots
+
+    @classmethod
+    def from_ratings(
+        cls, movie_ratings: Mapping[int, dict[int, int]]
+    ) -> "CosineStatistics":
+        """
+        Считает статистики одним разреженным произведением Rᵀ·R
+
+        Args:
+            movie_ratings: Оценки вида movie_id → {user_id → rating}
+
+        Returns:
+            Статистики для всех фильмов, у которых есть оценки
+        """
+        ids, matrix = cls._ratings_matrix(movie_ratings)
+
+        gram: sparse.csr_matrix = (matrix.T @ matrix).tocsr()
+        gram.sort_indices()
+        norms: dict[int, int] = dict(zip(ids.tolist(), gram.diagonal().tolist()))
+
+        rows = np.repeat(np.arange(gram.shape[0]), np.diff(gram.indptr))
+        gram.data[gram.indices == rows] = 0
+        gram.eliminate_zeros()
+
+        dots = CSRMapping(ids, gram.indptr, ids[gram.indices], gram.data)
+        return cls(norms, dots)
+
+    @staticmethod
+    def _ratings_matrix(
+        movie_ratings: Mapping[int, dict[int, int]],
+    ) -> tuple[np.ndarray, sparse.csc_matrix]:
+        """Собирает матрицу user × movie со столбцами по возрастанию movie_id."""
+        if isinstance(movie_ratings, CSRMapping) and movie_ratings.is_pristine:
+            ids, indptr, user_ids, ratings = movie_ratings.arrays()
+            users, rows = np.unique(user_ids, return_inverse=True)
+            matrix = sparse.csc_matrix(
+                (ratings.astype(np.int64), rows, indptr),
+                shape=(len(users), len(ids)),
+            )
+            return ids, matrix
+
+        movie_ids: list[int] = sorted(movie_ratings)
+        user_index: dict[int, int] = {}
+
+        rows: list[int] = []
+        cols: list[int] = []
+        data: list[int] = []
+
+        for col, movie_id in enumerate(movie_ids):
+            for user_id, rating in movie_ratings[movie_id].items():
+                rows.append(user_index.setdefault(user_id, len(user_index)))
+                cols.append(col)
+                data.append(rating)
+
+        matrix = sparse.csc_matrix(
+            (np.asarray(data, dtype=np.int64), (rows, cols)),
+            shape=(len(user_index), len(movie_ids)),
+        )
+        return np.asarray(movie_ids, dtype=np.int64), matrix
+
+    def update(
+        self,
+        user_movies: dict[int, int],
+        movie_id: int,
+        old_rating: int | None,
+        new_rating: int,
+    ) -> None:
+        """
+        Учитывает новую или изменённую оценку пользователя
+
+        Args:
+            user_movies: Оценки пользователя вида {movie_id: rating}
+            movie_id: Идентификатор оценённого фильма
+            old_rating: Предыдущая оценка фильма или None, если её не было
+            new_rating: Новая оценка фильма
+        """
+        old_value: int = old_rating or 0
+        delta: int = new_rating - old_value
+
+        self.norms[movie_id] = (
+            self.norms.get(movie_id, 0)
+            + new_rating * new_rating
+            - old_value * old_value
+        )
+        if delta == 0:
+            return
+
+        row: dict[int, int] = self.dots.setdefault(movie_id, {})
+        for other_id, other_rating in user_movies.items():
+            if other_id == movie_id:
+                continue
+
+            change: int = delta * other_rating
+            row[other_id] = row.get(other_id, 0) + change
+
+            other_row: dict[int, int] = self.dots.setdefault(other_id, {})
+            other_row[movie_id] = other_row.get(movie_id, 0) + change
+
+    def row(self, movie_id: int) -> dict[int, float]:
+        """
+        Вычисляет сходство фильма со всеми фильмами, имеющими общих пользователей
+
+        Args:
+            movie_id: Идентификатор фильма
+
+        Returns:
+            Строка матрицы сходства вида {other_movie_id: similarity}
+        """
+        norm: int = self.norms.get(movie_id, 0)
+        if norm == 0:
+            return {}
+
+        norms: dict[int, int] = self.norms
+        return {
+            other_id: dot / sqrt(norm * norms[other_id])
+            for other_id, dot in self.dots.get(movie_id, {}).items()
+            if norms.get(other_id, 0) > 0
+        }
@@ -0,0 +1,212 @@
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+import numpy as np
+
+
+class CSRMapping(MutableMapping[int, dict[int, Any]]):
+    """Разреженная матрица в формате CSR с интерфейсом словаря словарей.
+
+    Позволяет работать с матрицей вида {key: {column: value}} поверх массивов
+    NumPy (в том числе отображённых в память через mmap) без их копирования.
+    Строки декодируются в dict только при обращении:
+
+    - get() декодирует строку без сохранения, массивы остаются единственным
+      хранилищем данных
+    - [] сохраняет декодированную строку в оверлей, чтобы её можно было
+      изменять; для отсутствующего ключа создаётся пустая строка,
+      как у defaultdict(dict)
+
+    Attributes:
+        keys_array: Отсортированные по возрастанию ключи строк
+        indptr: Смещения строк в indices и values (длина len(keys_array) + 1)
+        indices: Ключи столбцов
+        values: Значения
+    """
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        self.keys_array: np.ndarray = keys
+        self.indptr: np.ndarray = indptr
+        self.indices: np.ndarray = indices
+        self.values: np.ndarray = values
+
+        self._overlay: dict[int, dict[int, Any]] = {}
+        self._deleted: set[int] = set()
+
+    @classmethod
+    def from_dict(
+        cls,
+        mapping: Mapping[int, Mapping[int, Any]],
+        value_dtype: np.dtype | type,
+        index_dtype: np.dtype | type = np.int32,
+    ) -> "CSRMapping":
+        """
+        Упаковывает словарь словарей в CSR-массивы
+
+        Порядок столбцов внутри строки сохраняется.
+
+        Args:
+            mapping: Матрица вида {key: {column: value}}
+            value_dtype: Тип значений
+            index_dtype: Тип ключей столбцов
+
+        Returns:
+            CSRMapping с пустым оверлеем
+        """
+        if isinstance(mapping, CSRMapping) and mapping.is_pristine:
+            return mapping
+
+        keys: list[int] = sorted(mapping)
+        lengths = np.fromiter(
+            (len(mapping[key]) for key in keys), dtype=np.int64, count=len(keys)
+        )
+        total: int = int(lengths.sum())
+
+        indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        indices = np.fromiter(
+            (column for key in keys for column in mapping[key]),
+            dtype=index_dtype,
+            count=total,
+        )
+        values = np.fromiter(
+            (value for key in keys for value in mapping[key].values()),
+            dtype=value_dtype,
+            count=total,
+        )
+
+        return cls(np.asarray(keys, dtype=np.int64), indptr, indices, values)
+
+    @property
+    def is_pristine(self) -> bool:
+        """True, если матрица полностью описывается массивами без оверлея."""
+        return not self._overlay and not self._deleted
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Возвращает массивы keys, indptr, indices, values."""
+        return self.keys_array, self.indptr, self.indices, self.values
+
+    def detach(self) -> None:
+        """Копирует массивы в память процесса.
+
+        После вызова матрица больше не ссылается на отображённый файл,
+        и его mmap можно закрыть.
+        """
+        self.keys_array = np.array(self.keys_array)
+        self.indptr = np.array(self.indptr)
+        self.indices = np.array(self.indices)
+        self.values = np.array(self.values)
+
+    def row_totals(self) -> tuple[dict[int, int], dict[int, Any]]:
+        """
+        Считает количество и сумму значений каждой строки
+
+        Returns:
+            Пара словарей {key: количество значений} и {key: сумма значений}
+        """
+        accumulator = (
+            np.int64 if np.issubdtype(self.values.dtype, np.integer) else np.float64
+        )
+        cumulative = np.zeros(len(self.values) + 1, dtype=accumulator)
+        np.cumsum(self.values, dtype=accumulator, out=cumulative[1:])
+
+        lengths = np.diff(self.indptr)
+        sums = cumulative[self.indptr[1:]] - cumulative[self.indptr[:-1]]
+
+        keys: list[int] = self.keys_array.tolist()
+        counts: dict[int, int] = dict(zip(keys, lengths.tolist()))
+        totals: dict[int, Any] = dict(zip(keys, sums.tolist()))
+
+        for key in self._deleted:
+            counts.pop(key, None)
+            totals.pop(key, None)
+
+        for key, row in self._overlay.items():
+            counts[key] = len(row)
+            totals[key] = sum(row.values())
+
+        return counts, totals
+
+    def get(self, key: int, default: Any = None) -> dict[int, Any] | Any:
+        row: dict[int, Any] | None = self._overlay.get(key)
+        if row is not None:
+            return row
+
+        position: int | None = self._position(key)
+        if position is None:
+            return default
+
+        return self._decode(position)
+
+    def __getitem__(self, key: int) -> dict[int, Any]:
+        row: dict[int, Any] | None = self._overlay.get(key)
+        if row is not None:
+            return row
+
+        position: int | None = self._position(key)
+        row = self._decode(position) if position is not None else {}
+
+        self._overlay[key] = row
+        self._deleted.discard(key)
+        return row
+
+    def __setitem__(self, key: int, row: dict[int, Any]) -> None:
+        self._overlay[key] = row
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: int) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        self._overlay.pop(key, None)
+        if self._position(key) is not None:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._overlay or self._position(key) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        for key in self.keys_array.tolist():
+            if key not in self._deleted:
+                yield key
+
+        for key in self._overlay:
+            if self._array_position(key) is None:
+                yield key
+
+    def __len__(self) -> int:
+        extra: int = sum(
+            1 for key in self._overlay if self._array_position(key) is None
+        )
+        return len(self.keys_array) - len(self._deleted) + extra
+
+    def _position(self, key: object) -> int | None:
+        """Индекс строки в массивах с учётом удалённых ключей."""
+        if key in self._deleted:
+            return None
+
+        return self._array_position(key)
+
+    def _array_position(self, key: object) -> int | None:
+        """Индекс строки в массивах или None, если ключа в них нет."""
+        if not isinstance(key, (int, np.integer)):
+            return None
+
+        position: int = int(np.searchsorted(self.keys_array, key))
+        if position < len(self.keys_array) and self.keys_array[position] == key:
+            return position
+
+        return None
+
+    def _decode(self, position: int) -> dict[int, Any]:
+        start, end = self.indptr[position], self.indptr[position + 1]
+        return dict(
+            zip(self.indices[start:end].tolist(), self.values[start:end].tolist())
+        )
@@ -0,0 +1,132 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from src.infrastructure.services.recommender_module.storage.csr import CSRMapping
+from src.shared.types.recommender import PopularityScore
+
+
+class PopularityIndex:
+    """Инкрементально поддерживаемый рейтинг популярности фильмов.
+
+    Фильмы хранятся в списке, отсортированном по убыванию оценки популярности,
+    поэтому top-N отдаётся срезом за O(N) независимо от числа рейтингов.
+    Новый рейтинг меняет позицию только одного фильма.
+
+    Поддерживаемые оценки:
+    - COUNT: количество оценок фильма
+    - RATING_SUM: сумма оценок фильма (популярность, взвешенная рейтингом)
+    - BAYESIAN: байесовское среднее (C·m + Σr) / (C + n), где m — средняя
+      оценка по всем фильмам, а C — вес априорного среднего. Параметры
+      априорного распределения фиксируются при rebuild, чтобы одно новое
+      значение не требовало пересортировки всего каталога
+    """
+
+    def __init__(
+        self,
+        score: PopularityScore = PopularityScore.COUNT,
+        prior_weight: float | None = None,
+    ) -> None:
+        """
+        Args:
+            score: Способ ранжирования фильмов
+            prior_weight: Вес априорного среднего для BAYESIAN. Если не указан,
+                используется среднее количество оценок на фильм
+        """
+        self.score: PopularityScore = score
+        self.prior_weight: float | None = prior_weight
+
+        self._counts: dict[int, int] = defaultdict(int)
+        self._sums: dict[int, int] = defaultdict(int)
+        self._keys: dict[int, tuple[float, int]] = {}
+        self._ranking: list[tuple[float, int]] = []
+
+        self._prior_mean: float = 0.0
+        self._prior_weight: float = 0.0
+
+    def rebuild(self, movies: dict[int, dict[int, int]]) -> None:
+        """
+        Полностью пересчитывает рейтинг популярности
+
+        Args:
+            movies: Оценки вида movie_id → {user_id → rating}
+        """
+        self._counts = defaultdict(int)
+        self._sums = defaultdict(int)
+        if isinstance(movies, CSRMapping):
+            # Суммы считаются по массивам снимка без декодирования строк
+            counts, sums = movies.row_totals()
+            for movie_id, count in counts.items():
+                if count:
+                    self._counts[movie_id] = count
+                    self._sums[movie_id] = sums[movie_id]
+        else:
+            for movie_id, ratings in movies.items():
+                if not ratings:
+                    continue
+
+                self._counts[movie_id] = len(ratings)
+                self._sums[movie_id] = sum(ratings.values())
+
+        total_count: int = sum(self._counts.values())
+        if total_count:
+            self._prior_mean = sum(self._sums.values()) / total_count
+            self._prior_weight = (
+                self.prior_weight
+                if self.prior_weight is not None
+                else total_count / len(self._counts)
+            )
+
+        self._keys = {movie_id: self._key(movie_id) for movie_id in self._counts}
+        self._ranking = sorted(self._keys.values())
+
+    def update(self, movie_id: int, old_rating: int | None, new_rating: int) -> None:
+        """
+        Учитывает новую или изменённую оценку фильма
+
+        Args:
+            movie_id: Идентификатор фильма
+            old_rating: Предыдущая оценка пользователя или None, если её не было
+            new_rating: Новая оценка пользователя
+        """
+        if old_rating is None:
+            self._counts[movie_id] += 1
+            self._sums[movie_id] += new_rating
+        else:
+            self._sums[movie_id] += new_rating - old_rating
+
+        old_key: tuple[float, int] | None = self._keys.get(movie_id)
+        if old_key is not None:
+            del self._ranking[bisect_left(self._ranking, old_key)]
+
+        new_key: tuple[float, int] = self._key(movie_id)
+        self._keys[movie_id] = new_key
+        insort(self._ranking, new_key)
+
+    def top(self, top_n: int) -> list[int]:
+        """
+        Возвращает самые популярные фильмы
+
+        Args:
+            top_n: Количество фильмов
+
+        Returns:
+            Идентификаторы фильмов по убыванию популярности
+        """
+        return [movie_id for _, movie_id in self._ranking[:top_n]]
+
+    def _key(self, movie_id: int) -> tuple[float, int]:
+        """Ключ сортировки: по убыванию оценки, при равенстве — по id фильма."""
+        count: int = self._counts[movie_id]
+        total: int = self._sums[movie_id]
+
+        match self.score:
+            case PopularityScore.RATING_SUM:
+                value = float(total)
+            case PopularityScore.BAYESIAN:
+                value = (self._prior_weight * self._prior_mean + total) / (
+                    self._prior_weight + count
+                )
+            case _:
+                value = float(count)
+
+        return -value, movie_id
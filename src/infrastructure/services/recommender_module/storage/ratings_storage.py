@@ -1,35 +1,93 @@
-from collections import defaultdict, Counter
+from collections import defaultdict
+from collections.abc import Iterable
 
-from src.domain.entities.movie_lens.raitings import Rating
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.recommender_module.storage.popularity import (
+    PopularityIndex,
+)
+from src.shared.types.recommender import PopularityScore
 
 
 class RatingsStorage:
-    def __init__(self):
+    """Хранилище пользовательских рейтингов.
+
+    Рейтинги хранятся в двух согласованных индексах:
+    user_id → {movie_id → rating} и обратном movie_id → {user_id → rating},
+    поэтому и оценки пользователя, и вектор фильма достаются за O(1).
+    Рейтинг популярности для пользователей без оценок поддерживается
+    инкрементально.
+    """
+
+    def __init__(self, popularity_score: PopularityScore = PopularityScore.COUNT):
+        """
+        Args:
+            popularity_score: Способ ранжирования популярных фильмов
+        """
         self.users: dict[int, dict[int, int]] = defaultdict(dict)
+        self.movies: dict[int, dict[int, int]] = defaultdict(dict)
+        self.popularity: PopularityIndex = PopularityIndex(popularity_score)
+
+    def set_users(
+        self,
+        users: dict[int, dict[int, int]],
+        movies: dict[int, dict[int, int]] | None = None,
+    ):
+        """
+        Заменяет содержимое хранилища
 
-    def set_users(self, users: dict[int, dict[int, int]]):
+        Args:
+            users: Оценки вида user_id → {movie_id → rating}
+            movies: Обратный индекс movie_id → {user_id → rating}.
+                Если не передан, строится по users
+        """
         self.users = users
+        self.movies = movies if movies is not None else self._invert(users)
+        self.popularity.rebuild(self.movies)
+
+    def fill(self, records: Iterable[RatingRecord]):
+        self.extend(records)
+        self.rebuild_popularity()
+
+    def extend(self, records: Iterable[RatingRecord]):
+        """
+        Добавляет порцию рейтингов без пересчёта рейтинга популярности
 
-    def fill(self, ratings: list[Rating]):
-        for r in ratings:
-            self.users[r.user.id][r.movie.id] = r.rating
+        Используется при потоковой загрузке: после последней порции нужно
+        вызвать rebuild_popularity
 
-    def update(self, rating: Rating):
-        self.users[rating.user.id][rating.movie.id] = rating.rating
+        Args:
+            records: Рейтинги в виде плоских записей
+        """
+        users = self.users
+        movies = self.movies
+        for user_id, movie_id, rating, _ in records:
+            users[user_id][movie_id] = rating
+            movies[movie_id][user_id] = rating
+
+    def rebuild_popularity(self):
+        self.popularity.rebuild(self.movies)
+
+    def update(self, record: RatingRecord):
+        old_rating: int | None = self.users[record.user_id].get(record.movie_id)
+
+        self.users[record.user_id][record.movie_id] = record.rating
+        self.movies[record.movie_id][record.user_id] = record.rating
+        self.popularity.update(record.movie_id, old_rating, record.rating)
 
     def get_user_movies(self, user_id: int) -> dict[int, int]:
         return self.users.get(user_id, {})
 
     def get_movie_vector(self, movie_id: int) -> dict[int, int]:
-        vector = {}
-        for u, movies in self.users.items():
-            if movie_id in movies:
-                vector[u] = movies[movie_id]
-        return vector
+        return self.movies.get(movie_id, {})
 
     def popular(self, top_n: int) -> list[int]:
-        counter = Counter()
-        for movies in self.users.values():
-            counter.update(movies.keys())
+        return self.popularity.top(top_n)
+
+    @staticmethod
+    def _invert(users: dict[int, dict[int, int]]) -> dict[int, dict[int, int]]:
+        movies: dict[int, dict[int, int]] = defaultdict(dict)
+        for user_id, user_movies in users.items():
+            for movie_id, rating in user_movies.items():
+                movies[movie_id][user_id] = rating
 
-        return [mid for mid, _ in counter.most_common(top_n)]
+        return movies
@@ -1,14 +1,14 @@
 import pickle
 from pathlib import Path
 
-from src.domain.interfaces.similarity_cache import ISimilarityCache
+from src.domain.interfaces.similarity_cache import ISimilarityCache, RecommenderState
 
 
 class PickleSimilarityCache(ISimilarityCache):
     def __init__(self, path: Path):
         self.path = path
 
-    async def load(self):
+    async def load(self) -> RecommenderState | None:
         if not self.path.exists():
             return None
 
@@ -16,6 +16,6 @@ class PickleSimilarityCache(ISimilarityCache):
         with open(self.path, "rb") as f:
             return pickle.load(f)
 
-    async def save(self, matrix):
+    async def save(self, state: RecommenderState) -> None:
         with open(self.path, "wb") as f:
-            pickle.dump(matrix, f)
+            pickle.dump(state, f)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class WarmupStatus:
+    """Состояние прогрева приложения после старта."""
+
+    ready: bool
+    phase: str | None
+    phases: dict[str, float]
+    error: str | None
+    duration: float | None
+
+
+class StartupWarmup:
+    """Фоновый прогрев приложения по фазам.
+
+    Фазы выполняются по порядку в отдельной задаче, поэтому сервер начинает
+    принимать соединения сразу, не дожидаясь загрузки данных и модели.
+    Длительность каждой фазы логируется и доступна в status. Приложение
+    готово, когда все фазы завершились; если фаза упала, прогрев
+    останавливается, а приложение остаётся неготовым.
+    """
+
+    def __init__(self, phases: Sequence[tuple[str, Callable[[], Awaitable[None]]]]):
+        """
+        Args:
+            phases: Пары (название фазы, асинхронная функция фазы) в порядке
+                выполнения
+        """
+        self.phases = phases
+
+        self._task: asyncio.Task | None = None
+        self._phase: str | None = None
+        self._durations: dict[str, float] = {}
+        self._error: str | None = None
+        self._duration: float | None = None
+        self._ready: bool = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def start(self) -> None:
+        if self._task is None:
+            self._phase = self.phases[0][0] if self.phases else None
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Прерывает незавершённый прогрев."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def wait(self) -> bool:
+        """
+        Дожидается окончания прогрева
+
+        Returns:
+            True, если приложение готово
+        """
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+        return self._ready
+
+    def status(self) -> WarmupStatus:
+        return WarmupStatus(
+            ready=self._ready,
+            phase=self._phase,
+            phases=dict(self._durations),
+            error=self._error,
+            duration=self._duration,
+        )
+
+    async def _run(self) -> None:
+        started: float = time.perf_counter()
+
+        for name, phase in self.phases:
+            self._phase = name
+            phase_started: float = time.perf_counter()
+            try:
+                await phase()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._error = f"{name}: {e!r}"
+                logger.exception("Прогрев остановлен: фаза %s не удалась", name)
+                return
+
+            self._durations[name] = time.perf_counter() - phase_started
+            logger.info("Прогрев: %s за %.2f с", name, self._durations[name])
+
+        self._phase = None
+        self._duration = time.perf_counter() - started
+        self._ready = True
+        logger.info("Приложение готово через %.2f с после старта", self._duration)
@@ -1,56 +1,71 @@
 from contextlib import asynccontextmanager
-from pathlib import Path
+from dataclasses import asdict
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, Response
 from starlette.middleware.cors import CORSMiddleware
 
-from src.application.usecase.movie_lens.movie_lens_import import MovieLensImportUseCase
-from src.application.usecase.recommender.recommender_builder import (
-    RecommenderBuilderUseCase,
+from src.infrastructure.services.recommender_module.recommender.popularity_recommender import (
+    PopularityRecommender,
 )
-from src.domain.interfaces.recommender import IRecommender
-from src.infrastructure.db.db import init_db
+from src.infrastructure.services.metrics import registry
+from src.infrastructure.services.startup_warmup import StartupWarmup
 from src.presentation.api.router_v1 import api_v1_router
-from src.presentation.dependencies.movie_lens.movie_lens_impot import (
-    get_movie_lens_import_use_case,
+from src.presentation.dependencies.auth.auth_cache import auth_cache
+from src.presentation.dependencies.metrics.model_metrics import register_model_metrics
+from src.presentation.dependencies.ratings.rating_writer import create_rating_writer
+from src.presentation.dependencies.recommender.rebuild_manager import (
+    create_rebuild_manager,
 )
 from src.presentation.dependencies.recommender.recommender_builder import (
-    recommender_builder,
+    recommender_service,
 )
+from src.presentation.dependencies.startup.warmup import create_warmup
+from src.presentation.middlewares.auth import AuthMiddleware
+from src.presentation.middlewares.metrics import MetricsMiddleware
 
 # from starlette.middleware.sessions import SessionMiddleware
 
-# from src.presentation.middlewares.auth import AuthMiddleware
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-
-    movie_lens_import_use_case: MovieLensImportUseCase = (
-        get_movie_lens_import_use_case()
-    )
-    movie_lens_path = Path(
-        r"C:\Users\isupov\YandexDisk\Programming\University\ERS\async-collaborative-filtering\async-collaborative-filtering-backend\assets"
+    # Данные и модель загружаются в фоне: до готовности модели
+    # рекомендации отдаёт запасной рекомендатель популярных фильмов,
+    # а пока не посчитан и он, маршруты рекомендаций отвечают 503
+    app.state.recommender = PopularityRecommender(
+        event_log=recommender_service().event_log
     )
-    await movie_lens_import_use_case.execute(movie_lens_path)
 
-    recommender_builder_use_case: RecommenderBuilderUseCase = (
-        await recommender_builder()
-    )
-    recommender = await recommender_builder_use_case.execute()
+    rating_writer = create_rating_writer(app)
+    rating_writer.start()
+    app.state.rating_writer = rating_writer
+
+    rebuild_manager = create_rebuild_manager(app)
+    app.state.rebuild_manager = rebuild_manager
 
-    # TEST
-    test_result = await recommender.recommend_for_user(-1, 5)
-    print(test_result)
-    # END TEST
+    warmup = create_warmup(app)
+    warmup.start()
+    app.state.warmup = warmup
 
-    app.state.recommender = recommender
+    register_model_metrics(app)
 
     yield
 
-    pass
+    await warmup.stop()
+    await rebuild_manager.stop()
+    await rating_writer.stop()
+
+    # Фоновый пересчёт материализованной таблицы есть только у ITEM_CF
+    stop = getattr(app.state.recommender, "stop", None)
+    if stop is not None:
+        await stop()
+
+    service = recommender_service()
+    if service.event_log is not None:
+        service.event_log.close()
+    if service.scoring_executor is not None:
+        service.scoring_executor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -62,7 +77,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-# app.add_middleware(AuthMiddleware)
+app.add_middleware(AuthMiddleware, cache=auth_cache)
+app.add_middleware(MetricsMiddleware)
 app.include_router(api_v1_router)
 
 
@@ -71,5 +87,23 @@ async def health():
     return {"health": "OK"}
 
 
+@app.get("/ready")
+async def ready(request: Request) -> JSONResponse:
+    """Отвечает 200, когда модель загружена, и 503, пока идёт прогрев."""
+    warmup: StartupWarmup = request.app.state.warmup
+    return JSONResponse(
+        asdict(warmup.status()),
+        status_code=(
+            status.HTTP_200_OK if warmup.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Отдаёт метрики процесса в текстовом формате Prometheus."""
+    return Response(registry.render(), media_type=registry.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=False)
@@ -2,6 +2,7 @@ from typing import Awaitable, Callable
 
 from fastapi import Request, HTTPException, status
 
+from src.infrastructure.config.settings import settings
 from src.shared.types.roles import Role
 
 
@@ -16,3 +17,35 @@ def require_role(*allowed_roles: Role) -> Callable[[Request], Awaitable[Role]]:
         return role
 
     return _checker
+
+
+def require_api_key() -> Callable[[Request], Awaitable[Role]]:
+    """
+    Пропускает запросы с системным API-ключом в заголовке Authorization: Bearer
+
+    Ключ сверяется с settings.security.apikeys напрямую, поэтому проверка
+    работает и без AuthMiddleware. Роль SYSTEM, выставленная middleware,
+    тоже принимается
+    """
+    apikeys: frozenset[str] = frozenset(settings.security.apikeys)
+
+    async def _checker(request: Request) -> Role:
+        if getattr(request.state, "role", None) == Role.SYSTEM:
+            return Role.SYSTEM
+
+        header: str = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Missing bearer token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if header.removeprefix("Bearer ").strip() not in apikeys:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid API key",
+            )
+        return Role.SYSTEM
+
+    return _checker
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
+from src.presentation.api.v1.admin import admin_router
 from src.presentation.api.v1.recommendations import recommendations_router
 from src.presentation.api.v1.movie import movies_router
+from src.presentation.api.v1.ratings import ratings_router
 
 # from src.presentation.api.v1.calendar_router import calendar_router
 # from src.presentation.api.v1.google_router import google_router
@@ -13,6 +15,8 @@ from src.presentation.api.v1.movie import movies_router
 api_v1_router = APIRouter(prefix="/api/v1")
 api_v1_router.include_router(recommendations_router)
 api_v1_router.include_router(movies_router)
+api_v1_router.include_router(ratings_router)
+api_v1_router.include_router(admin_router)
 # api_v1_router.include_router(calendar_router)
 # api_v1_router.include_router(user_router)
 # api_v1_router.include_router(security_router)
@@ -0,0 +1,41 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.infrastructure.services.recommender_module.rebuild_manager import (
+    RecommenderRebuildManager,
+)
+from src.presentation.api.roles import require_api_key
+from src.presentation.dependencies.recommender.rebuild_manager import (
+    get_rebuild_manager,
+)
+from src.presentation.schemas.admin import RebuildStarted, RebuildStatus
+
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_api_key())])
+
+
+@admin_router.post("/recommender/rebuild", status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_recommender(
+    manager: RecommenderRebuildManager = Depends(get_rebuild_manager),
+) -> RebuildStarted:
+    """Запускает фоновую пересборку рекомендателя.
+
+    started = false, если пересборка уже идёт. До конца прогрева
+    отвечает 503: первую модель собирает прогрев.
+    """
+    if not manager.started:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Рекомендатель ещё прогревается",
+            headers={"Retry-After": "1"},
+        )
+
+    return RebuildStarted(started=manager.trigger())
+
+
+@admin_router.get("/recommender/rebuild")
+async def get_rebuild_status(
+    manager: RecommenderRebuildManager = Depends(get_rebuild_manager),
+) -> RebuildStatus:
+    """Отдаёт состояние фоновой пересборки рекомендателя."""
+    return RebuildStatus(**asdict(manager.status()))
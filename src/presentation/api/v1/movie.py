@@ -1,13 +1,118 @@
-from fastapi import APIRouter, Depends
+from dataclasses import asdict
 
-from src.application.usecase.movies.get_all import MoviesGetAllUseCase
-from src.presentation.dependencies.movies.get_all import get_all_movies_use_case
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+
+from src.application.usecase.movies.get_page import MoviesGetPageUseCase
+from src.infrastructure.services.movie_catalog import (
+    EncodedResponse,
+    InMemoryMovieCatalog,
+)
+from src.presentation.dependencies.movies.catalog import get_movie_catalog_nowait
+from src.presentation.dependencies.movies.get_page import get_movies_page_use_case
+from src.presentation.schemas.movies import (
+    MAX_PAGE_SIZE,
+    MOVIE_FIELDS,
+    MoviesPage,
+    MovieSchema,
+)
 
 movies_router = APIRouter(prefix="/movies")
 
 
-@movies_router.get("/")
-async def get_all_movies(
-    use_case: MoviesGetAllUseCase = Depends(get_all_movies_use_case),
-):
-    return await use_case.execute()
+@movies_router.get("/", response_model=MoviesPage)
+async def get_movies(
+    request: Request,
+    after_id: int | None = None,
+    limit: int = Query(default=100, gt=0, le=MAX_PAGE_SIZE),
+    genre: list[int] = Query(default=[]),
+    year_from: int | None = Query(default=None, ge=1, le=9999),
+    year_to: int | None = Query(default=None, ge=1, le=9999),
+    fields: str | None = Query(
+        default=None, description="Поля через запятую, например title,genres"
+    ),
+    catalog: InMemoryMovieCatalog = Depends(get_movie_catalog_nowait),
+    use_case: MoviesGetPageUseCase = Depends(get_movies_page_use_case),
+) -> Response:
+    """Отдаёт страницу каталога фильмов по возрастанию id.
+
+    Следующая страница запрашивается с after_id из ответа; когда фильмы
+    закончились, next_after_id равен null. Без fields возвращаются все поля
+    фильма, иначе — только id и перечисленные поля.
+
+    Страницы отдаются из каталога в памяти уже закодированными. Ответ несёт
+    строгий ETag, и на запрос с совпадающим If-None-Match возвращается
+    304 Not Modified без тела. Пока каталог не загружен, страница читается
+    из БД и не кешируется.
+    """
+    selected: set[str] | None = None
+    if fields is not None:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown: set[str] = selected - MOVIE_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown fields: {sorted(unknown)}. "
+                f"Allowed: {sorted(MOVIE_FIELDS)}",
+            )
+
+    key = (
+        after_id,
+        limit,
+        tuple(sorted(set(genre))),
+        year_from,
+        year_to,
+        None if selected is None else tuple(sorted(selected)),
+    )
+    encoded: EncodedResponse | None = catalog.get_response(key)
+    if encoded is None:
+        # Страница из БД не попадает в кеш ответов загруженного каталога
+        cacheable: bool = catalog.loaded
+        movies, next_after_id = await use_case.execute(
+            after_id=after_id,
+            limit=limit,
+            genre_ids=genre,
+            year_from=year_from,
+            year_to=year_to,
+            fields=selected,
+        )
+        include: set[str] | None = None if selected is None else {"id", *selected}
+        page = MoviesPage(
+            items=[
+                MovieSchema.model_validate(
+                    {
+                        name: value
+                        for name, value in asdict(movie).items()
+                        if include is None or name in include
+                    }
+                )
+                for movie in movies
+            ],
+            next_after_id=next_after_id,
+        )
+        body: bytes = page.model_dump_json(exclude_unset=True).encode()
+        encoded = catalog.put_response(key, body) if cacheable else catalog.encode(body)
+
+    headers: dict[str, str] = {"ETag": encoded.etag, "Cache-Control": "no-cache"}
+    etags: set[str] = _etags(request.headers.get("if-none-match"))
+    if encoded.etag in etags or "*" in etags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Vary"] = "Accept-Encoding"
+    if encoded.gzip_body is not None and "gzip" in request.headers.get(
+        "accept-encoding", ""
+    ):
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            encoded.gzip_body, media_type="application/json", headers=headers
+        )
+
+    return Response(encoded.body, media_type="application/json", headers=headers)
+
+
+def _etags(header: str | None) -> set[str]:
+    """Разбирает заголовок If-None-Match в набор ETag."""
+    if not header:
+        return set()
+
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
@@ -0,0 +1,76 @@
+import time
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.params import Depends
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.movie_catalog import InMemoryMovieCatalog
+from src.infrastructure.services.rating_write_behind import RatingWriteBehindQueue
+from src.presentation.dependencies.movies.catalog import get_movie_catalog
+from src.presentation.dependencies.ratings.rating_writer import get_rating_writer
+from src.presentation.schemas.ratings import (
+    BatchRatingsRequest,
+    RatingRequest,
+    RatingsAccepted,
+)
+
+ratings_router = APIRouter(prefix="/ratings")
+
+
+@ratings_router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def add_rating(
+    body: RatingRequest,
+    writer: RatingWriteBehindQueue = Depends(get_rating_writer),
+    catalog: InMemoryMovieCatalog = Depends(get_movie_catalog),
+) -> RatingsAccepted:
+    """Принимает рейтинг в очередь на запись, не дожидаясь сохранения."""
+    return _submit([body], writer, catalog)
+
+
+@ratings_router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def add_ratings(
+    body: BatchRatingsRequest,
+    writer: RatingWriteBehindQueue = Depends(get_rating_writer),
+    catalog: InMemoryMovieCatalog = Depends(get_movie_catalog),
+) -> RatingsAccepted:
+    """Принимает группу рейтингов в очередь целиком или не принимает ни одного."""
+    return _submit(body.ratings, writer, catalog)
+
+
+def _submit(
+    ratings: list[RatingRequest],
+    writer: RatingWriteBehindQueue,
+    catalog: InMemoryMovieCatalog,
+) -> RatingsAccepted:
+    unknown: list[int] = sorted(
+        {
+            rating.movie_id
+            for rating in ratings
+            if not catalog.has_movie(rating.movie_id)
+        }
+    )
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown movies: {unknown}",
+        )
+
+    now: int = int(time.time())
+    records: list[RatingRecord] = [
+        RatingRecord(
+            user_id=rating.user_id,
+            movie_id=rating.movie_id,
+            rating=rating.rating,
+            timestamp=rating.timestamp if rating.timestamp is not None else now,
+        )
+        for rating in ratings
+    ]
+
+    if not writer.submit(records):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Rating queue is full",
+            headers={"Retry-After": "1"},
+        )
+
+    return RatingsAccepted(accepted=len(records), queue_depth=writer.depth)
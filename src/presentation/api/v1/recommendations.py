@@ -1,14 +1,87 @@
-from fastapi import APIRouter
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+
+from fastapi import APIRouter, HTTPException, status
 from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
 
 from src.domain.interfaces.recommender import IRecommender
-from src.presentation.dependencies.recommender.get_recommender import get_recommender
+from src.infrastructure.exceptions.recommender import ScoringTimeoutError
+from src.infrastructure.services.recommender_module.recommender.materialized import (
+    MaterializedRecommendations,
+)
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
+from src.presentation.dependencies.recommender.get_recommender import (
+    get_materialized,
+    get_recommender,
+    get_result_cache,
+)
+from src.presentation.schemas.recommendations import (
+    BatchRecommendationsRequest,
+    MaterializationStats,
+    RecommendationCacheStats,
+    UserRecommendations,
+)
 
 recommendations_router = APIRouter(prefix="/recommendations")
 
 
+@recommendations_router.post("/batch", response_model=None)
+async def get_batch_recommendations(
+    body: BatchRecommendationsRequest,
+    recommender: IRecommender = Depends(get_recommender),
+) -> StreamingResponse:
+    """Отдаёт рекомендации для группы пользователей в формате NDJSON.
+
+    Каждая строка ответа — объект UserRecommendations; строки идут в порядке
+    пользователей в запросе и отправляются по мере расчёта.
+    """
+    requests: list[tuple[int, int]] = [
+        (user.user_id, user.top_n) for user in body.users
+    ]
+
+    async def lines() -> AsyncIterator[str]:
+        async for user_id, movie_ids in recommender.recommend_for_users(requests):
+            yield UserRecommendations(
+                user_id=user_id, movie_ids=movie_ids
+            ).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@recommendations_router.get("/cache")
+async def get_cache_stats(
+    cache: RecommendationCache | None = Depends(get_result_cache),
+) -> RecommendationCacheStats:
+    """Отдаёт счётчики попаданий и промахов кеша рекомендаций."""
+    if cache is None:
+        return RecommendationCacheStats(enabled=False)
+
+    return RecommendationCacheStats(enabled=True, **asdict(cache.stats()))
+
+
+@recommendations_router.get("/materialized")
+async def get_materialization_stats(
+    materialized: MaterializedRecommendations | None = Depends(get_materialized),
+) -> MaterializationStats:
+    """Отдаёт время, длительность и устаревание материализованных рекомендаций."""
+    if materialized is None:
+        return MaterializationStats(enabled=False)
+
+    return MaterializationStats(enabled=True, **asdict(materialized.stats()))
+
+
 @recommendations_router.get("/{user_id}")
 async def get_recommendations(
     user_id: int, top_n: int = 10, recommender: IRecommender = Depends(get_recommender)
 ):
-    return await recommender.recommend_for_user(user_id, top_n)
+    try:
+        return await recommender.recommend_for_user(user_id, top_n)
+    except ScoringTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
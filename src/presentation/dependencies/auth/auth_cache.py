@@ -0,0 +1,12 @@
+from src.infrastructure.config.settings import settings
+from src.infrastructure.services.auth_cache import AuthCache
+
+auth_cache: AuthCache | None = (
+    AuthCache(
+        max_tokens=settings.security.auth_cache_size,
+        max_users=settings.security.auth_cache_size,
+        ttl=settings.security.auth_cache_ttl,
+    )
+    if settings.security.auth_cache_size
+    else None
+)
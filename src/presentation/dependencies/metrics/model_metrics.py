@@ -0,0 +1,142 @@
+import sys
+
+from fastapi import FastAPI
+
+from src.infrastructure.services.metrics import registry
+from src.infrastructure.services.recommender_module.storage.csr import CSRMapping
+
+# Размер объекта float в CPython: значения сходства хранятся отдельными объектами
+_FLOAT_SIZE: int = sys.getsizeof(0.0)
+
+
+def register_model_metrics(app: FastAPI) -> None:
+    """
+    Регистрирует показатели, которые считаются по состоянию приложения
+    в момент выгрузки /metrics
+
+    Рекомендатель берётся из app.state при каждой выгрузке, поэтому
+    показатели следуют за подменой модели после пересборки
+    """
+
+    def recommender():
+        return getattr(app.state, "recommender", None)
+
+    def similarity_nnz() -> float | None:
+        similarity = getattr(recommender(), "similarity", None)
+        if similarity is None:
+            return None
+        # Матрица из снимка: длины строк берутся из массивов без декодирования
+        if isinstance(similarity, CSRMapping):
+            counts, _ = similarity.row_totals()
+            return sum(counts.values())
+        return sum(len(row) for row in similarity.values())
+
+    def similarity_bytes() -> float | None:
+        """Оценка памяти матрицы: словари строк и объекты значений сходства."""
+        similarity = getattr(recommender(), "similarity", None)
+        if similarity is None:
+            return None
+        if isinstance(similarity, CSRMapping):
+            return sum(array.nbytes for array in similarity.arrays())
+
+        size: int = sys.getsizeof(similarity)
+        for row in similarity.values():
+            size += sys.getsizeof(row) + len(row) * _FLOAT_SIZE
+        return size
+
+    def batch_scorer_bytes() -> float | None:
+        scorer = getattr(recommender(), "_batch_scorer", None)
+        if scorer is None:
+            return None
+        return sum(
+            matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+            for matrix in (scorer.weights, scorer.magnitudes)
+        )
+
+    def storage_size() -> dict[tuple[str, ...], float] | None:
+        storage = getattr(recommender(), "storage", None)
+        if storage is None:
+            return None
+        return {("users",): len(storage.users), ("movies",): len(storage.movies)}
+
+    def result_cache_hit_ratio() -> float | None:
+        cache = getattr(recommender(), "result_cache", None)
+        if cache is None:
+            return None
+
+        stats = cache.stats()
+        requests: int = stats.hits + stats.misses
+        return stats.hits / requests if requests else None
+
+    def result_cache_entries() -> float | None:
+        cache = getattr(recommender(), "result_cache", None)
+        return len(cache) if cache is not None else None
+
+    def materialized_stale_users() -> float | None:
+        materialized = getattr(recommender(), "materialized", None)
+        if materialized is None:
+            return None
+        return materialized.stats().stale_users
+
+    def event_sequence() -> float | None:
+        return getattr(recommender(), "sequence", None)
+
+    def rating_queue_depth() -> float | None:
+        writer = getattr(app.state, "rating_writer", None)
+        return writer.depth if writer is not None else None
+
+    def ready() -> float | None:
+        warmup = getattr(app.state, "warmup", None)
+        return float(warmup.ready) if warmup is not None else None
+
+    registry.gauge(
+        "recommender_similarity_nnz",
+        "Количество ненулевых элементов матрицы сходства",
+        function=similarity_nnz,
+    )
+    registry.gauge(
+        "recommender_similarity_bytes",
+        "Оценка памяти, занятой матрицей сходства, в байтах",
+        function=similarity_bytes,
+    )
+    registry.gauge(
+        "recommender_batch_scorer_bytes",
+        "Память CSR-копии матрицы сходства для пакетного расчёта в байтах",
+        function=batch_scorer_bytes,
+    )
+    registry.gauge(
+        "recommender_storage_size",
+        "Количество пользователей и фильмов с оценками в модели",
+        ("entity",),
+        function=storage_size,
+    )
+    registry.gauge(
+        "recommender_result_cache_hit_ratio",
+        "Доля попаданий в кеш рекомендаций",
+        function=result_cache_hit_ratio,
+    )
+    registry.gauge(
+        "recommender_result_cache_entries",
+        "Количество записей в кеше рекомендаций",
+        function=result_cache_entries,
+    )
+    registry.gauge(
+        "recommender_materialized_stale_users",
+        "Пользователи, выпавшие из материализованной таблицы после обновлений",
+        function=materialized_stale_users,
+    )
+    registry.gauge(
+        "recommender_event_sequence",
+        "Номер последнего события журнала рейтингов, учтённого моделью",
+        function=event_sequence,
+    )
+    registry.gauge(
+        "rating_queue_depth",
+        "Рейтинги, ожидающие записи в БД",
+        function=rating_queue_depth,
+    )
+    registry.gauge(
+        "app_ready",
+        "1, если прогрев завершён и модель загружена",
+        function=ready,
+    )
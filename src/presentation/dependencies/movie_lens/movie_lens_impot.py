@@ -1,5 +1,6 @@
 from src.application.usecase.movie_lens.movie_lens_import import MovieLensImportUseCase
+from src.presentation.dependencies.movies.catalog import movie_catalog
 
 
 def get_movie_lens_import_use_case() -> MovieLensImportUseCase:
-    return MovieLensImportUseCase()
+    return MovieLensImportUseCase(catalog=movie_catalog)
@@ -0,0 +1,45 @@
+import asyncio
+
+from src.application.providers.uow import uow_context
+from src.application.usecase.movies.load_catalog import MovieCatalogLoadUseCase
+from src.infrastructure.repositories.movie import MovieRepository
+from src.infrastructure.services.movie_catalog import InMemoryMovieCatalog
+
+movie_catalog = InMemoryMovieCatalog()
+
+
+# Загрузки каталога из прогрева и из запросов идут по одной
+_load_lock = asyncio.Lock()
+# Ссылки на фоновые загрузки, чтобы задачи не собрал сборщик мусора
+_background_loads: set[asyncio.Task] = set()
+
+
+async def load_movie_catalog() -> None:
+    """Загружает каталог, если он ещё не загружен или был сброшен."""
+    if movie_catalog.loaded:
+        return
+
+    async with _load_lock:
+        if movie_catalog.loaded:
+            return
+
+        async with uow_context() as uow:
+            await MovieCatalogLoadUseCase(MovieRepository(uow), movie_catalog).execute()
+
+
+async def get_movie_catalog() -> InMemoryMovieCatalog:
+    # Каталог ещё не загружен, пока идёт прогрев, и после сброса
+    # (например, импортом): первый запрос загружает его, остальные ждут
+    await load_movie_catalog()
+
+    return movie_catalog
+
+
+async def get_movie_catalog_nowait() -> InMemoryMovieCatalog:
+    # Для страниц /movies: незагруженный каталог загружается в фоне,
+    # а страницы до окончания загрузки читаются из БД
+    if not movie_catalog.loaded and not _load_lock.locked():
+        _background_loads.add(task := asyncio.create_task(load_movie_catalog()))
+        task.add_done_callback(_background_loads.discard)
+
+    return movie_catalog
@@ -0,0 +1,14 @@
+from fastapi.params import Depends
+
+from src.application.providers.uow import uow_provider
+from src.application.usecase.movies.get_page import MoviesGetPageUseCase
+from src.infrastructure.repositories.movie import MovieRepository
+from src.infrastructure.services.movie_catalog import InMemoryMovieCatalog
+from src.presentation.dependencies.movies.catalog import get_movie_catalog_nowait
+
+
+def get_movies_page_use_case(
+    catalog: InMemoryMovieCatalog = Depends(get_movie_catalog_nowait),
+    uow=Depends(uow_provider),
+) -> MoviesGetPageUseCase:
+    return MoviesGetPageUseCase(catalog=catalog, movie_repository=MovieRepository(uow))
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from src.application.providers.uow import uow_context
+from src.application.usecase.ratings.ingest_ratings import IngestRatingsUseCase
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.config.settings import settings
+from src.infrastructure.repositories.rating import RatingRepository
+from src.infrastructure.services.rating_dead_letter import RatingDeadLetterFile
+from src.infrastructure.services.rating_write_behind import RatingWriteBehindQueue
+
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+
+def create_rating_writer(app: FastAPI) -> RatingWriteBehindQueue:
+    async def flush(records: list[RatingRecord]) -> list[RatingRecord]:
+        async with uow_context() as uow:
+            use_case = IngestRatingsUseCase(
+                rating_repository=RatingRepository(uow),
+                recommender=lambda: app.state.recommender,
+            )
+            return await use_case.execute(records)
+
+    return RatingWriteBehindQueue(
+        flush,
+        max_size=settings.ingestion.queue_size,
+        batch_size=settings.ingestion.batch_size,
+        flush_interval=settings.ingestion.flush_interval,
+        max_retries=settings.ingestion.max_retries,
+        retry_delay=settings.ingestion.retry_delay,
+        dead_letter=RatingDeadLetterFile(
+            BASE_DIR / "shared" / "assets" / "ratings.dead.jsonl"
+        ),
+    )
+
+
+def get_rating_writer(request: Request) -> RatingWriteBehindQueue:
+    return request.app.state.rating_writer
@@ -1,5 +1,39 @@
+from fastapi import HTTPException, status
 from starlette.requests import Request
 
+from src.domain.interfaces.recommender import IRecommender
+from src.infrastructure.services.recommender_module.recommender.materialized import (
+    MaterializedRecommendations,
+)
+from src.infrastructure.services.recommender_module.recommender.popularity_recommender import (
+    PopularityRecommender,
+)
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
 
-def get_recommender(request: Request):
-    return request.app.state.recommender
+
+def get_recommender(request: Request) -> IRecommender:
+    """
+    Отдаёт рабочий рекомендатель
+
+    Пока прогрев не посчитал даже список популярных фильмов, отвечает 503:
+    пустой список рекомендаций неотличим от настоящего ответа
+    """
+    recommender: IRecommender = request.app.state.recommender
+    if isinstance(recommender, PopularityRecommender) and not recommender.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Рекомендации ещё не готовы: идёт прогрев",
+            headers={"Retry-After": "5"},
+        )
+
+    return recommender
+
+
+def get_result_cache(request: Request) -> RecommendationCache | None:
+    return getattr(request.app.state.recommender, "result_cache", None)
+
+
+def get_materialized(request: Request) -> MaterializedRecommendations | None:
+    return getattr(request.app.state.recommender, "materialized", None)
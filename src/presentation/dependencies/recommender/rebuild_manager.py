@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from src.domain.interfaces.recommender import IRecommender
+from src.infrastructure.config.settings import settings
+from src.infrastructure.services.recommender_module.rebuild_manager import (
+    RecommenderRebuildManager,
+)
+from src.presentation.dependencies.recommender.recommender_builder import (
+    recommender_builder,
+)
+
+
+def create_rebuild_manager(app: FastAPI) -> RecommenderRebuildManager:
+    async def build() -> IRecommender:
+        async with recommender_builder() as use_case:
+            return await use_case.execute(rebuild=True)
+
+    def swap(recommender: IRecommender) -> None:
+        # Между догонкой журнала и подменой нет await: новые события
+        # не могут попасть только в старую модель
+        recommender.catch_up()
+        app.state.recommender = recommender
+
+    return RecommenderRebuildManager(
+        build, swap, interval=settings.recommender.rebuild_interval
+    )
+
+
+def get_rebuild_manager(request: Request) -> RecommenderRebuildManager:
+    return request.app.state.rebuild_manager
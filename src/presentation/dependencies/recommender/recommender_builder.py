@@ -1,29 +1,112 @@
+import functools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from src.application.providers.uow import uow_context
 from src.application.usecase.recommender.recommender_builder import (
     RecommenderBuilderUseCase,
 )
+from src.infrastructure.config.settings import settings
 from src.infrastructure.repositories.movie import MovieRepository
 from src.infrastructure.repositories.rating import RatingRepository
+from src.infrastructure.services.recommender_module.factorization.als import (
+    ALSParams,
+)
 from src.infrastructure.services.recommender_module.recommender_service import (
     RecommenderService,
 )
-from src.infrastructure.services.similarity_cache import PickleSimilarityCache
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
+from src.infrastructure.services.recommender_module.recommender.scoring_executor import (
+    ScoringExecutor,
+)
+from src.infrastructure.services.recommender_module.similarity.lsh_builder import (
+    LSHParams,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.binary_similarity_cache import BinarySimilarityCache
+from src.infrastructure.services.rating_event_log import FileRatingEventLog
 
 BASE_DIR = Path(__file__).resolve().parents[3]
 
 
-async def recommender_builder() -> RecommenderBuilderUseCase:
-    async with uow_context() as uow:
-        rating_repository = RatingRepository(uow)
-        movie_repository = MovieRepository(uow)
+@functools.cache
+def recommender_service() -> RecommenderService:
+    """
+    Сервис сборки рекомендателя, общий для всех сборок процесса
 
-    CACHE_PATH = BASE_DIR / "shared" / "assets" / "similarity.pkl"
-    cache = PickleSimilarityCache(path=CACHE_PATH)
+    Журнал рейтингов и кеши должны быть в одном экземпляре: журнал,
+    открытый дважды, выдавал бы пересекающиеся номера событий
+    """
+    CACHE_PATH = BASE_DIR / "shared" / "assets" / "similarity.snapshot"
+    cache = BinarySimilarityCache(path=CACHE_PATH)
 
-    return RecommenderBuilderUseCase(
-        rating_repository=rating_repository,
-        movie_repository=movie_repository,
-        recommender=RecommenderService(cache=cache),
+    EVENT_LOG_PATH = BASE_DIR / "shared" / "assets" / "ratings.log"
+    event_log = FileRatingEventLog(
+        path=EVENT_LOG_PATH, fsync=settings.recommender.event_log_fsync
     )
+
+    return RecommenderService(
+        cache=cache,
+        model=settings.recommender.model,
+        engine=settings.recommender.engine,
+        popularity_score=settings.recommender.popularity,
+        neighbor_policy=NeighborPolicy(
+            max_neighbors=settings.recommender.max_neighbors,
+            min_similarity=settings.recommender.min_similarity,
+        ),
+        incremental_updates=settings.recommender.incremental_updates,
+        build_workers=settings.recommender.build_workers,
+        lsh_params=LSHParams(
+            bands=settings.recommender.lsh_bands,
+            rows=settings.recommender.lsh_rows,
+            seed=settings.recommender.lsh_seed,
+            max_bucket_size=settings.recommender.lsh_max_bucket_size,
+            exact_density=settings.recommender.lsh_exact_density,
+        ),
+        als_params=ALSParams(
+            factors=settings.recommender.als_factors,
+            iterations=settings.recommender.als_iterations,
+            regularization=settings.recommender.als_regularization,
+            alpha=settings.recommender.als_alpha,
+            cg_steps=settings.recommender.als_cg_steps,
+            seed=settings.recommender.als_seed,
+        ),
+        event_log=event_log,
+        result_cache_factory=(
+            functools.partial(
+                RecommendationCache,
+                max_entries=settings.recommender.result_cache_size,
+                ttl=settings.recommender.result_cache_ttl,
+            )
+            if settings.recommender.result_cache_size
+            else None
+        ),
+        materialize_top_n=settings.recommender.materialize_top_n,
+        materialize_workers=settings.recommender.materialize_workers,
+        materialize_refresh_delay=settings.recommender.materialize_refresh_delay,
+        scoring_executor=(
+            ScoringExecutor(
+                workers=settings.recommender.scoring_workers,
+                max_concurrency=settings.recommender.scoring_max_concurrency,
+                timeout=settings.recommender.scoring_timeout,
+            )
+            if settings.recommender.scoring_offload
+            else None
+        ),
+    )
+
+
+@asynccontextmanager
+async def recommender_builder() -> AsyncIterator[RecommenderBuilderUseCase]:
+    """Сценарий сборки, чьи репозитории открыты, пока идёт async with"""
+    async with uow_context() as uow:
+        yield RecommenderBuilderUseCase(
+            rating_repository=RatingRepository(uow),
+            movie_repository=MovieRepository(uow),
+            recommender=recommender_service(),
+        )
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from src.application.providers.uow import uow_context
+from src.application.usecase.recommender.popular_movies import PopularMoviesUseCase
+from src.infrastructure.db.db import init_db
+from src.infrastructure.repositories.rating import RatingRepository
+from src.infrastructure.services.recommender_module.recommender.popularity_recommender import (
+    PopularityRecommender,
+)
+from src.infrastructure.services.startup_warmup import StartupWarmup
+from src.presentation.dependencies.movie_lens.movie_lens_impot import (
+    get_movie_lens_import_use_case,
+)
+from src.presentation.dependencies.movies.catalog import load_movie_catalog
+from src.presentation.dependencies.recommender.recommender_builder import (
+    recommender_builder,
+    recommender_service,
+)
+
+MOVIE_LENS_PATH = Path(
+    r"C:\Users\isupov\YandexDisk\Programming\University\ERS\async-collaborative-filtering\async-collaborative-filtering-backend\assets"
+)
+
+
+def create_warmup(app: FastAPI) -> StartupWarmup:
+    """
+    Прогрев приложения: данные, каталог, запасной рекомендатель и модель
+
+    До конца прогрева app.state.recommender отдаёт популярные фильмы,
+    а рейтинги, принятые за это время, попадают в журнал и применяются
+    к модели при подмене
+    """
+
+    async def movie_lens_import() -> None:
+        await get_movie_lens_import_use_case().execute(MOVIE_LENS_PATH)
+
+    async def popularity_fallback() -> None:
+        async with uow_context() as uow:
+            movie_ids = await PopularMoviesUseCase(RatingRepository(uow)).execute()
+
+        app.state.recommender = PopularityRecommender(
+            movie_ids, event_log=recommender_service().event_log
+        )
+
+    async def recommender() -> None:
+        async with recommender_builder() as use_case:
+            built = await use_case.execute()
+        app.state.rebuild_manager.swap(built)
+        app.state.rebuild_manager.start()
+
+    return StartupWarmup(
+        [
+            ("init_db", init_db),
+            ("movie_lens_import", movie_lens_import),
+            ("movie_catalog", load_movie_catalog),
+            ("popularity_fallback", popularity_fallback),
+            ("recommender", recommender),
+        ]
+    )
+
+
+def get_warmup(request: Request) -> StartupWarmup:
+    return request.app.state.warmup
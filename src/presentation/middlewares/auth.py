@@ -1,102 +1,159 @@
 from __future__ import annotations
 
-from fastapi import (
-    Request,
-    Response,
-    status,
-)
+from collections.abc import Iterable
+
+from fastapi import status
 from jose import JWTError, jwt
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.application.dto.user.user import UserDTO
 from src.application.providers.uow import uow_context
 from src.application.usecase.user.get_user import GetUserUseCase
 from src.infrastructure.config.settings import settings
+from src.infrastructure.repositories.user import UserRepository
+from src.infrastructure.services.auth_cache import AuthCache
 from src.shared.types.roles import Role
 
 SECRET_KEY = settings.jwt.secret.get_secret_value()
 ALGORITHM = settings.jwt.algorithm
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware, проводящий JWT-аутентификацию для каждого запроса.
+class AuthMiddleware:
+    """ASGI-middleware, проводящий JWT-аутентификацию для каждого запроса.
 
     * Проверяет наличие и корректность заголовка ``Authorization: Bearer …``.
-    * Декодирует токен и сохраняет payload в ``request.state.jwt_payload``.
+    * Кладёт пользователя и роль в ``request.state.user`` и ``request.state.role``.
     * Пропускает «белый список» эндпоинтов (документация, логин и т.д.).
+
+    Работает напрямую с ASGI-scope, без BaseHTTPMiddleware и его задач
+    и потоков на каждый запрос. Проверенные токены и пользователи берутся
+    из AuthCache, поэтому повторный запрос не декодирует JWT и не ходит в БД.
     """
 
     # Эндпоинты, которые не требуют токена
-    _EXEMPT: set[str] = {
-        "/api/v1/import",
-        "/api/v1/auth/login",
-        "/api/v1/google/auth",
-        "/api/v1/google/check-auth",
-        "/api/v1/google/oauth/callback",
-        "/docs",
-        "/api/v1/docs/oauth2-redirect",
-        "/health",
-        "/openapi.json",
-    }
-
-    def __init__(self, app):
-        super().__init__(app)
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    _EXEMPT: frozenset[str] = frozenset(
+        {
+            "/api/v1/import",
+            "/api/v1/auth/login",
+            "/api/v1/google/auth",
+            "/api/v1/google/check-auth",
+            "/api/v1/google/oauth/callback",
+            "/docs",
+            "/api/v1/docs/oauth2-redirect",
+            "/health",
+            "/ready",
+            "/openapi.json",
+        }
+    )
+    _METHODS: frozenset[str] = frozenset({"GET", "POST", "DELETE", "PUT"})
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: AuthCache | None = None,
+        apikeys: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Args:
+            app: Следующее ASGI-приложение
+            cache: Кеш проверенных токенов и пользователей
+                (None — проверять токен и читать пользователя каждый раз)
+            apikeys: Системные API-ключи (по умолчанию из настроек)
+        """
+        self.app = app
+        self.cache = cache
+        self.apikeys: frozenset[str] = frozenset(
+            apikeys if apikeys is not None else settings.security.apikeys
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Основной обработчик middleware.
 
         Args:
-            request: входящий запрос.
-            call_next: функция передачи управления следующему медлу.
+            scope: ASGI-scope запроса.
+            receive: канал получения сообщений.
+            send: канал отправки сообщений.
 
         Returns:
-            HTTP-ответ.
-
-        Raises:
-            HTTPException: 401, если токен отсутствует или некорректен.
+            None. Без корректного токена отвечает 401 и не вызывает приложение.
         """
-        if request.method not in ["GET", "POST", "DELETE", "PUT"]:
-            return await call_next(request)
-
-        if request.url.path in self._EXEMPT:
-            return await call_next(request)
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self._METHODS
+            or scope["path"] in self._EXEMPT
+        ):
+            return await self.app(scope, receive, send)
+
+        header: str | None = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                header = value.decode("latin-1")
+                break
 
-        header: str | None = request.headers.get("Authorization")
         if not header or not header.startswith("Bearer "):
-            return JSONResponse(
-                {"detail": "Missing bearer token"},
-                status_code=status.HTTP_401_UNAUTHORIZED,
-            )
+            return await self._reject("Missing bearer token", scope, receive, send)
 
         token: str = header.removeprefix("Bearer ").strip()
-        if token in settings.security.apikeys:
-            request.state.role = Role.SYSTEM
-            request.state.user = None
-            return await call_next(request)
+        state: dict = scope.setdefault("state", {})
+
+        if token in self.apikeys:
+            state["role"] = Role.SYSTEM
+            state["user"] = None
+            return await self.app(scope, receive, send)
+
+        payload: dict | None = self._decode(token)
+        if payload is None:
+            return await self._reject("Invalid token", scope, receive, send)
 
         try:
-            payload: dict = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            user_id: int = int(payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            return await self._reject("Invalid token", scope, receive, send)
+
+        user: UserDTO | None = await self._get_user(user_id)
+        if not user:
+            return await self._reject("User not found", scope, receive, send)
+
+        state["user"] = user
+        state["role"] = getattr(user, "role", Role.UNSUBSCRIBED)
+        return await self.app(scope, receive, send)
+
+    def _decode(self, token: str) -> dict | None:
+        if self.cache is not None:
+            payload: dict | None = self.cache.get_payload(token)
+            if payload is not None:
+                return payload
+
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         except JWTError:
-            return JSONResponse(
-                {"detail": "Invalid token"},
-                status_code=status.HTTP_401_UNAUTHORIZED,
-            )
+            return None
+
+        if self.cache is not None:
+            self.cache.put_payload(token, payload)
+
+        return payload
 
-        user: UserDTO | None = None
-        user_id: str = payload["sub"]
+    async def _get_user(self, user_id: int) -> UserDTO | None:
+        if self.cache is not None:
+            user: UserDTO | None = self.cache.get_user(user_id)
+            if user is not None:
+                return user
 
         async with uow_context() as uow:
-            get_user_uc = GetUserUseCase(uow)
-            user: UserDTO | None = await get_user_uc.execute(user_id)
+            user = await GetUserUseCase(UserRepository(uow)).execute(user_id)
 
-        if not user:
-            return JSONResponse(
-                {"detail": "User not found"}, status_code=status.HTTP_401_UNAUTHORIZED
-            )
+        # Отсутствие пользователя не кешируется: он может появиться
+        # сразу после регистрации
+        if user is not None and self.cache is not None:
+            self.cache.put_user(user)
+
+        return user
 
-        request.state.user = user
-        request.state.role = getattr(user, "role", Role.UNSUBSCRIBED)
-        return await call_next(request)
+    @staticmethod
+    async def _reject(detail: str, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": detail}, status_code=status.HTTP_401_UNAUTHORIZED
+        )
+        await response(scope, receive, send)
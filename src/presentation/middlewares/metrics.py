@@ -0,0 +1,56 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.services.metrics import registry
+
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "Длительность обработки HTTP-запросов по маршрутам",
+    ("method", "route", "status"),
+)
+
+# Методы, которые учитываются отдельно: произвольные методы из запросов
+# сводятся в other, чтобы число рядов метрики было ограничено
+HTTP_METHODS: frozenset[str] = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+)
+
+
+class MetricsMiddleware:
+    """ASGI-middleware, замеряющий длительность HTTP-запросов.
+
+    Запрос учитывается по шаблону маршрута (``/api/v1/recommendations/{user_id}``),
+    а не по фактическому пути, чтобы число рядов метрики не росло
+    с количеством пользователей и фильмов. Запросы, не попавшие ни в один
+    маршрут, учитываются вместе под ``unmatched``, а нестандартные методы —
+    под ``other``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started: float = time.perf_counter()
+        status_code: int = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Роутер дописывает найденный маршрут в тот же scope
+            route: str = getattr(scope.get("route"), "path", None) or "unmatched"
+            method: str = (
+                scope["method"] if scope["method"] in HTTP_METHODS else "other"
+            )
+            http_request_duration_seconds.labels(method, route, status_code).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class RebuildStarted(BaseModel):
+    started: bool
+
+
+class RebuildStatus(BaseModel):
+    running: bool
+    rebuilds: int
+    failures: int
+    last_started_at: float | None
+    last_finished_at: float | None
+    last_duration: float | None
+    last_error: str | None
+    interval: float | None
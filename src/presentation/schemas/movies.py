@@ -0,0 +1,29 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+MAX_PAGE_SIZE: int = 1000
+
+# Поля, которые можно запросить через fields; id возвращается всегда
+MOVIE_FIELDS: frozenset[str] = frozenset(
+    {"title", "release_date", "video_release_date", "imdb_url", "genres"}
+)
+
+
+class GenreSchema(BaseModel):
+    id: int
+    name: str
+
+
+class MovieSchema(BaseModel):
+    id: int
+    title: str | None = None
+    release_date: date | None = None
+    video_release_date: date | None = None
+    imdb_url: str | None = None
+    genres: list[GenreSchema] | None = None
+
+
+class MoviesPage(BaseModel):
+    items: list[MovieSchema]
+    next_after_id: int | None
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+MAX_BATCH_RATINGS: int = 10_000
+
+
+class RatingRequest(BaseModel):
+    user_id: int
+    movie_id: int
+    rating: int = Field(ge=1, le=5)
+    timestamp: int | None = Field(default=None, ge=0)
+
+
+class BatchRatingsRequest(BaseModel):
+    ratings: list[RatingRequest] = Field(min_length=1, max_length=MAX_BATCH_RATINGS)
+
+
+class RatingsAccepted(BaseModel):
+    accepted: int
+    queue_depth: int
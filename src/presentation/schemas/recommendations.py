@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+
+MAX_BATCH_USERS: int = 100_000
+
+
+class UserRecommendationsRequest(BaseModel):
+    user_id: int
+    top_n: int = Field(default=10, gt=0, le=1000)
+
+
+class BatchRecommendationsRequest(BaseModel):
+    users: list[UserRecommendationsRequest] = Field(
+        min_length=1, max_length=MAX_BATCH_USERS
+    )
+
+
+class UserRecommendations(BaseModel):
+    user_id: int
+    movie_ids: list[int]
+
+
+class RecommendationCacheStats(BaseModel):
+    enabled: bool
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: int = 0
+
+
+class MaterializationStats(BaseModel):
+    enabled: bool
+    users: int = 0
+    top_n: int = 0
+    stale_users: int = 0
+    built_at: float | None = None
+    duration: float | None = None
+    age: float | None = None
@@ -0,0 +1,24 @@
+from enum import StrEnum
+
+
+class RecommenderModel(StrEnum):
+    """Модель, по которой формируются рекомендации."""
+
+    ITEM_CF = "item_cf"
+    ALS = "als"
+
+
+class SimilarityEngine(StrEnum):
+    """Способ построения матрицы сходства фильмов."""
+
+    PYTHON = "python"
+    SPARSE = "sparse"
+    LSH = "lsh"
+
+
+class PopularityScore(StrEnum):
+    """Способ ранжирования популярных фильмов для пользователей без оценок."""
+
+    COUNT = "count"
+    RATING_SUM = "rating_sum"
+    BAYESIAN = "bayesian"
@@ -0,0 +1,73 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.services.binary_similarity_cache import BinarySimilarityCache
+from src.infrastructure.services.recommender_module.storage.csr import CSRMapping
+
+
+def make_state() -> dict:
+    return {
+        "user_ratings": {1: {10: 5, 20: 3}, 2: {20: 4}, 3: {}},
+        "movie_ratings": {10: {1: 5}, 20: {1: 3, 2: 4}},
+        "similarity_matrix": {10: {20: 0.25}, 20: {10: 0.25}},
+        "statistics_norms": {10: 25, 20: 25},
+        "statistics_dots": {10: {20: 15}, 20: {10: 15}},
+        "sequence": 42,
+        "fingerprint": {"count": 3, "max_id": 3},
+    }
+
+
+def as_dicts(state: dict) -> dict:
+    return {
+        key: (
+            {row: dict(value[row]) for row in value}
+            if isinstance(value, CSRMapping)
+            else value
+        )
+        for key, value in state.items()
+    }
+
+
+def test_snapshot_round_trip(tmp_path: Path):
+    cache = BinarySimilarityCache(tmp_path / "similarity.snapshot")
+    state: dict = make_state()
+
+    asyncio.run(cache.save(state))
+    loaded = asyncio.run(BinarySimilarityCache(cache.path).load())
+
+    assert as_dicts(loaded) == state
+
+
+def test_missing_snapshot_is_not_loaded(tmp_path: Path):
+    cache = BinarySimilarityCache(tmp_path / "similarity.snapshot")
+
+    assert asyncio.run(cache.load()) is None
+
+
+@pytest.mark.parametrize("position", [-1, 40])
+def test_corrupted_snapshot_is_skipped(tmp_path: Path, position: int):
+    cache = BinarySimilarityCache(tmp_path / "similarity.snapshot")
+    asyncio.run(cache.save(make_state()))
+
+    data = bytearray(cache.path.read_bytes())
+    data[position] ^= 0xFF
+    cache.path.write_bytes(data)
+
+    assert asyncio.run(BinarySimilarityCache(cache.path).load()) is None
+
+
+def test_save_releases_loaded_snapshot(tmp_path: Path):
+    cache = BinarySimilarityCache(tmp_path / "similarity.snapshot")
+    asyncio.run(cache.save(make_state()))
+    loaded = asyncio.run(cache.load())
+    similarity: CSRMapping = loaded["similarity_matrix"]
+
+    updated: dict = make_state() | {"sequence": 43}
+    asyncio.run(cache.save(updated))
+
+    # Матрицы прежнего снимка скопированы в память, а его mmap закрыт
+    assert cache._buffer is None
+    assert similarity.get(10) == {20: 0.25}
+    assert asyncio.run(cache.load())["sequence"] == 43
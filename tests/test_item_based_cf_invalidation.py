@@ -0,0 +1,175 @@
+import asyncio
+import random
+from itertools import combinations
+
+import pytest
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    ItemBasedCFRecommender,
+)
+from src.infrastructure.services.recommender_module.recommender.result_cache import (
+    RecommendationCache,
+)
+from src.infrastructure.services.recommender_module.similarity.cosine import (
+    CosineSimilarity,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.statistics import (
+    CosineStatistics,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+
+
+def build_recommender(
+    records: list[RatingRecord],
+    neighbor_policy: NeighborPolicy = NeighborPolicy(),
+    statistics: bool = True,
+    refresh_delay: float | None = None,
+) -> ItemBasedCFRecommender:
+    storage = RatingsStorage()
+    storage.fill(records)
+
+    similarity: dict[int, dict[int, float]] = {
+        movie_id: {} for movie_id in storage.movies
+    }
+    for m1, m2 in combinations(storage.movies, 2):
+        value: float = CosineSimilarity.calculate(
+            storage.movies[m1], storage.movies[m2]
+        )
+        if neighbor_policy.accepts(value):
+            similarity[m1][m2] = value
+            similarity[m2][m1] = value
+    similarity = {
+        movie_id: neighbor_policy.prune(row) for movie_id, row in similarity.items()
+    }
+
+    return ItemBasedCFRecommender(
+        similarity,
+        storage,
+        neighbor_policy,
+        CosineStatistics.from_ratings(storage.movies) if statistics else None,
+        result_cache=RecommendationCache(max_entries=100_000, ttl=3600.0),
+        refresh_delay=refresh_delay,
+    )
+
+
+def fresh_recommendations(
+    recommender: ItemBasedCFRecommender, user_id: int, top_n: int
+) -> list[int]:
+    materialized, recommender.materialized = recommender.materialized, None
+    try:
+        return recommender._recommend(user_id, top_n)
+    finally:
+        recommender.materialized = materialized
+
+
+def random_records(seed: int, users: int = 40, movies: int = 30) -> list[RatingRecord]:
+    rng = random.Random(seed)
+    return [
+        RatingRecord(user_id, movie_id, rng.randint(1, 5), 0)
+        for user_id in range(1, users + 1)
+        for movie_id in rng.sample(range(1, movies + 1), rng.randint(2, 8))
+    ]
+
+
+def test_rating_keeps_unrelated_users_cached():
+    # Два кластера без общих пользователей и фильмов
+    records: list[RatingRecord] = [
+        RatingRecord(user_id, movie_id, (user_id + movie_id) % 5 + 1, 0)
+        for user_id in range(1, 6)
+        for movie_id in range(1, 6)
+        if (user_id + movie_id) % 3
+    ] + [
+        RatingRecord(user_id, movie_id, (user_id * movie_id) % 5 + 1, 0)
+        for user_id in range(11, 16)
+        for movie_id in range(11, 16)
+        if (user_id + movie_id) % 4
+    ]
+    recommender: ItemBasedCFRecommender = build_recommender(records)
+
+    async def scenario() -> None:
+        for user_id in [*range(1, 6), *range(11, 16)]:
+            await recommender.recommend_for_user(user_id, 3)
+
+        await recommender.update_for_record(RatingRecord(1, 3, 5, 1))
+
+    asyncio.run(scenario())
+
+    cached: set[int] = {user_id for user_id, _ in recommender.result_cache._entries}
+    assert set(range(11, 16)) <= cached
+    assert 1 not in cached
+
+
+@pytest.mark.parametrize("statistics", [True, False])
+@pytest.mark.parametrize("max_neighbors", [None, 4])
+def test_cached_recommendations_match_model_after_updates(statistics, max_neighbors):
+    recommender: ItemBasedCFRecommender = build_recommender(
+        random_records(seed=7),
+        NeighborPolicy(max_neighbors=max_neighbors),
+        statistics=statistics,
+    )
+    user_ids: list[int] = list(recommender.storage.users)
+    rng = random.Random(11)
+    kept: int = 0
+
+    async def scenario() -> None:
+        nonlocal kept
+        await recommender.materialize(5)
+        for step in range(30):
+            for user_id in user_ids:
+                await recommender.recommend_for_user(user_id, 3)
+
+            record = RatingRecord(
+                rng.choice(user_ids), rng.randint(1, 30), rng.randint(1, 5), step
+            )
+            await recommender.update_for_record(record)
+
+            for (user_id, top_n), (
+                _,
+                movies,
+            ) in recommender.result_cache._entries.items():
+                assert movies == fresh_recommendations(recommender, user_id, top_n)
+                kept += 1
+            for user_id in user_ids:
+                materialized = recommender.materialized.peek(user_id)
+                if materialized is not None:
+                    assert materialized == fresh_recommendations(
+                        recommender, user_id, 5
+                    )
+
+    asyncio.run(scenario())
+    assert kept > 0
+
+
+def test_stale_users_are_rematerialized_in_background():
+    recommender: ItemBasedCFRecommender = build_recommender(
+        random_records(seed=3), NeighborPolicy(max_neighbors=4), refresh_delay=0.01
+    )
+    user_ids: list[int] = list(recommender.storage.users)
+    rng = random.Random(5)
+
+    async def scenario() -> None:
+        await recommender.materialize(5)
+        for step in range(20):
+            await recommender.update_for_record(
+                RatingRecord(
+                    rng.choice(user_ids), rng.randint(1, 30), rng.randint(1, 5), step
+                )
+            )
+        assert recommender.materialized.stats().stale_users > 0
+
+        await asyncio.wait_for(recommender._refresh_task, timeout=5)
+        await recommender.stop()
+
+    asyncio.run(scenario())
+
+    assert recommender.materialized.stats().stale_users == 0
+    for user_id in user_ids:
+        assert recommender.materialized.peek(user_id) == fresh_recommendations(
+            recommender, user_id, 5
+        )
@@ -0,0 +1,117 @@
+import asyncio
+import random
+from datetime import date
+
+import pytest
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.recommender_module.recommender.item_based_cf_recommender import (
+    ItemBasedCFRecommender,
+)
+from src.infrastructure.services.recommender_module.similarity.builder import (
+    SimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.statistics import (
+    CosineStatistics,
+)
+from src.infrastructure.services.recommender_module.storage.ratings_storage import (
+    RatingsStorage,
+)
+
+MOVIES: list[Movie] = [
+    Movie(movie_id, f"Movie {movie_id}", date(1995, 1, 1), date(1995, 1, 1), "", [])
+    for movie_id in range(1, 31)
+]
+
+
+def random_records(
+    rng: random.Random, count: int, users: int = 40, movies: int = 30
+) -> list[RatingRecord]:
+    return [
+        RatingRecord(
+            rng.randint(1, users), rng.randint(1, movies), rng.randint(1, 5), 0
+        )
+        for _ in range(count)
+    ]
+
+
+def rebuild(
+    records: list[RatingRecord], neighbor_policy: NeighborPolicy = NeighborPolicy()
+) -> tuple[RatingsStorage, dict]:
+    # Повторная оценка заменяет прежнюю, как и при онлайн-обновлении
+    storage = RatingsStorage()
+    storage.fill(records)
+    builder = SimilarityMatrixBuilder(neighbor_policy=neighbor_policy)
+    return storage, builder.build(storage.users, MOVIES)
+
+
+def assert_same_similarity(actual: dict, expected: dict) -> None:
+    def nonzero(matrix: dict) -> dict[tuple[int, int], float]:
+        return {
+            (movie_id, other_id): value
+            for movie_id, row in matrix.items()
+            for other_id, value in row.items()
+            if value
+        }
+
+    actual, expected = nonzero(actual), nonzero(expected)
+    assert actual.keys() == expected.keys()
+    for pair, value in expected.items():
+        assert actual[pair] == pytest.approx(value, abs=1e-9)
+
+
+def test_statistics_match_rebuild_after_updates():
+    rng = random.Random(1)
+    initial: list[RatingRecord] = random_records(rng, 200)
+    updates: list[RatingRecord] = random_records(rng, 300)
+
+    storage, _ = rebuild(initial)
+    statistics: CosineStatistics = CosineStatistics.from_ratings(storage.movies)
+    for record in updates:
+        old_rating: int | None = storage.get_user_movies(record.user_id).get(
+            record.movie_id
+        )
+        storage.update(record)
+        statistics.update(
+            storage.get_user_movies(record.user_id),
+            record.movie_id,
+            old_rating,
+            record.rating,
+        )
+
+    final_storage, _ = rebuild(initial + updates)
+    expected: CosineStatistics = CosineStatistics.from_ratings(final_storage.movies)
+
+    assert statistics.norms == expected.norms
+    for movie_id in expected.norms:
+        actual_row = {k: v for k, v in statistics.dots.get(movie_id, {}).items() if v}
+        assert actual_row == dict(expected.dots.get(movie_id, {}))
+
+
+@pytest.mark.parametrize("min_similarity", [0.0, 0.3])
+def test_online_updates_match_rebuild(min_similarity):
+    rng = random.Random(2)
+    initial: list[RatingRecord] = random_records(rng, 200)
+    updates: list[RatingRecord] = random_records(rng, 150)
+    neighbor_policy = NeighborPolicy(min_similarity=min_similarity)
+
+    storage, similarity = rebuild(initial, neighbor_policy)
+    recommender = ItemBasedCFRecommender(
+        similarity,
+        storage,
+        neighbor_policy,
+        CosineStatistics.from_ratings(storage.movies),
+    )
+
+    async def scenario() -> None:
+        for record in updates:
+            await recommender.update_for_record(record)
+
+    asyncio.run(scenario())
+
+    _, expected = rebuild(initial + updates, neighbor_policy)
+    assert_same_similarity(recommender.similarity, expected)
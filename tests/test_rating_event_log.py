@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.rating_event_log import FileRatingEventLog
+
+RECORDS: list[RatingRecord] = [
+    RatingRecord(user_id, user_id * 10, user_id % 5 + 1, 1_000 + user_id)
+    for user_id in range(1, 11)
+]
+
+
+def test_events_are_read_after_sequence(tmp_path: Path):
+    log = FileRatingEventLog(tmp_path / "ratings.log")
+    sequences: list[int] = [log.append(record) for record in RECORDS]
+
+    assert sequences == list(range(1, 11))
+    assert list(log.read_since(7)) == list(zip(range(8, 11), RECORDS[7:]))
+    assert list(log.read_since(10)) == []
+    log.close()
+
+
+def test_compaction_keeps_numbering_and_tail(tmp_path: Path):
+    log = FileRatingEventLog(tmp_path / "ratings.log")
+    for record in RECORDS:
+        log.append(record)
+
+    log.compact(6)
+
+    assert list(log.read_since(6)) == list(zip(range(7, 11), RECORDS[6:]))
+    assert log.append(RECORDS[0]) == 11
+    log.close()
+
+    # После переоткрытия нумерация и хвост журнала сохраняются
+    reopened = FileRatingEventLog(log.path)
+    assert reopened.last_sequence == 11
+    assert [sequence for sequence, _ in reopened.read_since(6)] == [7, 8, 9, 10, 11]
+    reopened.close()
+
+
+def test_compaction_of_whole_log_keeps_last_event(tmp_path: Path):
+    log = FileRatingEventLog(tmp_path / "ratings.log")
+    for record in RECORDS:
+        log.append(record)
+
+    log.compact(10)
+    log.close()
+
+    reopened = FileRatingEventLog(log.path)
+    assert reopened.last_sequence == 10
+    assert reopened.append(RECORDS[0]) == 11
+    assert list(reopened.read_since(10)) == [(11, RECORDS[0])]
+    reopened.close()
+
+
+def test_torn_last_record_is_dropped(tmp_path: Path):
+    log = FileRatingEventLog(tmp_path / "ratings.log")
+    for record in RECORDS[:3]:
+        log.append(record)
+    log.close()
+
+    with open(log.path, "ab") as f:
+        f.write(b"\x04\x00\x00")
+
+    reopened = FileRatingEventLog(log.path)
+    assert reopened.last_sequence == 3
+    assert reopened.append(RECORDS[3]) == 4
+    assert list(reopened.read_since(0)) == list(zip(range(1, 5), RECORDS[:4]))
+    reopened.close()
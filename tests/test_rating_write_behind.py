@@ -0,0 +1,107 @@
+import asyncio
+import json
+from pathlib import Path
+
+from src.domain.entities.movie_lens.raitings import RatingRecord
+from src.infrastructure.services.rating_dead_letter import RatingDeadLetterFile
+from src.infrastructure.services.rating_write_behind import RatingWriteBehindQueue
+
+RECORDS: list[RatingRecord] = [
+    RatingRecord(user_id, 10, 4, 0) for user_id in range(1, 6)
+]
+
+
+def run_queue(flush, dead_letter: RatingDeadLetterFile, max_retries: int = 2) -> None:
+    async def scenario() -> None:
+        queue = RatingWriteBehindQueue(
+            flush,
+            batch_size=len(RECORDS),
+            flush_interval=1.0,
+            max_retries=max_retries,
+            retry_delay=0.0,
+            dead_letter=dead_letter,
+        )
+        queue.start()
+        assert queue.submit(RECORDS)
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def read_dead_letter(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_batch_is_retried_until_written(tmp_path: Path):
+    dead_letter = RatingDeadLetterFile(tmp_path / "dead.jsonl")
+    calls: list[list[RatingRecord]] = []
+
+    async def flush(batch: list[RatingRecord]) -> list[RatingRecord]:
+        calls.append(batch)
+        if len(calls) <= 2:
+            raise ConnectionError("database is unavailable")
+        return []
+
+    run_queue(flush, dead_letter, max_retries=2)
+
+    assert calls == [RECORDS] * 3
+    assert read_dead_letter(dead_letter.path) == []
+
+
+def test_failed_records_go_to_dead_letter(tmp_path: Path):
+    dead_letter = RatingDeadLetterFile(tmp_path / "dead.jsonl")
+    written: list[RatingRecord] = []
+    batches: int = 0
+
+    async def flush(batch: list[RatingRecord]) -> list[RatingRecord]:
+        nonlocal batches
+        if len(batch) > 1:
+            batches += 1
+            raise ValueError("constraint violation")
+        if batch[0].user_id == 3:
+            raise ValueError("constraint violation")
+        written.extend(batch)
+        return []
+
+    run_queue(flush, dead_letter, max_retries=1)
+
+    # Пачка: первая попытка и один повтор, затем запись по одному
+    assert batches == 2
+    assert written == [record for record in RECORDS if record.user_id != 3]
+
+    (entry,) = read_dead_letter(dead_letter.path)
+    failed = RatingRecord(*(entry[field] for field in RatingRecord._fields))
+    assert failed == RECORDS[2]
+    assert "constraint violation" in entry["reason"]
+
+
+def test_rejected_records_go_to_dead_letter(tmp_path: Path):
+    dead_letter = RatingDeadLetterFile(tmp_path / "dead.jsonl")
+
+    async def flush(batch: list[RatingRecord]) -> list[RatingRecord]:
+        return [record for record in batch if record.user_id % 2 == 0]
+
+    run_queue(flush, dead_letter)
+
+    entries: list[dict] = read_dead_letter(dead_letter.path)
+    assert [entry["user_id"] for entry in entries] == [2, 4]
+    assert {entry["reason"] for entry in entries} == {"rejected"}
+
+
+def test_submit_is_refused_when_queue_is_full():
+    async def scenario() -> None:
+        queue = RatingWriteBehindQueue(lambda batch: asyncio.sleep(0, []), max_size=3)
+        assert not queue.submit(RECORDS[:1])
+
+        queue.start()
+        assert not queue.submit(RECORDS)
+        assert queue.submit(RECORDS[:3])
+        assert queue.depth == 3
+        await queue.stop()
+
+        assert queue.depth == 0
+        assert not queue.submit(RECORDS[:1])
+
+    asyncio.run(scenario())
@@ -0,0 +1,14 @@
+from src.infrastructure.services.recommender_module.recommender_service import (
+    RecommenderService,
+)
+from src.shared.types.recommender import SimilarityEngine
+
+
+def test_lsh_engine_disables_exact_statistics():
+    service = RecommenderService(engine=SimilarityEngine.LSH, incremental_updates=True)
+    assert service.incremental_updates is False
+
+    service = RecommenderService(
+        engine=SimilarityEngine.SPARSE, incremental_updates=True
+    )
+    assert service.incremental_updates is True
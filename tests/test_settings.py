@@ -0,0 +1,21 @@
+import importlib
+
+import pytest
+
+from src.shared.types.recommender import PopularityScore
+
+
+@pytest.fixture
+def settings_module(monkeypatch):
+    monkeypatch.setenv("BOT_TOKEN", "token")
+    monkeypatch.setenv("JWT_SECRET", "0" * 40)
+    monkeypatch.setenv("SECURITY_APIKEYS", '["key"]')
+    return importlib.import_module("src.infrastructure.config.settings")
+
+
+def test_popularity_score_is_selected_by_env(settings_module, monkeypatch):
+    monkeypatch.setenv("RECOMMENDER_POPULARITY", "bayesian")
+
+    settings = settings_module.Settings(_env_file=None)
+
+    assert settings.recommender.popularity == PopularityScore.BAYESIAN
@@ -0,0 +1,71 @@
+import random
+from datetime import date
+
+import pytest
+
+from src.domain.entities.movie_lens.movie import Movie
+from src.infrastructure.services.recommender_module.similarity.builder import (
+    SimilarityMatrixBuilder,
+)
+from src.infrastructure.services.recommender_module.similarity.neighbors import (
+    NeighborPolicy,
+)
+from src.infrastructure.services.recommender_module.similarity.sparse_builder import (
+    SparseSimilarityMatrixBuilder,
+)
+
+# Фильмы 41–45 без оценок: в матрице их строк быть не должно
+MOVIES: list[Movie] = [
+    Movie(movie_id, f"Movie {movie_id}", date(1995, 1, 1), date(1995, 1, 1), "", [])
+    for movie_id in range(1, 46)
+]
+
+
+def random_user_ratings(seed: int) -> dict[int, dict[int, int]]:
+    rng = random.Random(seed)
+    return {
+        user_id: {
+            movie_id: rng.randint(1, 5)
+            for movie_id in rng.sample(range(1, 41), rng.randint(1, 12))
+        }
+        for user_id in range(1, 81)
+    }
+
+
+def assert_same_matrix(actual: dict, expected: dict) -> None:
+    assert {key: set(row) for key, row in actual.items() if row} == {
+        key: set(row) for key, row in expected.items() if row
+    }
+    for movie_id, row in expected.items():
+        for other_id, value in row.items():
+            assert actual[movie_id][other_id] == pytest.approx(value, abs=1e-6)
+
+
+@pytest.mark.parametrize(
+    "neighbor_policy",
+    [NeighborPolicy(), NeighborPolicy(min_similarity=0.2)],
+)
+def test_sparse_builder_matches_pairwise_builder(neighbor_policy):
+    user_ratings = random_user_ratings(seed=1)
+
+    expected = SimilarityMatrixBuilder(neighbor_policy=neighbor_policy).build(
+        user_ratings, MOVIES
+    )
+    actual = SparseSimilarityMatrixBuilder(neighbor_policy).build(user_ratings, MOVIES)
+
+    assert_same_matrix(actual, expected)
+
+
+@pytest.mark.parametrize(
+    "neighbor_policy",
+    [NeighborPolicy(), NeighborPolicy(max_neighbors=5, min_similarity=0.1)],
+)
+def test_parallel_builder_matches_serial_builder(neighbor_policy):
+    user_ratings = random_user_ratings(seed=2)
+
+    serial = SparseSimilarityMatrixBuilder(neighbor_policy).build(user_ratings, MOVIES)
+    parallel = SparseSimilarityMatrixBuilder(neighbor_policy, workers=2).build(
+        user_ratings, MOVIES
+    )
+
+    assert parallel == serial